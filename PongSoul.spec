@@ -1,12 +1,32 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
+import sys
+
+# 打包前先把 config/ 與 models/ 的 YAML 解析成 .yamlc 二進位快取，隨 datas 一起打包，
+# 打包後的程式啟動時就不需要再跑 PyYAML 的解析。
+sys.path.insert(0, os.path.abspath(SPECPATH))
+from game.config_cache import bake_all
+bake_all(os.path.abspath(SPECPATH))
+
+# assets/ 合成單一資源檔 (game/asset_archive.py)，執行時以 mmap 讀取，不再把每個檔案解到 _MEIPASS。
+from game.asset_archive import write_archive, ASSET_ARCHIVE_NAME
+ASSET_ARCHIVE_PATH = os.path.join(os.path.abspath(SPECPATH), 'build', ASSET_ARCHIVE_NAME)
+write_archive(os.path.abspath(SPECPATH), ASSET_ARCHIVE_PATH)
+
+# 狀態 (GameApp._STATE_CLASSES) 與背景預載的模組 (env / 技能 / torch，game.startup.DEFERRED_MODULES)
+# 都是以字串 importlib.import_module 載入，Analysis 看不到；直接從這兩張表產生 hiddenimports，
+# 新增狀態或延遲載入的模組時不必再改這裡 (這些模組自己的 import 仍由 Analysis 追蹤)。
+from main import GameApp
+from game.startup import DEFERRED_MODULES
+LAZY_IMPORTS = sorted({module_name for module_name, _ in GameApp._STATE_CLASSES.values()} | set(DEFERRED_MODULES))
 
 
 a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=[('assets', 'assets'), ('models', 'models')],
-    hiddenimports=['PyYAML'],
+    datas=[(ASSET_ARCHIVE_PATH, '.'), ('models', 'models'), ('config', 'config')],
+    hiddenimports=['PyYAML'] + LAZY_IMPORTS,
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
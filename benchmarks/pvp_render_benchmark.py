@@ -0,0 +1,87 @@
+# pong-soul/benchmarks/pvp_render_benchmark.py
+"""
+PvP 分割畫面的渲染時間比較：每個視角各畫一次世界 (舊) vs. 共用渲染 + 翻轉 (新)。
+在 1920x1080 的離屏 (SDL dummy driver) 全螢幕大小畫布上跑，只計 Renderer.render() 的時間。
+
+    python benchmarks/pvp_render_benchmark.py --frames 600
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+os.chdir(PROJECT_ROOT)
+
+import pygame
+from game.config_manager import ConfigManager
+from game.settings import GameSettings
+
+
+def run_case(shared_pass, frames, width, height, p1_skill, p2_skill, dirty_rects):
+    from envs.pong_duel_env import PongDuelEnv
+    screen = pygame.display.get_surface()
+    env = PongDuelEnv(
+        game_mode=GameSettings.GameMode.PLAYER_VS_PLAYER,
+        player1_config={'skill_code': p1_skill, 'initial_paddle_width': 100, 'initial_lives': 99},
+        opponent_config={'skill_code': p2_skill, 'initial_paddle_width': 100, 'initial_lives': 99},
+        initial_main_screen_surface_for_renderer=screen,
+    )
+    env.render() # 建立 Renderer
+    env.renderer.pvp_shared_render_pass = shared_pass
+    env.renderer.dirty_rect_rendering = dirty_rects
+
+    # 先暖身，讓 sprite / 旋轉快取填好，量的是穩定狀態
+    for i in range(60):
+        env.step(i % 3, (i + 1) % 3)
+        env.render()
+
+    samples_ms = []
+    for i in range(frames):
+        env.step(i % 3, (i * 7) % 3)
+        t0 = time.perf_counter()
+        env.render()
+        samples_ms.append((time.perf_counter() - t0) * 1000.0)
+    env.close()
+    samples_ms.sort()
+    return {
+        "mean": statistics.fmean(samples_ms),
+        "p50": samples_ms[len(samples_ms) // 2],
+        "p99": samples_ms[min(len(samples_ms) - 1, int(len(samples_ms) * 0.99))],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PvP split-screen rendering (per-view vs shared pass).")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--p1-skill", default=None, help="skill code for P1 (default: none)")
+    parser.add_argument("--p2-skill", default=None, help="skill code for P2 (default: none)")
+    parser.add_argument("--dirty-rects", action="store_true", help="keep dirty-rect rendering on (default: full redraw every frame)")
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((args.width, args.height))
+    GameSettings._config_manager = ConfigManager()
+
+    print(f"[pvp_render_benchmark] {args.width}x{args.height}, {args.frames} frames, "
+          f"skills P1={args.p1_skill} P2={args.p2_skill}, dirty_rects={args.dirty_rects}")
+    results = {}
+    for label, shared in (("per-view (before)", False), ("shared pass (after)", True)):
+        results[label] = run_case(shared, args.frames, args.width, args.height, args.p1_skill, args.p2_skill, args.dirty_rects)
+        r = results[label]
+        print(f"  {label:<20} mean {r['mean']:.3f} ms   p50 {r['p50']:.3f} ms   p99 {r['p99']:.3f} ms")
+    before = results["per-view (before)"]["mean"]
+    after = results["shared pass (after)"]["mean"]
+    if after > 0:
+        print(f"  speedup: {before / after:.2f}x")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+# pong-soul/benchmarks/startup_benchmark.py
+"""
+啟動時間與幀時間基準：重複啟動整個程式 (SDL dummy video / audio driver)，
+以腳本輸入走過 標題 → Player vs. AI → 輸入方式 → 技能 → 關卡 → 遊戲 (game/benchmark_driver.py)，
+彙整每次的結果輸出成 JSON，可以在不同 commit 之間比較。
+
+    python benchmarks/startup_benchmark.py --runs 5 --output startup_report.json
+    python benchmarks/startup_benchmark.py --binary dist/PongSoul/PongSoul --output frozen_report.json
+    python benchmarks/startup_benchmark.py --runs 5 --compare startup_report.json   # 與舊的報告比較中位數
+
+cold_start_ms 從父程序 spawn 開始計算到標題畫面第一次送上螢幕 (含直譯器 / 打包執行檔解壓與所有 import)，
+其餘時間見 game/benchmark_driver.py。
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 報告中彙整 (median / min / max) 的欄位：名稱 -> 從單次結果取值的路徑
+METRICS = {
+    "cold_start_ms": ("cold_start_ms",),
+    "first_menu_frame_ms": ("first_menu_frame_ms",),
+    "first_gameplay_frame_ms": ("first_gameplay_frame_ms",),
+    "gameplay_enter_ms": ("gameplay_enter_ms",),
+    "countdown_ms": ("countdown_ms",),
+    "frame_work_p50_ms": ("steady_state", "work_ms", "p50"),
+    "frame_work_p99_ms": ("steady_state", "work_ms", "p99"),
+    "frame_interval_p50_ms": ("steady_state", "interval_ms", "p50"),
+    "frame_interval_p99_ms": ("steady_state", "interval_ms", "p99"),
+}
+
+
+def _lookup(result, path):
+    for key in path:
+        if not isinstance(result, dict):
+            return None
+        result = result.get(key)
+    return result
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_once(command, gameplay_frames, timeout_s, verbose):
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy")
+    fd, output_path = tempfile.mkstemp(prefix="pongsoul_bench_", suffix=".json")
+    os.close(fd)
+    try:
+        full_command = command + ["--benchmark-run", "--benchmark-output", output_path,
+                                  "--benchmark-frames", str(gameplay_frames)]
+        spawn_epoch = time.time()
+        completed = subprocess.run(full_command, cwd=PROJECT_ROOT, env=env, timeout=timeout_s,
+                                   stdout=None if verbose else subprocess.DEVNULL,
+                                   stderr=None if verbose else subprocess.PIPE, text=True)
+        with open(output_path, encoding="utf-8") as f:
+            content = f.read()
+        if not content:
+            tail = (completed.stderr or "").strip().splitlines()[-5:]
+            return {"error": f"no benchmark output (exit code {completed.returncode})", "stderr_tail": tail}
+        result = json.loads(content)
+    except subprocess.TimeoutExpired:
+        return {"error": f"timed out after {timeout_s}s"}
+    finally:
+        os.remove(output_path)
+
+    first_menu_epoch = result.get("marks_epoch", {}).get("first_menu_frame")
+    result["cold_start_ms"] = None if first_menu_epoch is None else (first_menu_epoch - spawn_epoch) * 1000.0
+    return result
+
+
+def summarize(results):
+    summary = {}
+    for name, path in METRICS.items():
+        values = [v for v in (_lookup(r, path) for r in results) if v is not None]
+        if values:
+            summary[name] = {"median": statistics.median(values), "min": min(values), "max": max(values), "n": len(values)}
+    return summary
+
+
+def print_summary(summary, baseline=None, file=sys.stdout):
+    print(f"{'metric':<26}{'median':>10}{'min':>10}{'max':>10}" + (f"{'baseline':>10}{'delta':>9}" if baseline else ""), file=file)
+    for name, stats in summary.items():
+        line = f"{name:<26}{stats['median']:>10.1f}{stats['min']:>10.1f}{stats['max']:>10.1f}"
+        if baseline:
+            old = baseline.get("summary", {}).get(name, {}).get("median")
+            if old:
+                line += f"{old:>10.1f}{(stats['median'] - old) / old * 100.0:>+8.1f}%"
+        print(line, file=file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cold start, time to first menu / gameplay frame and "
+                                                 "steady-state frame time with a scripted input sequence.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--binary", default=None,
+                        help="frozen build to run (e.g. dist/PongSoul/PongSoul); default: python main.py from source")
+    parser.add_argument("--gameplay-frames", type=int, default=300, help="steady-state frames measured after the countdown")
+    parser.add_argument("--timeout", type=float, default=180.0, help="seconds per run before it is killed")
+    parser.add_argument("--output", default=None, help="write the JSON report here (default: stdout)")
+    parser.add_argument("--compare", default=None, help="previous JSON report to print median deltas against")
+    parser.add_argument("--verbose", action="store_true", help="show the game's own output")
+    args = parser.parse_args()
+
+    if args.binary:
+        command = [os.path.abspath(args.binary)]
+        mode = "frozen"
+    else:
+        command = [sys.executable, os.path.join(PROJECT_ROOT, "main.py")]
+        mode = "source"
+
+    results = []
+    for i in range(args.runs):
+        result = run_once(command, args.gameplay_frames, args.timeout, args.verbose)
+        results.append(result)
+        if "error" in result:
+            print(f"[StartupBenchmark] run {i + 1}/{args.runs}: ERROR {result['error']}", file=sys.stderr)
+        else:
+            print(f"[StartupBenchmark] run {i + 1}/{args.runs}: cold start {result['cold_start_ms']:.0f}ms, "
+                  f"first gameplay frame {result['first_gameplay_frame_ms']:.0f}ms, "
+                  f"frame work p99 {result['steady_state']['work_ms']['p99']:.2f}ms", file=sys.stderr)
+
+    report = {
+        "commit": _git_commit(),
+        "mode": mode,
+        "command": command,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": args.runs,
+        "gameplay_frames": args.gameplay_frames,
+        "summary": summarize([r for r in results if "error" not in r]),
+        "results": results,
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_summary(report["summary"], baseline, file=sys.stdout if args.output else sys.stderr) # stdout 只留 JSON
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+    else:
+        print(json.dumps(report, indent=2))
+    return 1 if any("error" in r for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
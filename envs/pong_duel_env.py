@@ -13,9 +13,8 @@ from game.player_state import PlayerState
 
 from game.skills.long_paddle_skill import LongPaddleSkill
 from game.skills.slowmo_skill import SlowMoSkill
-from game.skills.soul_eater_bug_skill import SoulEaterBugSkill
+# SoulEaterBugSkill 會帶入 torch (AIAgent)，在 _create_skill 第一次用到時才 import
 from game.skills.purgatory_domain_skill import PurgatoryDomainSkill
-from game.skills.skill_config import SKILL_CONFIGS # 確保導入 (activate_skill 會用到)
 
 
 DEBUG_ENV = False # 你可以將此設為 True 以便調試
@@ -30,7 +29,9 @@ class PongDuelEnv:
                  render_size=400,
                  paddle_height_px=10,
                  ball_radius_px=10,
-                 initial_main_screen_surface_for_renderer=None
+                 initial_main_screen_surface_for_renderer=None,
+                 config_snapshot=None,
+                 sound_manager=None
                 ):
 
         if DEBUG_ENV: print(f"[SKILL_DEBUG][PongDuelEnv.__init__] Initializing with game_mode: {game_mode}")
@@ -38,7 +39,11 @@ class PongDuelEnv:
             print(f"[DEBUG_ENV_FULLSCREEN][PongDuelEnv.__init__] Received initial_main_screen_surface: {type(initial_main_screen_surface_for_renderer)}")
 
         self.game_mode = game_mode
-        self.sound_manager = SoundManager()
+        # ⭐️ 編譯後的唯讀設定快照 (技能也從這裡取參數)；step() 中不再經過 GameSettings 的查找
+        self.config = config_snapshot if config_snapshot is not None else GameSettings.get_config_snapshot()
+        settings = self.config.settings
+        # ⭐️ GameplayState 傳入 GameApp 的 SoundManager；沒有時 (訓練 / 評估 / benchmark) 使用停用音效的 no-op 版本
+        self.sound_manager = sound_manager if sound_manager is not None else SoundManager(enabled=False)
         self.renderer = None # Renderer 會在第一次 render() 時創建
         self.render_size = render_size
         self.paddle_height_px = paddle_height_px
@@ -86,23 +91,26 @@ class PongDuelEnv:
 
         cfg = common_config if common_config else {}
 
-        self.mass = cfg.get('mass', GameSettings.ENV_DEFAULT_MASS)
-        self.e_ball_paddle = cfg.get('e_ball_paddle', GameSettings.ENV_DEFAULT_E_BALL_PADDLE)
-        self.mu_ball_paddle = cfg.get('mu_ball_paddle', GameSettings.ENV_DEFAULT_MU_BALL_PADDLE)
-        self.enable_spin = cfg.get('enable_spin', GameSettings.ENV_DEFAULT_ENABLE_SPIN)
-        self.magnus_factor = cfg.get('magnus_factor', GameSettings.PHYSICS_MAGNUS_FACTOR)
-        self.speed_increment = cfg.get('speed_increment', GameSettings.ENV_DEFAULT_SPEED_INCREMENT)
-        self.speed_scale_every = cfg.get('speed_scale_every', GameSettings.ENV_DEFAULT_SPEED_SCALE_EVERY)
+        env_defaults = settings.env_defaults
+        self.mass = cfg.get('mass', env_defaults.mass)
+        self.e_ball_paddle = cfg.get('e_ball_paddle', env_defaults.e_ball_paddle)
+        self.mu_ball_paddle = cfg.get('mu_ball_paddle', env_defaults.mu_ball_paddle)
+        self.enable_spin = cfg.get('enable_spin', env_defaults.enable_spin)
+        self.magnus_factor = cfg.get('magnus_factor', settings.physics.magnus_factor)
+        self.speed_increment = cfg.get('speed_increment', env_defaults.speed_increment)
+        self.speed_scale_every = cfg.get('speed_scale_every', env_defaults.speed_scale_every)
         
-        self.initial_ball_speed = cfg.get('initial_speed', GameSettings.BALL_INITIAL_SPEED)
-        self.initial_angle_range_deg = cfg.get('initial_angle_deg_range', GameSettings.BALL_INITIAL_ANGLE_DEG_RANGE)
+        self.initial_ball_speed = cfg.get('initial_speed', settings.ball_behavior.initial_speed)
+        self.initial_angle_range_deg = cfg.get('initial_angle_deg_range', settings.ball_behavior.initial_angle_deg_range)
+        self.serves_down_first = settings.ball_behavior.initial_direction_serves_down
         
-        self.freeze_duration = cfg.get('freeze_duration_ms', GameSettings.FREEZE_DURATION_MS) # 回合結束停頓時長
-        self.countdown_seconds = cfg.get('countdown_seconds', GameSettings.COUNTDOWN_SECONDS) # 遊戲開始倒數
+        self.freeze_duration = cfg.get('freeze_duration_ms', settings.gameplay.freeze_duration_ms) # 回合結束停頓時長
+        self.countdown_seconds = cfg.get('countdown_seconds', settings.gameplay.countdown_seconds) # 遊戲開始倒數
         self.bg_music = cfg.get("bg_music", "bg_music_level1.mp3") # 背景音樂
+        self.player_move_speed = settings.gameplay.player_move_speed # 每步都會用到，建構時取一次
 
         self.trail = [] # 球的拖尾數據
-        self.max_trail_length = GameSettings.MAX_TRAIL_LENGTH
+        self.max_trail_length = settings.gameplay.max_trail_length
         self.ball_visual_key = "default" # 當前球體視覺外觀的鍵名 (例如 "default", "soul_eater_bug")
         self.active_ball_visual_skill_owner = None # 記錄是哪個玩家的技能改變了球體視覺
 
@@ -127,9 +135,11 @@ class PongDuelEnv:
         available_skills = {
             "long_paddle": LongPaddleSkill,
             "slowmo": SlowMoSkill,
-            "soul_eater_bug": SoulEaterBugSkill,
             "purgatory_domain": PurgatoryDomainSkill, # <-- 新增這行
         }
+        if skill_code == "soul_eater_bug":
+            from game.skills.soul_eater_bug_skill import SoulEaterBugSkill
+            available_skills["soul_eater_bug"] = SoulEaterBugSkill
         skill_class = available_skills.get(skill_code)
         if skill_class:
             try:
@@ -172,7 +182,7 @@ class PongDuelEnv:
                 # --- 新增：觸發螢幕中央技能名顯示 ---
                 skill_code = player_state_object.skill_code_name
                 if skill_code:
-                    skill_config_for_name = SKILL_CONFIGS.get(skill_code, {})
+                    skill_config_for_name = self.config.skill_params(skill_code)
                     name_to_show = skill_config_for_name.get("display_name_zh_full", skill_code.upper()) # 預設回退到大寫技能代碼
                     
                     self.skill_name_to_display_on_screen = name_to_show
@@ -235,7 +245,7 @@ class PongDuelEnv:
         # 否則，使用 GameSettings.BALL_INITIAL_DIRECTION_SERVES_DOWN。
         # 這裡的 initial_direction_serves_down 決定了第一次 reset 時球是向上還是向下發。
         # (此處的實現保持原樣：隨機發球)
-        serves_down_first = GameSettings.BALL_INITIAL_DIRECTION_SERVES_DOWN # 從設定讀取預設
+        serves_down_first = self.serves_down_first # 從設定快照讀取預設
         # 如果 common_config (即 self.initial_direction_serves_down，如果存在) 中有指定，會覆蓋
         # 這裡我們簡化為，reset() 時的發球方向不由 scored_by_player1 決定，而是由一個配置決定
         self.reset_ball_after_score(scored_by_player1=not serves_down_first if serves_down_first else random.choice([True,False]))
@@ -316,7 +326,7 @@ class PongDuelEnv:
         self.player1.prev_x = self.player1.x
         self.opponent.prev_x = self.opponent.x
         
-        player_base_move_speed = GameSettings.PLAYER_MOVE_SPEED
+        player_base_move_speed = self.player_move_speed
         
         # --- Player 1 移動計算 ---
         p1_current_speed_multiplier = 1.0 # 預設
@@ -733,7 +743,8 @@ class PongDuelEnv:
                 logical_paddle_height_px=self.paddle_height_px,
                 actual_screen_surface=self.provided_main_screen_surface,
                 actual_screen_width=actual_width,
-                actual_screen_height=actual_height
+                actual_screen_height=actual_height,
+                config_snapshot=self.config
             )
 
         render_data_packet = self.get_render_data()
@@ -0,0 +1,202 @@
+# game/asset_archive.py
+"""
+打包用的單一資源檔 (assets.pspk)：把 assets/ 底下的音效、圖片、字型合成一個檔案，
+執行時以 mmap 映射，依 key (例如 "assets/click.mp3") 延遲取出，交給 pygame 的是 file-like 物件，
+不必在 _MEIPASS 裡解出上百個小檔，也不用每個檔案各自 os.path.exists / open (慢速硬碟、網路家目錄)。
+
+格式 (little-endian)：
+    header  : b"PSPK" + u16 版本 + u32 索引長度
+    index   : UTF-8 JSON {"files": {key: [offset, size]}}  (offset 從檔案開頭算起)
+    data    : 各檔案內容，依 DATA_ALIGNMENT 對齊
+
+PongSoul.spec 打包前呼叫 write_archive() 產生 build/assets.pspk 並放在 _MEIPASS 根目錄。
+開發環境沒有 assets.pspk，open_asset() / asset_exists() 直接使用 assets/ 底下的檔案。
+
+    python -m game.asset_archive --build build/assets.pspk
+    python -m game.asset_archive --list build/assets.pspk
+"""
+import io
+import json
+import mmap
+import os
+import struct
+import threading
+
+from utils import resource_path
+
+DEBUG_ASSET_ARCHIVE = False
+
+ASSET_ARCHIVE_NAME = "assets.pspk"
+ARCHIVED_FOLDERS = ("assets",)
+_MAGIC = b"PSPK"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHI")
+DATA_ALIGNMENT = 16
+
+
+def _normalize_key(relative_path):
+    return os.path.normpath(relative_path).replace(os.sep, "/")
+
+
+class _ArchiveMember(io.RawIOBase):
+    """mmap 中一個檔案的唯讀 file-like 物件 (不複製內容)。pygame 透過 read / seek / tell 讀取。"""
+
+    def __init__(self, view, name):
+        super().__init__()
+        self._view = view
+        self._pos = 0
+        self.name = name
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        count = min(len(buffer), len(self._view) - self._pos)
+        if count <= 0:
+            return 0
+        buffer[:count] = self._view[self._pos:self._pos + count]
+        self._pos += count
+        return count
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._pos = max(0, offset)
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+
+class AssetArchive:
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, index_length = _HEADER.unpack_from(self._mmap, 0)
+            if magic != _MAGIC or version != _VERSION:
+                raise ValueError(f"not a v{_VERSION} asset archive (magic={magic!r}, version={version})")
+            index_start = _HEADER.size
+            index = json.loads(bytes(self._mmap[index_start:index_start + index_length]).decode("utf-8"))
+        except Exception:
+            self._file.close()
+            raise
+        self._files = {key: tuple(entry) for key, entry in index["files"].items()}
+        self._view = memoryview(self._mmap)
+
+    def __contains__(self, relative_path):
+        return _normalize_key(relative_path) in self._files
+
+    def names(self):
+        return sorted(self._files)
+
+    def size(self, relative_path):
+        return self._files[_normalize_key(relative_path)][1]
+
+    def open(self, relative_path):
+        """file-like 物件；不存在時丟 KeyError。"""
+        key = _normalize_key(relative_path)
+        offset, size = self._files[key]
+        return _ArchiveMember(self._view[offset:offset + size], key)
+
+    def read_bytes(self, relative_path):
+        offset, size = self._files[_normalize_key(relative_path)]
+        return bytes(self._view[offset:offset + size])
+
+
+def write_archive(root, output_path, folders=ARCHIVED_FOLDERS):
+    """把 root 底下 folders 的所有檔案寫成一個資源檔；回傳 (檔案數, 總位元組數)。"""
+    members = []
+    for folder in folders:
+        for dirpath, dirnames, filenames in os.walk(os.path.join(root, folder)):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                absolute_path = os.path.join(dirpath, filename)
+                members.append((_normalize_key(os.path.relpath(absolute_path, root)), absolute_path))
+
+    # offset 依賴索引長度，索引長度又依賴 offset 的位數：以固定寬度的暫時 offset 先算出索引的長度上限
+    def build_index(offsets):
+        return json.dumps({"files": {key: [offsets[key], os.path.getsize(path)] for key, path in members}},
+                          separators=(",", ":")).encode("utf-8")
+
+    index_length = len(build_index({key: 10 ** 12 for key, _ in members}))
+    offsets = {}
+    position = _HEADER.size + index_length
+    for key, absolute_path in members:
+        position += -position % DATA_ALIGNMENT
+        offsets[key] = position
+        position += os.path.getsize(absolute_path)
+    index = build_index(offsets).ljust(index_length) # JSON 後面補空白不影響解析
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, "wb") as out:
+        out.write(_HEADER.pack(_MAGIC, _VERSION, index_length))
+        out.write(index)
+        for key, absolute_path in members:
+            out.write(b"\0" * (offsets[key] - out.tell()))
+            with open(absolute_path, "rb") as f:
+                out.write(f.read())
+        total_bytes = out.tell()
+    os.replace(tmp_path, output_path)
+    if DEBUG_ASSET_ARCHIVE: print(f"[AssetArchive] Wrote {len(members)} files ({total_bytes} bytes) to {output_path}")
+    return len(members), total_bytes
+
+
+_archive = None
+_archive_checked = False
+_archive_lock = threading.Lock() # 背景預載執行緒與主執行緒都可能第一次呼叫
+
+
+def get_asset_archive():
+    """_MEIPASS (或專案根目錄) 有 assets.pspk 時回傳 AssetArchive，否則 None。"""
+    global _archive, _archive_checked
+    if not _archive_checked:
+        with _archive_lock:
+            if not _archive_checked:
+                path = resource_path(ASSET_ARCHIVE_NAME)
+                if os.path.exists(path):
+                    try:
+                        _archive = AssetArchive(path)
+                        if DEBUG_ASSET_ARCHIVE: print(f"[AssetArchive] Using {path} ({len(_archive.names())} files)")
+                    except (OSError, ValueError) as e:
+                        print(f"[AssetArchive] Warning: could not open '{path}' ({e}). Falling back to loose files.")
+                _archive_checked = True
+    return _archive
+
+
+def open_asset(relative_path):
+    """pygame 可以直接使用的來源：資源檔中的 file-like 物件，或 (不在資源檔中時) 檔案的絕對路徑。"""
+    archive = get_asset_archive()
+    if archive is not None and relative_path in archive:
+        return archive.open(relative_path)
+    return resource_path(relative_path)
+
+
+def asset_exists(relative_path):
+    archive = get_asset_archive()
+    if archive is not None and relative_path in archive:
+        return True
+    return os.path.exists(resource_path(relative_path))
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Build or inspect the packed asset archive.")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--build", metavar="OUTPUT", help="pack assets/ into OUTPUT")
+    group.add_argument("--list", metavar="ARCHIVE", help="list the files in ARCHIVE")
+    args = parser.parse_args()
+    if args.build:
+        count, total_bytes = write_archive(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), args.build)
+        print(f"Packed {count} files ({total_bytes / 1024 / 1024:.1f} MiB) into {args.build}")
+    else:
+        archive = AssetArchive(args.list)
+        for name in archive.names():
+            print(f"{archive.size(name):>10}  {name}")
@@ -0,0 +1,159 @@
+# game/asset_manager.py
+"""
+全域共用的音效 / 圖片快取。每個檔案在整個程式中只解碼一次，之後所有 SoundManager、技能與 Renderer
+拿到的都是同一個 pygame.mixer.Sound / Surface (請勿直接修改共用的 Surface；需要縮放時產生新的)。
+
+GameApp 初始化 mixer 後呼叫 asset_manager.preload(...)，在背景執行緒先解碼音效與圖片；
+主執行緒若在解碼完成前就要某個檔案，會等待該檔案 (不會重複解碼)，沒有排進預載的檔案則當場載入。
+圖片在背景只做 pygame.image.load，convert_alpha() 需要顯示模式，第一次 get_image() 時才在主執行緒轉換。
+打包後的程式從 assets.pspk (game/asset_archive.py) 以 mmap 讀取，開發環境讀 assets/ 底下的檔案。
+
+每個檔案的載入時間記錄在 load_times_ms；檢視報告：
+    python -m game.asset_manager
+"""
+import threading
+import time
+
+import pygame
+
+from game.asset_archive import open_asset
+
+DEBUG_ASSET_MANAGER = False
+
+# SoundManager 使用的音效 (name -> 路徑)
+CORE_SOUNDS = {
+    "slowmo": "assets/slowmo.mp3",
+    "click": "assets/click.mp3",
+    "countdown": "assets/countdown.mp3",
+    "paddle_hit": "assets/paddle_hit.mp3",
+    "win": "assets/win.mp3",
+    "lose": "assets/lose.mp3",
+}
+CORE_IMAGES = ("assets/sunglasses.png",)
+
+
+class _Entry:
+    __slots__ = ("ready", "value", "converted", "load_ms", "error")
+
+    def __init__(self):
+        self.ready = threading.Event()
+        self.value = None
+        self.converted = None
+        self.load_ms = None
+        self.error = None
+
+
+class AssetManager:
+    def __init__(self):
+        self._entries = {} # (kind, relative_path) -> _Entry
+        self._lock = threading.Lock()
+        self._preload_thread = None
+
+    def _load(self, kind, relative_path):
+        key = (kind, relative_path)
+        with self._lock:
+            entry = self._entries.get(key)
+            is_owner = entry is None
+            if is_owner:
+                entry = _Entry()
+                self._entries[key] = entry
+        if not is_owner:
+            entry.ready.wait() # 背景執行緒 (或另一個呼叫) 正在解碼
+            return entry
+
+        t0 = time.perf_counter()
+        try:
+            if kind == "sound":
+                entry.value = pygame.mixer.Sound(file=open_asset(relative_path))
+            else:
+                entry.value = pygame.image.load(open_asset(relative_path), relative_path) # namehint：從資源檔讀取時判斷格式
+        except Exception as e: # 任何錯誤 (權限、資源檔損壞…) 都不能讓等待者永遠卡住
+            entry.error = str(e)
+            print(f"[AssetManager] Warning: could not load {kind} '{relative_path}': {e}")
+        finally:
+            entry.load_ms = (time.perf_counter() - t0) * 1000.0
+            entry.ready.set()
+        if DEBUG_ASSET_MANAGER:
+            where = threading.current_thread().name
+            print(f"[AssetManager] Loaded {kind} '{relative_path}' in {entry.load_ms:.1f}ms ({where})")
+        return entry
+
+    def get_sound(self, relative_path):
+        """共用的 pygame.mixer.Sound；路徑為空或載入失敗時回傳 None。"""
+        if not relative_path:
+            return None
+        return self._load("sound", relative_path).value
+
+    def get_image(self, relative_path):
+        """共用的 Surface (已 convert_alpha，若顯示模式已設定)；載入失敗時回傳 None。"""
+        if not relative_path:
+            return None
+        entry = self._load("image", relative_path)
+        if entry.value is None:
+            return None
+        if entry.converted is None:
+            if pygame.display.get_surface() is None:
+                return entry.value # 還沒有顯示模式 (例如 headless 訓練)，先給未轉換的
+            entry.converted = entry.value.convert_alpha()
+        return entry.converted
+
+    def preload(self, sound_paths=(), image_paths=()):
+        """在背景 daemon 執行緒依序解碼；mixer 必須已經初始化。重複呼叫時已載入的檔案會略過。"""
+        jobs = [("sound", path) for path in dict.fromkeys(sound_paths) if path]
+        jobs += [("image", path) for path in dict.fromkeys(image_paths) if path]
+
+        def run():
+            for kind, path in jobs:
+                self._load(kind, path)
+            if DEBUG_ASSET_MANAGER: print(self.format_load_report())
+
+        self._preload_thread = threading.Thread(target=run, name="asset-preload", daemon=True)
+        self._preload_thread.start()
+        return self._preload_thread
+
+    def wait_for_preload(self, timeout=None):
+        if self._preload_thread is not None:
+            self._preload_thread.join(timeout)
+
+    @property
+    def load_times_ms(self):
+        """{'sound:assets/click.mp3': 12.3, ...}；尚未載入完成的檔案不列出。"""
+        with self._lock:
+            items = list(self._entries.items())
+        return {f"{kind}:{path}": entry.load_ms for (kind, path), entry in items if entry.ready.is_set()}
+
+    def format_load_report(self):
+        times = sorted(self.load_times_ms.items(), key=lambda item: -item[1])
+        lines = [f"[AssetManager] {len(times)} assets decoded, total {sum(ms for _, ms in times):.1f}ms:"]
+        lines += [f"    {ms:8.1f}ms  {name}" for name, ms in times]
+        return "\n".join(lines)
+
+
+def default_preload_manifest(config_snapshot):
+    """(sound_paths, image_paths)：SoundManager 的音效 + 技能設定中的 sound_* / *image_path + 球的圖片。"""
+    sounds = list(CORE_SOUNDS.values())
+    images = list(CORE_IMAGES)
+    for skill in config_snapshot.skills.values():
+        for key, value in skill.params.items():
+            if not isinstance(value, str):
+                continue
+            if key.startswith("sound_"):
+                sounds.append(value)
+            elif key.endswith("image_path"):
+                images.append(value)
+    return sounds, images
+
+
+# 全程式共用的實例
+asset_manager = AssetManager()
+
+
+if __name__ == "__main__":
+    import os
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.mixer.init()
+    from game.config_snapshot import default_config_snapshot
+    sound_paths, image_paths = default_preload_manifest(default_config_snapshot())
+    asset_manager.preload(sound_paths, image_paths)
+    asset_manager.wait_for_preload()
+    print(asset_manager.format_load_report())
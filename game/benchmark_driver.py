@@ -0,0 +1,138 @@
+# game/benchmark_driver.py
+"""
+以腳本輸入驅動 GameApp 並記錄啟動 / 幀時間 (python main.py --benchmark-run --benchmark-output out.json)。
+由 benchmarks/startup_benchmark.py 重複啟動 (原始碼或 PyInstaller 打包後的執行檔) 並彙整成 JSON 報告。
+
+流程：標題畫面 → Player vs. AI → 輸入方式 → 技能 → 關卡 → 遊戲 (每個選單都按 Enter 選第一項)，
+倒數結束後量測 gameplay_frames 幀，寫出結果並結束程式。
+
+記錄的時間 (ms，皆以 main.py 開始執行為基準；epoch 時間供父程序計算含直譯器啟動的冷啟動時間)：
+    first_menu_frame_ms       標題畫面第一次送上螢幕
+    first_gameplay_frame_ms   GameplayState 第一次送上螢幕 (倒數畫面)
+    gameplay_enter_ms         在關卡選單按下 Enter → GameplayState 第一幀
+    countdown_ms              GameplayState 第一幀 → 倒數結束 (含等待背景 AI 載入)
+    steady_state              倒數結束後的幀工作時間 / 幀間隔 (p50 / p95 / p99)
+"""
+import json
+import time
+
+import pygame
+
+DEBUG_BENCHMARK_DRIVER = False
+
+MENU_SETTLE_FRAMES = 3 # 進入選單後等幾幀再按 Enter (讓選單至少畫出來)
+MAX_RUN_SECONDS = 120.0 # 卡住時仍寫出結果並結束
+
+
+def _percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))]
+
+
+class BenchmarkDriver:
+    def __init__(self, app, main_start_epoch, output_path=None, gameplay_frames=300):
+        self.app = app
+        self.main_start_epoch = main_start_epoch
+        self.output_path = output_path
+        self.gameplay_frames = gameplay_frames
+
+        self._state_name = None
+        self._frames_in_state = 0
+        self._enter_pressed_for = set()
+        self._level_enter_epoch = None
+        self._gameplay_first_epoch = None
+        self._countdown_done_epoch = None
+        self._work_ms = []
+        self._interval_ms = []
+        self._last_present = None
+        self.marks = {} # 名稱 -> epoch
+        self.finished = False
+
+    def _mark(self, name):
+        if name not in self.marks:
+            self.marks[name] = time.time()
+            if DEBUG_BENCHMARK_DRIVER: print(f"[BenchmarkDriver] {name} at {self._since_start_ms(self.marks[name]):.1f}ms")
+
+    def _since_start_ms(self, epoch):
+        return None if epoch is None else (epoch - self.main_start_epoch) * 1000.0
+
+    def before_frame(self):
+        """事件處理之前：依目前狀態放入腳本按鍵。"""
+        state_name = self.app.current_state_name
+        if state_name != self._state_name:
+            self._state_name = state_name
+            self._frames_in_state = 0
+        self._frames_in_state += 1
+
+        names = self.app.GameFlowStateName
+        if state_name in (names.SELECT_GAME_MODE, names.SELECT_INPUT_PVA, names.SELECT_SKILL_PVA, names.SELECT_LEVEL_PVA) \
+                and self._frames_in_state > MENU_SETTLE_FRAMES and state_name not in self._enter_pressed_for:
+            self._enter_pressed_for.add(state_name)
+            if state_name == names.SELECT_LEVEL_PVA:
+                self._level_enter_epoch = time.time()
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RETURN, mod=0, unicode="\r", scancode=0))
+            pygame.event.post(pygame.event.Event(pygame.KEYUP, key=pygame.K_RETURN, mod=0, unicode="\r", scancode=0))
+
+        if time.time() - self.main_start_epoch > MAX_RUN_SECONDS:
+            self.finish(error=f"timed out in state {state_name.name if state_name else None}")
+
+    def after_present(self):
+        """FramePresenter.present() 之後：記錄里程碑與穩定狀態的幀時間。"""
+        names = self.app.GameFlowStateName
+        state = self.app.current_state_object
+        if self.app.current_state_name == names.SELECT_GAME_MODE:
+            self._mark("first_menu_frame")
+        elif self.app.current_state_name == names.GAMEPLAY and state is not None and state.env is not None:
+            if self._gameplay_first_epoch is None:
+                self._gameplay_first_epoch = time.time()
+                self._mark("first_gameplay_frame")
+            elif state.overlay is None:
+                if self._countdown_done_epoch is None:
+                    self._countdown_done_epoch = time.time()
+                    self._mark("countdown_done")
+                else:
+                    presenter = self.app.frame_presenter
+                    if presenter.last_work_ms is not None:
+                        self._work_ms.append(presenter.last_work_ms)
+                    if self._last_present is not None:
+                        self._interval_ms.append((time.perf_counter() - self._last_present) * 1000.0)
+                self._last_present = time.perf_counter()
+                if len(self._work_ms) >= self.gameplay_frames or state.game_over_banner_shown:
+                    self.finish()
+
+    def build_report(self, error=None):
+        level_enter = self._level_enter_epoch
+        report = {
+            "main_start_epoch": self.main_start_epoch,
+            "marks_epoch": dict(self.marks),
+            "first_menu_frame_ms": self._since_start_ms(self.marks.get("first_menu_frame")),
+            "first_gameplay_frame_ms": self._since_start_ms(self.marks.get("first_gameplay_frame")),
+            "gameplay_enter_ms": None if level_enter is None or self._gameplay_first_epoch is None
+                                 else (self._gameplay_first_epoch - level_enter) * 1000.0,
+            "countdown_ms": None if self._countdown_done_epoch is None or self._gameplay_first_epoch is None
+                            else (self._countdown_done_epoch - self._gameplay_first_epoch) * 1000.0,
+            "steady_state": {
+                "frames": len(self._work_ms),
+                "target_fps": self.app.frame_presenter.target_fps,
+                "work_ms": {f"p{p}": _percentile(self._work_ms, p) for p in (50, 95, 99)},
+                "interval_ms": {f"p{p}": _percentile(self._interval_ms, p) for p in (50, 95, 99)},
+            },
+            "quality_tier": self.app.quality_governor.tier["name"],
+        }
+        if error:
+            report["error"] = error
+        return report
+
+    def finish(self, error=None):
+        if self.finished:
+            return
+        self.finished = True
+        report = self.build_report(error)
+        if self.output_path:
+            with open(self.output_path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+        else:
+            print(json.dumps(report, indent=2))
+        self.app.running = False
@@ -0,0 +1,157 @@
+# game/config_cache.py
+"""
+YAML 設定檔的二進位快取：解析結果以 marshal 存在 YAML 旁邊 (config/global_settings.yaml → config/global_settings.yamlc)，
+下次啟動直接讀取，不必再跑 PyYAML 的純 Python loader。
+
+快取以 YAML 的 (mtime_ns, size, sha1) 為 key：
+    mtime 與 size 都相同           → 直接使用 (不讀 YAML 內容)
+    mtime 不同但 sha1 相同         → 仍然使用 (例如 PyInstaller 打包後檔案時間改變)，可寫入時順便更新 mtime
+    其他情況 / 快取損毀 / Python 版本不同 → 重新解析 YAML 並覆寫快取
+寫入失敗 (唯讀目錄) 時只略過，不影響載入。
+
+打包前預先產生快取 (PongSoul.spec 會自動呼叫 bake_all)：
+    python -m game.config_cache --bake
+    python -m game.config_cache --clean
+"""
+import hashlib
+import marshal
+import os
+import sys
+import yaml
+
+DEBUG_CONFIG_CACHE = False
+
+CONFIG_CACHE_ENABLED = True
+CACHE_SUFFIX = "c" # .yaml → .yamlc
+_MAGIC = b"PSYC1"
+_FORMAT_KEY = (marshal.version, sys.version_info[:2])
+
+# 預先產生快取的資料夾 (相對於專案根目錄)
+BAKE_FOLDERS = ("config", "models")
+
+stats = {"hits": 0, "misses": 0}
+
+
+def cache_path_for(yaml_path):
+    return yaml_path + CACHE_SUFFIX
+
+
+def _read_cache(cache_path):
+    try:
+        with open(cache_path, "rb") as f:
+            if f.read(len(_MAGIC)) != _MAGIC:
+                return None
+            payload = marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(payload, dict) or tuple(payload.get("format", ())) != _FORMAT_KEY:
+        return None
+    return payload
+
+
+def _write_cache(cache_path, yaml_stat, digest, data):
+    payload = {"format": _FORMAT_KEY, "mtime_ns": yaml_stat.st_mtime_ns, "size": yaml_stat.st_size,
+               "sha1": digest, "data": data}
+    try:
+        blob = marshal.dumps(payload)
+    except ValueError as e: # 例如 YAML 中有 datetime，marshal 不支援
+        if DEBUG_CONFIG_CACHE: print(f"[config_cache] Not caching {cache_path}: {e}")
+        return False
+    tmp_path = cache_path + ".tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(_MAGIC)
+            f.write(blob)
+        os.replace(tmp_path, cache_path)
+        return True
+    except OSError as e:
+        if DEBUG_CONFIG_CACHE: print(f"[config_cache] Could not write {cache_path}: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return False
+
+
+def load_yaml(yaml_path):
+    """
+    回傳 YAML 解析後的資料 (與 yaml.safe_load 相同)；可用時從二進位快取讀取。
+    YAML 本身的錯誤 (yaml.YAMLError / OSError) 照常丟出，由呼叫端處理。
+    """
+    if not CONFIG_CACHE_ENABLED:
+        with open(yaml_path, "r", encoding="utf-8") as f:
+            return yaml.safe_load(f)
+
+    yaml_stat = os.stat(yaml_path)
+    cache_path = cache_path_for(yaml_path)
+    cached = _read_cache(cache_path)
+    if cached is not None and cached["mtime_ns"] == yaml_stat.st_mtime_ns and cached["size"] == yaml_stat.st_size:
+        stats["hits"] += 1
+        return cached["data"]
+
+    with open(yaml_path, "rb") as f:
+        raw_bytes = f.read()
+    digest = hashlib.sha1(raw_bytes).hexdigest()
+    if cached is not None and cached["sha1"] == digest:
+        stats["hits"] += 1
+        _write_cache(cache_path, yaml_stat, digest, cached["data"]) # 只有時間戳改變，更新 key
+        return cached["data"]
+
+    stats["misses"] += 1
+    data = yaml.safe_load(raw_bytes.decode("utf-8"))
+    _write_cache(cache_path, yaml_stat, digest, data)
+    if DEBUG_CONFIG_CACHE: print(f"[config_cache] Parsed YAML and refreshed cache: {yaml_path}")
+    return data
+
+
+def _yaml_files(root):
+    for folder in BAKE_FOLDERS:
+        folder_path = os.path.join(root, folder)
+        if not os.path.isdir(folder_path):
+            continue
+        for filename in sorted(os.listdir(folder_path)):
+            if filename.endswith((".yaml", ".yml")):
+                yield os.path.join(folder_path, filename)
+
+
+def bake_all(root=None):
+    """為 BAKE_FOLDERS 下的每個 YAML 產生 (或更新) 快取，回傳成功寫入的快取路徑。"""
+    root = root or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    baked = []
+    for yaml_path in _yaml_files(root):
+        try:
+            with open(yaml_path, "rb") as f:
+                raw_bytes = f.read()
+            data = yaml.safe_load(raw_bytes.decode("utf-8"))
+        except (OSError, yaml.YAMLError) as e:
+            print(f"[config_cache] Warning: skipping {yaml_path}: {e}")
+            continue
+        if _write_cache(cache_path_for(yaml_path), os.stat(yaml_path), hashlib.sha1(raw_bytes).hexdigest(), data):
+            baked.append(cache_path_for(yaml_path))
+    return baked
+
+
+def clean_all(root=None):
+    root = root or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    removed = []
+    for yaml_path in _yaml_files(root):
+        cache_path = cache_path_for(yaml_path)
+        if os.path.exists(cache_path):
+            os.remove(cache_path)
+            removed.append(cache_path)
+    return removed
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Pre-bake or remove the binary YAML config caches.")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--bake", action="store_true", help="write a .yamlc cache next to every config/models YAML file")
+    group.add_argument("--clean", action="store_true", help="delete all .yamlc cache files")
+    args = parser.parse_args()
+    if args.bake:
+        paths = bake_all()
+        print(f"Baked {len(paths)} config cache file(s).")
+    else:
+        paths = clean_all()
+        print(f"Removed {len(paths)} config cache file(s).")
@@ -2,6 +2,7 @@
 import yaml
 import os
 from utils import resource_path # 從您專案的 utils 導入
+from game.config_cache import load_yaml # ⭐️ 有二進位快取時不必重新解析 YAML
 
 DEBUG_CONFIG_MANAGER = False # 保持您原有的 DEBUG 開關
 
@@ -9,6 +10,9 @@ class ConfigManager:
     def __init__(self):
         self._cache = {}
         self._global_settings = {} # 用於存放全域設定的字典
+        self._config_snapshot = None # ⭐️ 編譯後的唯讀快照 (get_config_snapshot)
+        self._level_snapshots = {}
+        self.config_version = 0 # ⭐️ 每次熱重載 (replace_yaml_data) 加一
         if DEBUG_CONFIG_MANAGER:
             print("[ConfigManager] Initializing...")
         self._preload_global_settings() # 呼叫預載入方法
@@ -90,8 +94,7 @@ class ConfigManager:
             return None # 保持返回 None，讓調用者處理
 
         try:
-            with open(absolute_path, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
+            data = load_yaml(absolute_path)
             self._cache[absolute_path] = data
             if DEBUG_CONFIG_MANAGER:
                 print(f"[ConfigManager] Loaded and cached YAML file: {absolute_path}")
@@ -124,4 +127,38 @@ class ConfigManager:
             if DEBUG_CONFIG_MANAGER:
                 print(f"[ConfigManager] get_all_skill_configs: Failed to load skill configs from '{file_path}'. Returning empty dict.")
             return {} # 如果檔案不存在或讀取失敗，返回空字典
-        return configs
\ No newline at end of file
+        return configs
+
+    def get_config_snapshot(self):
+        """global_settings + skills_config 編譯後的 ConfigSnapshot (第一次呼叫時編譯並驗證)。"""
+        if self._config_snapshot is None:
+            from game.config_snapshot import compile_config
+            self._config_snapshot = compile_config(self)
+        return self._config_snapshot
+
+    def get_level_snapshot(self, level_yaml_filename_only):
+        """驗證後的 LevelSnapshot；檔案不存在或無法解析時回傳 None。"""
+        if level_yaml_filename_only not in self._level_snapshots:
+            raw = self.get_level_config(level_yaml_filename_only)
+            snapshot = None
+            if raw is not None:
+                from game.config_snapshot import compile_level_config
+                snapshot = compile_level_config(raw, level_yaml_filename_only)
+            self._level_snapshots[level_yaml_filename_only] = snapshot
+        return self._level_snapshots[level_yaml_filename_only]
+
+    def replace_yaml_data(self, absolute_path, data):
+        """
+        熱重載用 (game.config_watcher)：以新解析的資料取代快取中的檔案內容，並讓編譯過的快照失效。
+        回傳舊的資料。只應在主執行緒的幀與幀之間呼叫。
+        """
+        old_data = self._cache.get(absolute_path)
+        self._cache[absolute_path] = data
+        if absolute_path == resource_path("config/global_settings.yaml"):
+            self._global_settings = data or {}
+        self._config_snapshot = None
+        self._level_snapshots.clear()
+        self.config_version += 1
+        if DEBUG_CONFIG_MANAGER:
+            print(f"[ConfigManager] Replaced cached data for {absolute_path} (config v{self.config_version}).")
+        return old_data
@@ -0,0 +1,332 @@
+# game/config_snapshot.py
+"""
+設定編譯器：把 global_settings.yaml、skills_config.yaml 與 models/*.yaml (關卡) 依 schema 驗證後，
+轉成不可變、有型別的快照物件 (typing.NamedTuple：沒有 __dict__、不能修改)。
+
+PongDuelEnv 與技能在建構時拿到快照並把需要的值存成自己的屬性，
+遊戲迴圈中不再經過 GameSettings 的 __getattr__ / _key_map / 巢狀 dict 查找。
+
+    snapshot = GameSettings.get_config_snapshot()          # 由 GameSettings 目前的 ConfigManager 編譯 (有快取)
+    snapshot.settings.gameplay.player_move_speed
+    snapshot.skill_params("slowmo").get("slow_time_scale")  # 技能的完整參數 (唯讀 mapping)
+    level = config_manager.get_level_snapshot("level1.yaml")
+
+驗證問題 (型別錯誤、缺少必要欄位、關卡中不認得的 key) 會印出警告並改用預設值；
+strict=True 時改為丟出 ConfigValidationError。命令列檢查所有設定檔：
+    python -m game.config_snapshot
+"""
+import os
+import sys
+from types import MappingProxyType
+from typing import NamedTuple, Mapping
+
+from game.settings import _GameSettingsSingleton
+
+DEBUG_CONFIG_SNAPSHOT = False
+
+_EMPTY_MAPPING = MappingProxyType({})
+
+
+class ConfigValidationError(ValueError):
+    def __init__(self, errors):
+        self.errors = list(errors)
+        super().__init__("Invalid configuration:\n  " + "\n  ".join(self.errors))
+
+
+# ----------------------------------------------------------------------
+# global_settings.yaml (區段名稱 + 欄位名稱 = YAML 的 dotted key；預設值取自 GameSettings._fallback_settings)
+# ----------------------------------------------------------------------
+class GameplaySettings(NamedTuple):
+    freeze_duration_ms: int
+    countdown_seconds: int
+    player_move_speed: float
+    max_trail_length: int
+
+
+class EnvDefaults(NamedTuple):
+    mass: float
+    e_ball_paddle: float
+    mu_ball_paddle: float
+    enable_spin: bool
+    speed_increment: float
+    speed_scale_every: int
+
+
+class PhysicsSettings(NamedTuple):
+    magnus_factor: float
+
+
+class BallBehaviorSettings(NamedTuple):
+    initial_speed: float
+    initial_angle_deg_range: tuple
+    initial_direction_serves_down: bool
+
+
+class AudioSettings(NamedTuple):
+    background_music_volume: float
+    click_sound_volume: float
+    countdown_sound_volume: float
+    slowmo_sound_volume: float
+
+
+class DisplaySettings(NamedTuple):
+    target_fps: int
+    vsync: bool
+    frame_stats_window: int
+
+
+class RendererSettings(NamedTuple):
+    visual_spin_multiplier: float
+    dirty_rect_rendering: bool
+    pvp_shared_render_pass: bool
+
+
+class GlobalSettings(NamedTuple):
+    gameplay: GameplaySettings
+    env_defaults: EnvDefaults
+    physics: PhysicsSettings
+    ball_behavior: BallBehaviorSettings
+    audio: AudioSettings
+    display: DisplaySettings
+    renderer: RendererSettings
+
+
+_GLOBAL_SECTIONS = (
+    ("gameplay", GameplaySettings, "gameplay"),
+    ("env_defaults", EnvDefaults, "gameplay.defaults"),
+    ("physics", PhysicsSettings, "physics"),
+    ("ball_behavior", BallBehaviorSettings, "ball_behavior"),
+    ("audio", AudioSettings, "audio"),
+    ("display", DisplaySettings, "display"),
+    ("renderer", RendererSettings, "renderer"),
+)
+
+
+# ----------------------------------------------------------------------
+# skills_config.yaml
+# ----------------------------------------------------------------------
+class SkillSnapshot(NamedTuple):
+    code: str
+    duration_ms: int
+    cooldown_ms: int
+    display_name_zh_full: str = ""
+    bar_color: tuple = None
+    params: Mapping = _EMPTY_MAPPING # 該技能的完整設定 (唯讀；list 轉成 tuple)
+
+
+# 各技能額外檢查型別的參數 (有寫才檢查；技能本身對缺少的參數有預設值)
+_SKILL_PARAM_TYPES = {
+    "slowmo": {"slow_time_scale": float, "fadeout_duration_ms": int, "owner_paddle_speed_multiplier": float},
+    "long_paddle": {"paddle_multiplier": float, "animation_ms": int},
+    "soul_eater_bug": {"bug_image_path": str, "bug_display_scale_factor": float},
+    "purgatory_domain": {"domain_filter_color_rgba": tuple, "ball_aura_color_rgba": tuple,
+                         "opponent_paddle_slowdown_factor": float},
+}
+
+
+# ----------------------------------------------------------------------
+# models/levelN.yaml
+# ----------------------------------------------------------------------
+class LevelSnapshot(NamedTuple):
+    name: str
+    initial_direction: str = "down"
+    initial_angle_deg_range: tuple = (-60, 60)
+    initial_speed: float = 0.02
+    enable_spin: bool = True
+    magnus_factor: float = 0.01
+    speed_increment: float = 0.002
+    speed_scale_every: int = 3
+    player_life: int = 3
+    ai_life: int = 3
+    player_paddle_width: int = 100
+    ai_paddle_width: int = 60
+    bg_music: str = "bg_music_level1.mp3"
+    theme_name: str = ""
+    source_keys: tuple = () # YAML 中實際寫了的 key
+
+    def to_env_config(self):
+        """只包含 YAML 實際寫了的 key (已驗證) 的 dict，可直接 update 到 GameplayState 的 common_game_config。"""
+        return {key: getattr(self, key) for key in self.source_keys}
+
+
+class ConfigSnapshot(NamedTuple):
+    settings: GlobalSettings
+    skills: Mapping # skill code -> SkillSnapshot (唯讀)
+
+    def skill(self, code):
+        return self.skills.get(code)
+
+    def skill_params(self, code):
+        skill = self.skills.get(code)
+        return skill.params if skill is not None else _EMPTY_MAPPING
+
+
+# ----------------------------------------------------------------------
+# 編譯 / 驗證
+# ----------------------------------------------------------------------
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _coerce(value, expected_type):
+    """回傳 (ok, value)。int → float 可以；bool 不能當數字；list → tuple。"""
+    if expected_type is float:
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return True, float(value)
+        return False, None
+    if expected_type is int:
+        if isinstance(value, int) and not isinstance(value, bool):
+            return True, value
+        if isinstance(value, float) and value.is_integer():
+            return True, int(value)
+        return False, None
+    if expected_type is tuple:
+        if isinstance(value, (list, tuple)):
+            return True, _freeze(value)
+        return False, None
+    if isinstance(value, expected_type):
+        return True, value
+    return False, None
+
+
+def _build(cls, raw, path, default_for, errors, skip=()):
+    raw = raw if isinstance(raw, dict) else {}
+    values = {}
+    for name in cls._fields:
+        if name in skip:
+            continue
+        expected_type = cls.__annotations__[name]
+        has_default, default = default_for(name)
+        if raw.get(name) is None:
+            if not has_default:
+                errors.append(f"{path}.{name}: required value is missing")
+            values[name] = _freeze(default)
+            continue
+        ok, value = _coerce(raw[name], expected_type)
+        if not ok:
+            errors.append(f"{path}.{name}: expected {expected_type.__name__}, got {raw[name]!r}; using {default!r}")
+            value = _freeze(default)
+        values[name] = value
+    return values
+
+
+def _report(errors, strict, source):
+    if not errors:
+        return
+    if strict:
+        raise ConfigValidationError(errors)
+    for error in errors:
+        print(f"[ConfigSnapshot] Warning ({source}): {error}")
+
+
+def _get_section(raw, dotted):
+    for key in dotted.split("."):
+        raw = raw.get(key) if isinstance(raw, dict) else None
+    return raw
+
+
+def compile_global_settings(raw, strict=False):
+    errors = []
+    fallback = _GameSettingsSingleton._fallback_settings
+    sections = {}
+    for attr, cls, yaml_section in _GLOBAL_SECTIONS:
+        def default_for(name, yaml_section=yaml_section):
+            key = f"{yaml_section}.{name}"
+            return key in fallback, fallback.get(key)
+        sections[attr] = cls(**_build(cls, _get_section(raw or {}, yaml_section), yaml_section, default_for, errors))
+    _report(errors, strict, "global_settings.yaml")
+    return GlobalSettings(**sections)
+
+
+def compile_skill_configs(raw, strict=False):
+    errors = []
+    skills = {}
+    for code, cfg in (raw or {}).items():
+        if not isinstance(cfg, dict):
+            errors.append(f"{code}: expected a mapping, got {type(cfg).__name__}")
+            continue
+
+        def default_for(name):
+            default = SkillSnapshot._field_defaults.get(name)
+            return name in SkillSnapshot._field_defaults, default
+        values = _build(SkillSnapshot, cfg, code, default_for, errors, skip=("code", "params"))
+        for param, expected_type in _SKILL_PARAM_TYPES.get(code, {}).items():
+            if cfg.get(param) is not None and not _coerce(cfg[param], expected_type)[0]:
+                errors.append(f"{code}.{param}: expected {expected_type.__name__}, got {cfg[param]!r}")
+        skills[code] = SkillSnapshot(code=code, params=_freeze(cfg), **values)
+    _report(errors, strict, "skills_config.yaml")
+    return MappingProxyType(skills)
+
+
+def compile_level_config(raw, name, strict=False):
+    errors = []
+    raw = raw if isinstance(raw, dict) else {}
+    for key in raw:
+        if key not in LevelSnapshot._fields or key in ("name", "source_keys"):
+            errors.append(f"{name}: unknown key '{key}' (ignored)")
+
+    def default_for(field_name):
+        return True, LevelSnapshot._field_defaults.get(field_name)
+    values = _build(LevelSnapshot, raw, name, default_for, errors, skip=("name", "source_keys"))
+    if values["initial_direction"] not in ("up", "down"):
+        errors.append(f"{name}.initial_direction: expected 'up' or 'down', got {values['initial_direction']!r}; using 'down'")
+        values["initial_direction"] = "down"
+    _report(errors, strict, "level config")
+    source_keys = tuple(key for key in raw if key in values)
+    return LevelSnapshot(name=name, source_keys=source_keys, **values)
+
+
+def compile_config(config_manager, strict=False):
+    """從 ConfigManager 已載入的 YAML 編譯出完整的 ConfigSnapshot。"""
+    snapshot = ConfigSnapshot(
+        settings=compile_global_settings(config_manager._global_settings, strict=strict),
+        skills=compile_skill_configs(config_manager.get_all_skill_configs(), strict=strict),
+    )
+    if DEBUG_CONFIG_SNAPSHOT: print(f"[ConfigSnapshot] Compiled settings + {len(snapshot.skills)} skills.")
+    return snapshot
+
+
+_default_snapshot = None
+
+
+def default_config_snapshot():
+    """沒有 GameApp (例如訓練腳本) 時使用：以新的 ConfigManager 載入 YAML 並編譯一次。"""
+    global _default_snapshot
+    if _default_snapshot is None:
+        from game.config_manager import ConfigManager
+        _default_snapshot = ConfigManager().get_config_snapshot()
+    return _default_snapshot
+
+
+def validate_all(models_folder="models"):
+    """嚴格檢查所有設定檔，回傳錯誤訊息列表 (空 = 全部通過)。"""
+    from game.config_manager import ConfigManager
+    from utils import resource_path
+    config_manager = ConfigManager()
+    problems = []
+    for label, compile_fn in (("global_settings.yaml", lambda: compile_global_settings(config_manager._global_settings, strict=True)),
+                              ("skills_config.yaml", lambda: compile_skill_configs(config_manager.get_all_skill_configs(), strict=True))):
+        try:
+            compile_fn()
+        except ConfigValidationError as e:
+            problems.extend(f"{label}: {error}" for error in e.errors)
+    models_path = resource_path(models_folder)
+    for filename in sorted(os.listdir(models_path)):
+        if filename.endswith(".yaml"):
+            try:
+                compile_level_config(config_manager.get_level_config(filename), filename, strict=True)
+            except ConfigValidationError as e:
+                problems.extend(e.errors)
+    return problems
+
+
+if __name__ == "__main__":
+    found = validate_all()
+    for problem in found:
+        print(problem)
+    print("All config files are valid." if not found else f"{len(found)} problem(s) found.")
+    sys.exit(1 if found else 0)
@@ -0,0 +1,148 @@
+# game/config_watcher.py
+"""
+調整平衡數值用的設定檔熱重載：背景執行緒每 poll_interval_ms 檢查 skills_config.yaml 與 models/*.yaml
+的 (mtime_ns, size)，有變動就在背景重新解析 (透過 config_cache，順便更新 .yamlc)，
+再由主執行緒在幀與幀之間呼叫 apply_pending() 換進 ConfigManager。
+
+換進之後 ConfigManager 會重新編譯 ConfigSnapshot / LevelSnapshot，所以下一個 PongDuelEnv (下一場比賽)
+就會用到新數值；正在進行的比賽不會中途換掉物理與技能參數。目前的狀態會收到 on_config_reloaded()。
+
+global_settings.yaml 不在監看範圍：主題等執行中修改的設定存在 ConfigManager._global_settings，重載會蓋掉它們。
+每次重載印出一行變更紀錄，例如：
+    [ConfigWatcher] Reloaded config/skills_config.yaml (config v2): slowmo.slow_time_scale 0.3 -> 0.2
+"""
+import glob
+import os
+import queue
+import threading
+
+import yaml
+
+from utils import resource_path
+from game.config_cache import load_yaml
+
+DEBUG_CONFIG_WATCHER = False
+
+# 相對於 resource_path 的 glob pattern
+WATCHED_PATTERNS = ("config/skills_config.yaml", "models/*.yaml")
+MAX_CHANGELOG_ITEMS = 5 # 一行變更紀錄最多列出幾個 key
+
+
+def _flatten(data, prefix=""):
+    if isinstance(data, dict):
+        flat = {}
+        for key, value in data.items():
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        return flat
+    return {prefix[:-1]: data}
+
+
+def describe_changes(old_data, new_data):
+    """回傳 'a.b 1 -> 2, +c 3, -d' 形式的摘要；沒有差異時回傳 'no value changes'。"""
+    old_flat = _flatten(old_data) if isinstance(old_data, dict) else {}
+    new_flat = _flatten(new_data) if isinstance(new_data, dict) else {}
+    items = []
+    for key in sorted(old_flat.keys() | new_flat.keys()):
+        if key not in old_flat:
+            items.append(f"+{key} {new_flat[key]!r}")
+        elif key not in new_flat:
+            items.append(f"-{key}")
+        elif old_flat[key] != new_flat[key]:
+            items.append(f"{key} {old_flat[key]!r} -> {new_flat[key]!r}")
+    if not items:
+        return "no value changes"
+    extra = len(items) - MAX_CHANGELOG_ITEMS
+    return ", ".join(items[:MAX_CHANGELOG_ITEMS]) + (f", +{extra} more" if extra > 0 else "")
+
+
+class ConfigWatcher:
+    def __init__(self, config_manager, poll_interval_ms=500, patterns=WATCHED_PATTERNS):
+        self.config_manager = config_manager
+        self.poll_interval_s = max(50, int(poll_interval_ms)) / 1000.0
+        self.patterns = tuple(patterns)
+        self._known_stats = {} # absolute path -> (mtime_ns, size)
+        self._pending = queue.Queue() # (absolute_path, data) 由背景執行緒放入
+        self._stop_event = threading.Event()
+        self._thread = None
+        self.reload_count = 0
+        self._scan(report=False) # 記下目前的狀態；啟動前已存在的檔案不算變更
+
+    @classmethod
+    def from_settings(cls, config_manager):
+        from game.settings import GameSettings
+        return cls(config_manager, poll_interval_ms=GameSettings.CONFIG_HOT_RELOAD_POLL_MS)
+
+    def _watched_paths(self):
+        paths = set()
+        for pattern in self.patterns:
+            paths.update(glob.glob(resource_path(pattern)))
+        return paths
+
+    def _scan(self, report=True):
+        """比對 mtime / size；有變動的檔案在這個 (背景) 執行緒解析後放進佇列。"""
+        for path in self._watched_paths():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            key = (stat.st_mtime_ns, stat.st_size)
+            if self._known_stats.get(path) == key:
+                continue
+            self._known_stats[path] = key
+            if not report:
+                continue
+            try:
+                data = load_yaml(path)
+            except (OSError, yaml.YAMLError) as e:
+                # 存檔到一半或語法錯誤：保留舊設定，下次存檔時會再觸發
+                print(f"[ConfigWatcher] Warning: could not reload {self._label(path)} ({' '.join(str(e).split())}). Keeping previous values.")
+                continue
+            self._pending.put((path, data))
+            if DEBUG_CONFIG_WATCHER: print(f"[ConfigWatcher] Change detected: {path}")
+
+    def _run(self):
+        while not self._stop_event.wait(self.poll_interval_s):
+            try:
+                self._scan()
+            except Exception as e:
+                print(f"[ConfigWatcher] Warning: poll failed ({e}).")
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="config-watcher", daemon=True)
+            self._thread.start()
+            if DEBUG_CONFIG_WATCHER: print(f"[ConfigWatcher] Watching {self.patterns} every {self.poll_interval_s * 1000:.0f}ms")
+        return self
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def apply_pending(self):
+        """主執行緒呼叫：把背景解析好的設定換進 ConfigManager，回傳變更的檔名 (例如 ['level1.yaml'])。"""
+        changed = []
+        while True:
+            try:
+                path, data = self._pending.get_nowait()
+            except queue.Empty:
+                break
+            old_data = self.config_manager.replace_yaml_data(path, data)
+            self.reload_count += 1
+            summary = describe_changes(old_data, data) if old_data is not None else "not loaded before this change"
+            print(f"[ConfigWatcher] Reloaded {self._label(path)} (config v{self.config_manager.config_version}): {summary}")
+            self._validate(path)
+            changed.append(os.path.basename(path))
+        return changed
+
+    def _validate(self, path):
+        # 立即編譯快照，讓驗證警告在存檔後馬上出現 (而不是下一場比賽開始時)
+        if os.path.basename(os.path.dirname(path)) == "models":
+            self.config_manager.get_level_snapshot(os.path.basename(path))
+        else:
+            self.config_manager.get_config_snapshot()
+
+    @staticmethod
+    def _label(path):
+        return os.path.join(os.path.basename(os.path.dirname(path)), os.path.basename(path))
@@ -0,0 +1,114 @@
+# game/frame_presenter.py
+import time
+import pygame
+from collections import deque
+from game.settings import GameSettings
+
+DEBUG_FRAME_PRESENTER = False
+
+class FramePresenter:
+    """
+    唯一負責「把畫面送上螢幕」與「幀率節拍」的物件。
+    GameApp.run() 每一幀開頭呼叫 begin_frame() 取得 dt，畫完後呼叫 present()；
+    Renderer 與各個 State 只負責畫到 Surface 上，不再自行 flip / tick。
+
+    target_fps <= 0 代表不限制幀率 (uncapped)。
+    統計：最近 stats_window 幀的 frame time (p50 / p99) 與錯過期限 (工作時間超過單幀預算) 的次數。
+    """
+    def __init__(self, target_fps=None, stats_window=None):
+        self.target_fps = GameSettings.TARGET_FPS if target_fps is None else target_fps
+        stats_window = GameSettings.FRAME_STATS_WINDOW if stats_window is None else stats_window
+        self.clock = pygame.time.Clock()
+
+        self.frame_times_ms = deque(maxlen=max(1, int(stats_window))) # 相鄰兩次 present 之間的間隔
+        self.work_times_ms = deque(maxlen=max(1, int(stats_window)))  # begin_frame 到 present (不含等待)
+        self.frames_presented = 0
+        self.missed_deadlines = 0
+        self.last_work_ms = None # 最近一幀的工作時間 (還沒有完整的一幀時為 None)
+        self._frame_start = None
+        self._last_present = None
+
+    @property
+    def frame_budget_ms(self):
+        return 1000.0 / self.target_fps if self.target_fps and self.target_fps > 0 else None
+
+    def set_display_mode(self, size, flags=0):
+        """建立顯示模式；設定啟用 vsync 時先嘗試 SCALED + vsync，不支援則退回一般模式。"""
+        if GameSettings.VSYNC:
+            try:
+                surface = pygame.display.set_mode(size, flags | pygame.SCALED, vsync=1)
+                if DEBUG_FRAME_PRESENTER: print(f"[FramePresenter] Display mode {size} with vsync.")
+                return surface
+            except pygame.error as e:
+                print(f"[FramePresenter] vsync not available ({e}). Falling back to non-vsync display mode.")
+        return pygame.display.set_mode(size, flags)
+
+    def set_target_fps(self, target_fps):
+        self.target_fps = target_fps
+        if DEBUG_FRAME_PRESENTER: print(f"[FramePresenter] Target FPS set to {target_fps if target_fps and target_fps > 0 else 'uncapped'}")
+
+    def begin_frame(self):
+        """等待到下一幀 (依 target_fps) 並回傳上一幀經過的秒數。"""
+        if self.target_fps and self.target_fps > 0:
+            dt_ms = self.clock.tick(self.target_fps)
+        else:
+            dt_ms = self.clock.tick()
+        self._frame_start = time.perf_counter()
+        return dt_ms / 1000.0
+
+    def present(self, dirty_rects=None):
+        """
+        把這一幀畫好的內容送上螢幕 (每幀只能有這一個 flip / update)。
+        dirty_rects 為 None 時整個畫面 flip；否則只 update 這些矩形。
+        """
+        if dirty_rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty_rects)
+        now = time.perf_counter()
+
+        if self._frame_start is None:
+            self.last_work_ms = None
+        else:
+            work_ms = (now - self._frame_start) * 1000.0
+            self.work_times_ms.append(work_ms)
+            self.last_work_ms = work_ms
+            budget = self.frame_budget_ms
+            if budget is not None and work_ms > budget:
+                self.missed_deadlines += 1
+        if self._last_present is not None:
+            self.frame_times_ms.append((now - self._last_present) * 1000.0)
+        self._last_present = now
+        self.frames_presented += 1
+
+        if DEBUG_FRAME_PRESENTER and self.frames_presented % 300 == 0:
+            print(f"[FramePresenter] {self.format_stats()}")
+
+    @staticmethod
+    def _percentile(values, pct):
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+        return ordered[index]
+
+    def get_stats(self):
+        frame_times = list(self.frame_times_ms)
+        work_times = list(self.work_times_ms)
+        p50 = self._percentile(frame_times, 50)
+        return {
+            "target_fps": self.target_fps,
+            "frames_presented": self.frames_presented,
+            "frame_time_p50_ms": p50,
+            "frame_time_p99_ms": self._percentile(frame_times, 99),
+            "work_time_p50_ms": self._percentile(work_times, 50),
+            "work_time_p99_ms": self._percentile(work_times, 99),
+            "effective_fps": 1000.0 / p50 if p50 > 0 else 0.0,
+            "missed_deadlines": self.missed_deadlines,
+        }
+
+    def format_stats(self):
+        stats = self.get_stats()
+        return (f"fps~{stats['effective_fps']:.1f} frame p50 {stats['frame_time_p50_ms']:.2f}ms / p99 {stats['frame_time_p99_ms']:.2f}ms, "
+                f"work p50 {stats['work_time_p50_ms']:.2f}ms / p99 {stats['work_time_p99_ms']:.2f}ms, "
+                f"missed {stats['missed_deadlines']}/{stats['frames_presented']}")
@@ -0,0 +1,172 @@
+# game/headless_renderer.py
+"""
+不需要顯示視窗的離屏渲染：把 PongDuelEnv 的畫面畫到一般的 pygame.Surface 上，
+再以 NumPy 陣列取出 (錄影、像素觀測訓練用)。
+
+    target = HeadlessRenderTarget(width=400, height=600, output_size=(84, 84), grayscale=True)
+    target.attach(env)
+    frame = target.render(env)                 # (84, 84) uint8
+    with target.frame_view(env) as view:       # 原解析度、零拷貝 (H, W, 3) view，離開 with 後失效
+        ...
+    batch = target.render_batch(envs)          # (N, 84, 84)
+    stack = BatchedFrameStack(len(envs), 4, batch.shape[1:])
+    obs = stack.push(batch)                    # (N, 4, 84, 84)
+"""
+import os
+from contextlib import contextmanager
+import numpy as np
+import pygame
+
+DEBUG_HEADLESS_RENDERER = False
+
+_GRAYSCALE_WEIGHTS = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def ensure_headless_display():
+    """
+    Renderer 載入球體圖像時會呼叫 convert_alpha()，這需要一個已設定的顯示模式。
+    沒有視窗時改用 SDL 的 dummy video driver 開一個 1x1 的隱形顯示。
+    """
+    if pygame.display.get_init() and pygame.display.get_surface() is not None:
+        return
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    if DEBUG_HEADLESS_RENDERER: print(f"[HeadlessRenderTarget] Using SDL video driver '{pygame.display.get_driver()}' for off-screen rendering.")
+
+
+class HeadlessRenderTarget:
+    def __init__(self, width=400, height=600, output_size=None, grayscale=False, crop_to_game_area=False):
+        """
+        width / height     : 離屏畫布大小 (Renderer 會依此計算縮放與版面)
+        output_size        : (寬, 高)；給定時每幀先 smoothscale 到這個大小
+        grayscale          : 輸出 (H, W) 的灰階 uint8，而不是 (H, W, 3) 的 RGB
+        crop_to_game_area  : 只取遊戲區 (不含 UI 條)；PvP 為兩個視角並排的範圍
+        """
+        ensure_headless_display()
+        self.surface = pygame.Surface((width, height)) # 一般 Surface，不是顯示視窗
+        self.output_size = tuple(output_size) if output_size else None
+        self.grayscale = grayscale
+        self.crop_to_game_area = crop_to_game_area
+        self._scaled_surface = None
+
+    def attach(self, env):
+        """讓 env 之後的 render() 畫到這個離屏畫布上 (會重建 env 的 Renderer)。"""
+        if env.renderer is not None:
+            env.renderer.close()
+            env.renderer = None
+        env.provided_main_screen_surface = self.surface
+
+    def _draw(self, env):
+        if self.surface.get_locked() or (self._scaled_surface is not None and self._scaled_surface.get_locked()):
+            raise RuntimeError("HeadlessRenderTarget: a frame_view() array is still referenced; drop it (or copy it) before rendering the next frame.")
+        if env.provided_main_screen_surface is not self.surface:
+            self.attach(env)
+        env.render()
+        # 同一張畫布會被不同 env 輪流使用，髒矩形的「上一幀」假設不成立，固定整張重畫
+        env.renderer.dirty_rect_rendering = False
+
+    def _source_rect(self, env):
+        if not self.crop_to_game_area:
+            return self.surface.get_rect()
+        renderer = env.renderer
+        if hasattr(renderer, "game_area_rect_on_screen"):
+            return renderer.game_area_rect_on_screen
+        return renderer.viewport1_game_area_on_screen.union(renderer.viewport2_game_area_on_screen)
+
+    def _output_surface(self, env):
+        source = self.surface.subsurface(self._source_rect(env))
+        if self.output_size is None:
+            return source
+        if self._scaled_surface is None or self._scaled_surface.get_size() != self.output_size:
+            self._scaled_surface = pygame.Surface(self.output_size)
+        pygame.transform.smoothscale(source, self.output_size, self._scaled_surface)
+        return self._scaled_surface
+
+    @contextmanager
+    def frame_view(self, env):
+        """
+        畫一幀並回傳 (H, W, 3) uint8 的零拷貝 view (pygame.surfarray.pixels3d)。
+        view 會鎖住 Surface，只在 with 區塊內有效；需要保留請自行 copy()。
+        """
+        self._draw(env)
+        output = self._output_surface(env)
+        pixels = pygame.surfarray.pixels3d(output)
+        try:
+            yield pixels.transpose(1, 0, 2) # surfarray 是 (x, y)，轉成影像慣用的 (y, x)
+        finally:
+            del pixels # 釋放 Surface 的鎖，下一幀才能繼續畫
+
+    def render(self, env, out=None):
+        """畫一幀並回傳一份獨立的 uint8 陣列 (可給 out 重複使用同一塊記憶體)。"""
+        with self.frame_view(env) as view:
+            if self.grayscale:
+                gray = np.dot(view, _GRAYSCALE_WEIGHTS)
+                if out is None:
+                    return gray.astype(np.uint8)
+                out[...] = gray
+            else:
+                if out is None:
+                    return view.copy()
+                out[...] = view
+        return out
+
+    def render_batch(self, envs, out=None):
+        """依序把 N 個 env 畫到同一張離屏畫布上，回傳 (N, H, W[, 3]) 的 uint8 陣列。"""
+        if not envs:
+            raise ValueError("render_batch needs at least one env.")
+        first = self.render(envs[0], None if out is None else out[0])
+        if out is None:
+            out = np.empty((len(envs),) + first.shape, dtype=np.uint8)
+            out[0] = first
+        for i in range(1, len(envs)):
+            self.render(envs[i], out[i])
+        return out
+
+
+class BatchedFrameStack:
+    """
+    N 個 env 各自保留最近 k 幀的環狀緩衝 (像素觀測的 frame stacking)。
+    push(batch) 回傳 (N, k, H, W[, 3])，最舊的在前。
+    """
+    def __init__(self, num_envs, k, frame_shape, dtype=np.uint8):
+        self.k = k
+        self._frames = np.zeros((num_envs, k) + tuple(frame_shape), dtype=dtype)
+        self._next = 0
+        self._order = np.arange(k)
+
+    def reset(self, env_index=None, frame=None):
+        """回合結束時清空 (或以 frame 填滿) 指定 env 的堆疊；env_index 為 None 時全部重置。"""
+        target = self._frames if env_index is None else self._frames[env_index]
+        target[...] = 0 if frame is None else frame
+
+    def push(self, batch_frames):
+        self._frames[:, self._next] = batch_frames
+        self._next = (self._next + 1) % self.k
+        self._order = (np.arange(self.k) + self._next) % self.k
+        return self.get()
+
+    def get(self):
+        return self._frames[:, self._order]
+
+
+class FrameRecorder:
+    """把單一 env 的畫面逐幀收集起來，存成 .npy (T, H, W[, 3])，方便之後轉成影片或做資料集。"""
+    def __init__(self, target):
+        self.target = target
+        self.frames = []
+
+    def capture(self, env):
+        self.frames.append(self.target.render(env))
+
+    def save(self, path):
+        if not self.frames:
+            print("[FrameRecorder] Warning: no frames captured, nothing saved.")
+            return None
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        np.save(path, np.stack(self.frames))
+        if DEBUG_HEADLESS_RENDERER: print(f"[FrameRecorder] Saved {len(self.frames)} frames to {path}")
+        return path
+
+    def clear(self):
+        self.frames.clear()
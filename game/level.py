@@ -1,38 +1,37 @@
 import os
-import yaml
-from utils import resource_path # <--- 加入這行
+from game.level_catalog import LevelCatalog
 
 class LevelManager:
-    def __init__(self, config_manager, models_folder="models"): # <--- 新增 config_manager 參數
+    def __init__(self, config_manager, models_folder="models", catalog=None): # <--- 新增 config_manager 參數
         self.config_manager = config_manager # <--- 儲存 config_manager 實例
         self.models_folder = models_folder # models_folder 仍然有用，用於列出 .pth 檔案和推斷 .yaml 檔名
-        self.model_files = sorted([
-            f for f in os.listdir(models_folder) if f.endswith(".pth")
-        ])
+        # ⭐️ 關卡清單來自 LevelCatalog (GameApp 共用一份，資料夾沒變動時不重新掃描)
+        self.catalog = catalog if catalog is not None else LevelCatalog(config_manager, models_folder)
+        self.entries = self.catalog.entries
+        self.model_files = [os.path.basename(entry.model_path) for entry in self.entries]
         self.current_level = 0
 
-    def get_current_model_path(self):
-        if self.current_level < len(self.model_files):
-            return os.path.join(self.models_folder, self.model_files[self.current_level])
+    def get_current_entry(self):
+        if self.current_level < len(self.entries):
+            return self.entries[self.current_level]
         return None
 
-    def get_current_config(self):
-        if not self.model_files or self.current_level >= len(self.model_files):
-            # 使用 ConfigManager 的除錯輸出風格 (如果需要)
-            # print(f"[LevelManager] Warning: No model files available or current_level out of bounds.")
-            return {} # 返回空字典表示沒有有效的設定
-
-        model_filename = self.model_files[self.current_level]
-        yaml_filename_only = model_filename.replace(".pth", ".yaml") # 只取檔案名稱
+    def get_current_model_path(self):
+        entry = self.get_current_entry()
+        return entry.model_path if entry else None
 
-        # 使用 ConfigManager 獲取設定
-        # ConfigManager 的 get_level_config 會處理路徑和快取
-        config_data = self.config_manager.get_level_config(yaml_filename_only)
+    def get_current_snapshot(self):
+        """目前關卡驗證後的 LevelSnapshot (沒有關卡或讀取失敗時為 None)。"""
+        entry = self.get_current_entry()
+        return entry.snapshot if entry else None
 
-        if config_data is None: # 如果 ConfigManager 返回 None (表示讀取失敗或檔案不存在)
-            # print(f"[LevelManager] Warning: ConfigManager failed to load config for {yaml_filename_only}")
+    def get_current_config(self):
+        """目前關卡 YAML 中寫了的設定 (已驗證型別) 的 dict；沒有時回傳空字典。"""
+        snapshot = self.get_current_snapshot()
+        if snapshot is None:
+            # print(f"[LevelManager] Warning: No level config available for level {self.current_level}.")
             return {} # 確保返回字典
-        return config_data
+        return snapshot.to_env_config()
 
     def advance_level(self):
         self.current_level += 1
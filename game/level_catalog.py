@@ -0,0 +1,129 @@
+# game/level_catalog.py
+"""
+關卡目錄：models/ 底下每個 .pth 關卡的模型路徑、YAML 設定檔、顯示名稱、難度參數、模型雜湊與檔案大小。
+GameApp 建立一份 (game_app.level_catalog)，關卡選單與 GameplayState 都從記憶體讀取，
+不必每次進選單 / 開新局都 os.listdir + 排序 + 讀 YAML。
+
+entries 被存取時只 stat 一次 models/ 資料夾：資料夾 mtime 改變 (新增 / 刪除 / 改名關卡) 或
+ConfigManager.config_version 改變 (關卡 YAML 熱重載) 時才重建；模型雜湊依 (mtime_ns, size) 沿用。
+
+    python -m game.level_catalog
+"""
+import hashlib
+import os
+import time
+from types import MappingProxyType
+from typing import Any, NamedTuple, Optional
+
+from utils import resource_path
+
+DEBUG_LEVEL_CATALOG = False
+
+# 選單 / 報告顯示的難度參數 (LevelSnapshot 的欄位)
+DIFFICULTY_KEYS = ("player_life", "ai_life", "player_paddle_width", "ai_paddle_width",
+                   "initial_speed", "speed_increment", "speed_scale_every")
+
+
+class LevelEntry(NamedTuple):
+    key: str                   # "level1"
+    display_name: str          # "Level 1"
+    model_path: str            # .pth 的絕對路徑
+    config_file: Optional[str] # "level1.yaml"；沒有對應的 YAML 時為 None
+    model_size: int
+    model_sha1: str
+    difficulty: Any            # 唯讀 dict：DIFFICULTY_KEYS -> 值 (沒有 YAML 時為 LevelSnapshot 的預設值)
+    snapshot: Any              # 驗證後的 LevelSnapshot；沒有 YAML 或讀取失敗時為 None
+
+
+def _sha1_of_file(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class LevelCatalog:
+    def __init__(self, config_manager, models_folder="models"):
+        self.config_manager = config_manager
+        self.models_path = resource_path(models_folder)
+        self._entries = ()
+        self._stamp = None # (資料夾 mtime_ns, config_version)
+        self._hash_cache = {} # 模型路徑 -> ((mtime_ns, size), sha1)
+        self.build_count = 0
+
+    @property
+    def entries(self):
+        """依檔名排序的 LevelEntry tuple (資料夾有變動時先重建)。"""
+        try:
+            stamp = (os.stat(self.models_path).st_mtime_ns, self.config_manager.config_version)
+        except OSError:
+            stamp = (None, self.config_manager.config_version)
+        if stamp != self._stamp:
+            self._entries = self._build()
+            self._stamp = stamp
+        return self._entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, index):
+        entries = self.entries
+        return entries[index] if 0 <= index < len(entries) else None
+
+    def display_names(self):
+        return [entry.display_name for entry in self.entries]
+
+    def _build(self):
+        t0 = time.perf_counter()
+        try:
+            model_files = sorted(f for f in os.listdir(self.models_path) if f.endswith(".pth"))
+        except OSError as e:
+            print(f"[LevelCatalog] Warning: could not list '{self.models_path}': {e}")
+            model_files = []
+
+        from game.config_snapshot import LevelSnapshot
+        entries = []
+        for model_file in model_files:
+            key = model_file[:-len(".pth")]
+            model_path = os.path.join(self.models_path, model_file)
+            yaml_file = key + ".yaml"
+            has_yaml = os.path.exists(os.path.join(self.models_path, yaml_file))
+            snapshot = self.config_manager.get_level_snapshot(yaml_file) if has_yaml else None
+            defaults = snapshot if snapshot is not None else LevelSnapshot(name=key)
+            model_size, model_sha1 = self._model_size_and_hash(model_path)
+            entries.append(LevelEntry(
+                key=key,
+                display_name=key.replace("level", "Level "),
+                model_path=model_path,
+                config_file=yaml_file if has_yaml else None,
+                model_size=model_size,
+                model_sha1=model_sha1,
+                difficulty=MappingProxyType({name: getattr(defaults, name) for name in DIFFICULTY_KEYS}),
+                snapshot=snapshot,
+            ))
+        self.build_count += 1
+        if DEBUG_LEVEL_CATALOG:
+            print(f"[LevelCatalog] Built {len(entries)} levels in {(time.perf_counter() - t0) * 1000.0:.1f}ms (build #{self.build_count}).")
+        return tuple(entries)
+
+    def _model_size_and_hash(self, model_path):
+        try:
+            st = os.stat(model_path)
+        except OSError:
+            return 0, ""
+        file_key = (st.st_mtime_ns, st.st_size)
+        cached = self._hash_cache.get(model_path)
+        if cached is None or cached[0] != file_key:
+            cached = (file_key, _sha1_of_file(model_path))
+            self._hash_cache[model_path] = cached
+        return st.st_size, cached[1]
+
+
+if __name__ == "__main__":
+    from game.config_manager import ConfigManager
+    catalog = LevelCatalog(ConfigManager())
+    for i, entry in enumerate(catalog.entries):
+        difficulty = ", ".join(f"{k}={v}" for k, v in entry.difficulty.items())
+        print(f"{i + 1}. {entry.display_name:<18} {entry.model_size:>8}B  sha1 {entry.model_sha1[:12]}  "
+              f"{entry.config_file or '(no yaml)'}  {difficulty}")
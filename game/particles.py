@@ -0,0 +1,157 @@
+# game/particles.py
+"""
+以 NumPy struct-of-arrays 實作的粒子系統 (預先配置固定容量的陣列)。
+
+每個粒子佔用各陣列的同一個 index：
+    pos (N, 2)、vel (N, 2)          正規化座標 / 每幀位移
+    life, initial_life (N,)         剩餘 / 初始壽命 (ms)
+    base_size, size (N,)            基準大小 / 目前大小 (邏輯 px)
+    color (N, 4)                    目前 RGBA
+    以及建構時指定的 extra_fields (例如衝擊波的半徑)，各為 (N,) float
+
+update() 一次向量化完成：壽命遞減 → 剔除死亡粒子 (swap-remove 壓縮，活著的粒子永遠在 [0, count)) →
+位置積分 → 依壽命比例 (1 → 0) 的顏色漸層與大小曲線。
+Renderer 直接從 active_* 的陣列 view 取資料 blit，不需要每個粒子一個 dict。
+"""
+import numpy as np
+
+DEBUG_PARTICLES = False
+
+
+class ParticleSystem:
+    def __init__(self, capacity, color_stops=None, size_start_factor=1.0, size_end_factor=0.5, extra_fields=()):
+        """
+        color_stops       : [(life_ratio, (r, g, b, a)), ...]，life_ratio 1.0 = 剛出生，0.0 = 即將消失
+        size_start_factor : 出生時 size = base_size * size_start_factor
+        size_end_factor   : 消失時 size = base_size * size_end_factor (中間線性)
+        extra_fields      : 額外的每粒子 float 欄位名稱 (由使用者自行更新)
+        """
+        self.capacity = int(capacity)
+        self.count = 0
+        self.pos = np.zeros((self.capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((self.capacity, 2), dtype=np.float32)
+        self.life = np.zeros(self.capacity, dtype=np.float32)
+        self.initial_life = np.ones(self.capacity, dtype=np.float32)
+        self.base_size = np.zeros(self.capacity, dtype=np.float32)
+        self.size = np.zeros(self.capacity, dtype=np.float32)
+        self.color = np.zeros((self.capacity, 4), dtype=np.float32)
+        self.extra = {name: np.zeros(self.capacity, dtype=np.float32) for name in extra_fields}
+        self._arrays = [self.pos, self.vel, self.life, self.initial_life, self.base_size, self.size, self.color, *self.extra.values()]
+
+        self.size_start_factor = size_start_factor
+        self.size_end_factor = size_end_factor
+        self.set_color_stops(color_stops)
+
+    def set_color_stops(self, color_stops):
+        if not color_stops:
+            self._stop_ratios = None
+            return
+        stops = sorted(color_stops, key=lambda stop: stop[0])
+        self._stop_ratios = np.array([ratio for ratio, _ in stops], dtype=np.float32)
+        self._stop_colors = np.array([rgba for _, rgba in stops], dtype=np.float32) # (S, 4)
+
+    # ------------------------------------------------------------------
+    # 生成 / 清除
+    # ------------------------------------------------------------------
+    def emit(self, x, y, vx=0.0, vy=0.0, life_ms=500.0, initial_life_ms=None, base_size=1.0, color=(255, 255, 255, 255), **extra):
+        """加入一個粒子；容量已滿時回傳 False。"""
+        i = self.count
+        if i >= self.capacity:
+            return False
+        self.pos[i] = (x, y)
+        self.vel[i] = (vx, vy)
+        self.life[i] = life_ms
+        self.initial_life[i] = initial_life_ms if initial_life_ms else life_ms
+        self.base_size[i] = base_size
+        self.size[i] = base_size * self.size_start_factor
+        self.color[i] = color
+        for name, value in extra.items():
+            self.extra[name][i] = value
+        self.count = i + 1
+        return True
+
+    def clear(self):
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __bool__(self):
+        return self.count > 0
+
+    # ------------------------------------------------------------------
+    # 向量化更新
+    # ------------------------------------------------------------------
+    def update(self, dt_ms, velocity_scale=1.0):
+        if self.count == 0:
+            return
+        n = self.count
+        self.life[:n] -= dt_ms
+        self._cull()
+        n = self.count
+        if n == 0:
+            return
+
+        self.pos[:n] += self.vel[:n] * velocity_scale
+        life_ratio = np.clip(self.life[:n] / self.initial_life[:n], 0.0, 1.0)
+        if self._stop_ratios is not None:
+            for channel in range(4):
+                # 與舊版 int() 截斷一致
+                self.color[:n, channel] = np.floor(np.interp(life_ratio, self._stop_ratios, self._stop_colors[:, channel]))
+        size_factor = self.size_end_factor + (self.size_start_factor - self.size_end_factor) * life_ratio
+        self.size[:n] = np.maximum(1.0, np.floor(self.base_size[:n] * size_factor))
+
+    def _cull(self):
+        """剔除 life <= 0 的粒子：把尾端活著的粒子搬進前段的空位 (swap-remove)，不保留順序。"""
+        n = self.count
+        dead = np.flatnonzero(self.life[:n] <= 0)
+        if dead.size == 0:
+            return
+        new_count = n - dead.size
+        holes = dead[dead < new_count]
+        movers = np.flatnonzero(self.life[new_count:n] > 0) + new_count
+        for array in self._arrays:
+            array[holes] = array[movers]
+        self.count = new_count
+        if DEBUG_PARTICLES: print(f"[ParticleSystem._cull] Removed {dead.size} particles, {new_count} alive.")
+
+    # ------------------------------------------------------------------
+    # 唯讀 view (長度 = count)
+    # ------------------------------------------------------------------
+    @property
+    def active_pos(self):
+        return self.pos[:self.count]
+
+    @property
+    def active_color(self):
+        return self.color[:self.count]
+
+    @property
+    def active_size(self):
+        return self.size[:self.count]
+
+    def active_extra(self, name):
+        return self.extra[name][:self.count]
+
+
+def blit_square_particles(target_surface, system, area_rect, scale_factor, sprite_cache, flip_y=False, max_count=None):
+    """
+    把 system 中的粒子畫成置中的實心方塊 (邊長 = size * scale_factor)。
+    area_rect 是正規化座標 (0~1) 對應到 target_surface 上的區域；flip_y 用於上方玩家視角。
+    max_count 限制最多畫幾個 (品質等級較低時)，不影響模擬。
+    """
+    n = system.count if max_count is None else min(system.count, max(0, int(max_count)))
+    if n == 0:
+        return
+    pos = system.pos[:n]
+    y_norm = 1.0 - pos[:, 1] if flip_y else pos[:, 1]
+    sizes = np.maximum(1, (system.size[:n] * scale_factor).astype(np.int32))
+    xs = area_rect.left + (pos[:, 0] * area_rect.width).astype(np.int32) - sizes // 2
+    ys = area_rect.top + (y_norm * area_rect.height).astype(np.int32) - sizes // 2
+    colors = system.color[:n].astype(np.int32)
+
+    blit_sequence = []
+    for x, y, size, rgba in zip(xs.tolist(), ys.tolist(), sizes.tolist(), colors.tolist()):
+        if rgba[3] > 0:
+            blit_sequence.append((sprite_cache.rect(size, size, rgba), (x, y)))
+    target_surface.blits(blit_sequence, doreturn=False)
@@ -0,0 +1,133 @@
+# game/post_process.py
+"""
+不需要 GPU 的遊戲區疊色效果 (煉獄領域的濾鏡與邊緣暈影、SlowMo 衝擊波的半透明填色)。
+
+舊作法每幀配置一張遊戲區大小的 SRCALPHA Surface、填色後再 blit，1440p 下每幀就是好幾 MB 的暫存 Surface。
+這裡每個 (效果, 區域大小) 只保留一張疊色 Surface，顏色沒變就直接 blit，顏色變了才原地 fill (不重新配置)：
+    濾鏡   : 整張疊色 Surface blit 到遊戲區
+    暈影   : 同一張疊色 Surface，以 area= 只 blit 四條邊框 (邊框矩形依 (區域大小, 厚度) 快取)
+    半透明圓: 共用暫存畫布，只清除 / 重畫圓與遊戲區相交的部分
+(實測 pygame 的 BLEND_RGB_MULT / BLEND_RGB_ADD fill 沒有 SIMD 加速，比 alpha blit 慢很多，所以不用它們。)
+
+get_cost_breakdown() 回傳每個效果的呼叫次數與耗時，方便找出哪個效果最貴。
+"""
+import time
+import pygame
+
+DEBUG_POST_PROCESS = False
+
+
+class PostProcessPipeline:
+    def __init__(self):
+        self._vignette_band_cache = {} # (w, h, thickness) -> [相對於區域左上角的 Rect, ...]
+        self._overlays = {}            # (effect name, (w, h)) -> [SRCALPHA Surface, 目前填的 rgba]
+        self._scratch_surfaces = {}    # (w, h) -> SRCALPHA Surface (半透明圓的暫存畫布)
+        self._costs = {}               # effect name -> [calls, total_ms]
+
+    # ------------------------------------------------------------------
+    # 效果
+    # ------------------------------------------------------------------
+    def apply_color_filter(self, target_surface, area_rect, rgba, effect_name="color_filter"):
+        """在 area_rect 範圍內疊上一層半透明顏色 (等同 blit 一張填滿 rgba 的 SRCALPHA Surface)。"""
+        alpha = int(rgba[3]) if len(rgba) > 3 else 255
+        if alpha <= 0:
+            return
+        t0 = time.perf_counter()
+        target_surface.blit(self._get_overlay(effect_name, area_rect.size, rgba), area_rect.topleft)
+        self._record(effect_name, t0)
+
+    def apply_vignette(self, target_surface, area_rect, rgba, thickness_px, effect_name="vignette"):
+        """在 area_rect 四周畫出厚度 thickness_px 的半透明邊框 (上下整條，左右扣掉角落避免重疊)。"""
+        alpha = int(rgba[3]) if len(rgba) > 3 else 255
+        if alpha <= 0 or thickness_px <= 0:
+            return
+        t0 = time.perf_counter()
+        overlay = self._get_overlay(effect_name, area_rect.size, rgba)
+        for band in self._get_vignette_bands(area_rect.width, area_rect.height, thickness_px):
+            target_surface.blit(overlay, (area_rect.left + band.left, area_rect.top + band.top), area=band)
+        self._record(effect_name, t0)
+
+    def apply_translucent_circle(self, target_surface, area_rect, center, radius_px, rgba, effect_name="circle"):
+        """在 target 上畫半透明實心圓 (裁切到 area_rect 內)。center 是 target 上的座標。"""
+        if radius_px <= 0 or (len(rgba) > 3 and rgba[3] <= 0):
+            return
+        t0 = time.perf_counter()
+        circle_rect = pygame.Rect(center[0] - radius_px, center[1] - radius_px, radius_px * 2, radius_px * 2)
+        clip_rect = circle_rect.clip(area_rect)
+        if clip_rect.width > 0 and clip_rect.height > 0:
+            scratch = self._get_scratch_surface(area_rect.size)
+            local_clip = clip_rect.move(-area_rect.left, -area_rect.top)
+            scratch.fill((0, 0, 0, 0), local_clip)
+            scratch.set_clip(local_clip)
+            pygame.draw.circle(scratch, rgba, (center[0] - area_rect.left, center[1] - area_rect.top), radius_px)
+            scratch.set_clip(None)
+            target_surface.blit(scratch, clip_rect.topleft, area=local_clip)
+        self._record(effect_name, t0)
+
+    def _get_scratch_surface(self, size):
+        scratch = self._scratch_surfaces.get(size)
+        if scratch is None:
+            if len(self._scratch_surfaces) >= 4: # 視窗大小改變過，舊尺寸的不會再用到
+                self._scratch_surfaces.clear()
+            scratch = pygame.Surface(size, pygame.SRCALPHA)
+            self._scratch_surfaces[size] = scratch
+            if DEBUG_POST_PROCESS: print(f"[PostProcessPipeline] Allocated scratch surface {size}")
+        return scratch
+
+    def _get_vignette_bands(self, width, height, thickness_px):
+        key = (width, height, thickness_px)
+        bands = self._vignette_band_cache.get(key)
+        if bands is None:
+            bands = [
+                pygame.Rect(0, 0, width, thickness_px),                                            # 上
+                pygame.Rect(0, height - thickness_px, width, thickness_px),                        # 下
+                pygame.Rect(0, thickness_px, thickness_px, height - 2 * thickness_px),             # 左
+                pygame.Rect(width - thickness_px, thickness_px, thickness_px, height - 2 * thickness_px), # 右
+            ]
+            bands = [band for band in bands if band.width > 0 and band.height > 0]
+            if len(self._vignette_band_cache) > 256: # 厚度動畫只會用到有限幾種值，超過就整個重來
+                self._vignette_band_cache.clear()
+            self._vignette_band_cache[key] = bands
+        return bands
+
+    def _get_overlay(self, effect_name, size, rgba):
+        rgba = tuple(int(c) for c in rgba)
+        key = (effect_name, tuple(size))
+        entry = self._overlays.get(key)
+        if entry is None:
+            if len(self._overlays) > 16: # 視窗大小改變過，舊尺寸的不會再用到
+                self._overlays.clear()
+            entry = [pygame.Surface(size, pygame.SRCALPHA), None]
+            self._overlays[key] = entry
+            if DEBUG_POST_PROCESS: print(f"[PostProcessPipeline] Allocated overlay for '{effect_name}' {size}")
+        if entry[1] != rgba:
+            entry[0].fill(rgba)
+            entry[1] = rgba
+        return entry[0]
+
+    # ------------------------------------------------------------------
+    # 成本統計
+    # ------------------------------------------------------------------
+    def _record(self, effect_name, t0):
+        cost = self._costs.get(effect_name)
+        elapsed_ms = (time.perf_counter() - t0) * 1000.0
+        if cost is None:
+            self._costs[effect_name] = [1, elapsed_ms]
+        else:
+            cost[0] += 1
+            cost[1] += elapsed_ms
+
+    def get_cost_breakdown(self):
+        """{effect_name: {"calls": n, "total_ms": t, "mean_ms": t / n}}"""
+        return {name: {"calls": calls, "total_ms": total_ms, "mean_ms": total_ms / calls if calls else 0.0}
+                for name, (calls, total_ms) in self._costs.items()}
+
+    def format_cost_breakdown(self):
+        breakdown = self.get_cost_breakdown()
+        if not breakdown:
+            return "no post-process effects applied"
+        return ", ".join(f"{name}: {c['mean_ms']:.3f}ms x{c['calls']}" for name, c in
+                         sorted(breakdown.items(), key=lambda item: -item[1]["total_ms"]))
+
+    def reset_costs(self):
+        self._costs.clear()
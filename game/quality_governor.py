@@ -0,0 +1,108 @@
+# game/quality_governor.py
+"""
+依實際量到的每幀工作時間 (FramePresenter 的 begin_frame → present) 自動調整畫面品質。
+
+每 evaluate_every_frames 幀看一次最近一個視窗的第 percentile 百分位數：
+    超過單幀預算 * DOWNGRADE_RATIO              → 降一級 (立即)
+    連續 upgrade_after_evaluations 次低於預算 * UPGRADE_RATIO → 升一級
+兩個門檻中間留了一段空白，加上升級需要連續多次、每次換級後清空樣本重新量測 (hysteresis)，避免在兩級之間來回跳。
+
+settings 的 renderer.quality.tier 可以固定某一級 ("high" / "medium" / "low" / "minimal")，"auto" 才會自動調整。
+"""
+from collections import deque
+
+DEBUG_QUALITY_GOVERNOR = False
+
+# 由高到低。trail_fraction / particle_fraction 只影響「畫出來的」數量，不影響遊戲邏輯。
+# smooth_scaling 只用在 render_scale < 1 時把內部 Surface 放大回視窗 (GameplayState._present_internal_surface)；
+# 球 / 蟲的縮放與旋轉已經快取 (每個尺寸只做一次)，不隨等級改變。
+QUALITY_TIERS = [
+    {"name": "high",    "glow_layers": 5, "trail_fraction": 1.0,  "particle_fraction": 1.0,  "smooth_scaling": True,  "render_scale": 1.0},
+    {"name": "medium",  "glow_layers": 3, "trail_fraction": 0.75, "particle_fraction": 0.75, "smooth_scaling": True,  "render_scale": 1.0},
+    {"name": "low",     "glow_layers": 2, "trail_fraction": 0.5,  "particle_fraction": 0.5,  "smooth_scaling": True,  "render_scale": 1.0},
+    {"name": "minimal", "glow_layers": 1, "trail_fraction": 0.35, "particle_fraction": 0.35, "smooth_scaling": False, "render_scale": 0.75},
+]
+
+DOWNGRADE_RATIO = 0.9  # p 百分位工作時間 > 預算的 90% → 降級 (留一點餘裕給 flip / 系統)
+UPGRADE_RATIO = 0.5    # p 百分位工作時間 < 預算的 50% → 升級候選
+FALLBACK_BUDGET_MS = 1000.0 / 60 # 不限幀率 (target_fps <= 0) 時以 60 FPS 為目標
+
+
+def tier_index_by_name(name):
+    for i, tier in enumerate(QUALITY_TIERS):
+        if tier["name"] == name:
+            return i
+    return None
+
+
+class QualityGovernor:
+    def __init__(self, tier_setting="auto", percentile=95, evaluate_every_frames=60, upgrade_after_evaluations=3):
+        self.percentile = max(1.0, min(100.0, float(percentile)))
+        self.evaluate_every_frames = max(1, int(evaluate_every_frames))
+        self.upgrade_after_evaluations = max(1, int(upgrade_after_evaluations))
+        self._samples = deque(maxlen=self.evaluate_every_frames)
+        self._frames_since_evaluation = 0
+        self._good_evaluations = 0
+        self.tier_changes = [] # [(from_name, to_name, pNN_ms, budget_ms), ...]
+
+        fixed_index = None
+        if isinstance(tier_setting, int) and 0 <= tier_setting < len(QUALITY_TIERS):
+            fixed_index = tier_setting
+        elif isinstance(tier_setting, str) and tier_setting.lower() != "auto":
+            fixed_index = tier_index_by_name(tier_setting.lower())
+            if fixed_index is None:
+                print(f"[QualityGovernor] Warning: unknown quality tier '{tier_setting}'. Using 'auto'.")
+        self.auto = fixed_index is None
+        self.tier_index = fixed_index if fixed_index is not None else 0
+
+    @classmethod
+    def from_settings(cls):
+        from game.settings import GameSettings
+        try:
+            return cls(GameSettings.QUALITY_TIER, GameSettings.QUALITY_PERCENTILE,
+                       GameSettings.QUALITY_EVALUATE_EVERY_FRAMES, GameSettings.QUALITY_UPGRADE_AFTER_EVALUATIONS)
+        except Exception as e:
+            print(f"[QualityGovernor] Warning: could not read quality settings ({e}). Using defaults.")
+            return cls()
+
+    @property
+    def tier(self):
+        return QUALITY_TIERS[self.tier_index]
+
+    def record_frame(self, work_ms, budget_ms=None):
+        """每幀呼叫一次 (work_ms 為 None 時略過，例如剛經過阻塞畫面)；回傳這一幀是否換了品質等級。"""
+        if not self.auto or work_ms is None:
+            return False
+        self._samples.append(work_ms)
+        self._frames_since_evaluation += 1
+        if self._frames_since_evaluation < self.evaluate_every_frames:
+            return False
+        self._frames_since_evaluation = 0
+        return self._evaluate(budget_ms if budget_ms else FALLBACK_BUDGET_MS)
+
+    def _evaluate(self, budget_ms):
+        ordered = sorted(self._samples)
+        p_value = ordered[min(len(ordered) - 1, int(round(self.percentile / 100.0 * (len(ordered) - 1))))]
+        if p_value > budget_ms * DOWNGRADE_RATIO and self.tier_index < len(QUALITY_TIERS) - 1:
+            self._change_tier(self.tier_index + 1, p_value, budget_ms)
+            return True
+        if p_value < budget_ms * UPGRADE_RATIO and self.tier_index > 0:
+            self._good_evaluations += 1
+            if self._good_evaluations >= self.upgrade_after_evaluations:
+                self._change_tier(self.tier_index - 1, p_value, budget_ms)
+                return True
+        else:
+            self._good_evaluations = 0
+        if DEBUG_QUALITY_GOVERNOR:
+            print(f"[QualityGovernor] p{self.percentile:g} work {p_value:.2f}ms / budget {budget_ms:.2f}ms, tier '{self.tier['name']}'")
+        return False
+
+    def _change_tier(self, new_index, p_value, budget_ms):
+        old_name = self.tier["name"]
+        self.tier_index = new_index
+        self.tier_changes.append((old_name, self.tier["name"], p_value, budget_ms))
+        # 換級後的樣本重新量測 (舊樣本是在別的品質下量到的)
+        self._samples.clear()
+        self._good_evaluations = 0
+        print(f"[QualityGovernor] Quality tier '{old_name}' -> '{self.tier['name']}' "
+              f"(p{self.percentile:g} work {p_value:.2f}ms, budget {budget_ms:.2f}ms)")
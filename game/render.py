@@ -3,8 +3,10 @@ import math
 import pygame
 from game.theme import Style
 from game.settings import GameSettings # 確保 GameSettings 已導入
-from utils import resource_path
-from game.skills.skill_config import SKILL_CONFIGS # 用於技能條顏色等
+from game.asset_manager import asset_manager
+from game.particles import blit_square_particles
+from game.post_process import PostProcessPipeline
+from game.sprite_cache import SPRITE_CACHE, BallRotationCache # ⭐️ 光暈 / 拖尾 / 粒子的預先光柵化 sprite、球體旋轉快取
 import random
 
 DEBUG_RENDERER = False # 您可以將這些除錯旗標設為 True 來輔助排錯
@@ -20,7 +22,8 @@ class Renderer:
                     logical_paddle_height_px,
                     actual_screen_surface,
                     actual_screen_width,
-                    actual_screen_height):
+                    actual_screen_height,
+                    config_snapshot=None):
             if DEBUG_RENDERER: print(f"[Renderer.__init__] Initializing Renderer for game_mode: {game_mode}")
             if DEBUG_RENDERER_FULLSCREEN:
                 print(f"[DEBUG_RENDERER_FULLSCREEN][Renderer.__init__] Received actual_screen_surface: {type(actual_screen_surface)}")
@@ -28,6 +31,7 @@ class Renderer:
                     print(f"    Surface size: {actual_screen_surface.get_size()}, Expected: {actual_screen_width}x{actual_screen_height}")
 
             self.game_mode = game_mode
+            self.config = config_snapshot if config_snapshot is not None else GameSettings.get_config_snapshot() # 技能條顏色、球體圖像路徑等
             self.logical_game_area_size = logical_game_area_size
             self.logical_ball_radius_px = logical_ball_radius_px # 儲存球的邏輯半徑
             self.logical_paddle_height_px = logical_paddle_height_px
@@ -132,12 +136,15 @@ class Renderer:
                 )
                 self.offset_y = scaled_pva_ui_bar_height # PvA specific offset
 
-            self.clock = pygame.time.Clock()
+            # ⭐️ Renderer 不再持有 Clock / 不 flip，畫面輸出由 FramePresenter 負責
 
             # 初始化球體圖像資源 (只執行一次)
             if not Renderer._original_ball_visuals: # Check if empty
                 try:
-                    Renderer._original_ball_visuals["default"] = pygame.image.load(resource_path("assets/sunglasses.png")).convert_alpha()
+                    default_img = asset_manager.get_image("assets/sunglasses.png")
+                    if default_img is None:
+                        raise FileNotFoundError("assets/sunglasses.png")
+                    Renderer._original_ball_visuals["default"] = default_img
                     if DEBUG_RENDERER: print(f"[Renderer.__init__] Loaded 'default' ball image.")
                 except Exception as e_default:
                     if DEBUG_RENDERER: print(f"[Renderer.__init__] Error loading 'default' ball image: {e_default}. Creating fallback.")
@@ -146,9 +153,12 @@ class Renderer:
                     Renderer._original_ball_visuals["default"] = fb_surf_def
 
                 try:
-                    bug_cfg = SKILL_CONFIGS.get("soul_eater_bug", {})
+                    bug_cfg = self.config.skill_params("soul_eater_bug")
                     bug_img_path = bug_cfg.get("bug_image_path", "assets/soul_eater_bug.png")
-                    Renderer._original_ball_visuals["soul_eater_bug"] = pygame.image.load(resource_path(bug_img_path)).convert_alpha()
+                    bug_img = asset_manager.get_image(bug_img_path)
+                    if bug_img is None:
+                        raise FileNotFoundError(bug_img_path)
+                    Renderer._original_ball_visuals["soul_eater_bug"] = bug_img
                     if DEBUG_RENDERER: print(f"[Renderer.__init__] Loaded 'soul_eater_bug' ball image from {bug_img_path}.")
                 except Exception as e_bug:
                     if DEBUG_RENDERER: print(f"[Renderer.__init__] Error loading 'soul_eater_bug' image: {e_bug}. Creating fallback.")
@@ -164,6 +174,12 @@ class Renderer:
                 print(f"[DEBUG_RENDERER_FULLSCREEN][Renderer.__init__] Expected scaled ball diameter: {self.scaled_ball_diameter_px}px")
 
             self.ball_angle = 0 # 累積的視覺渲染角度 (在 render 方法中更新)
+            # ⭐️ 球體 smoothscale 只做一次，旋轉畫面依角度解析度快取 (每個 Renderer 一份，解析度改變會建立新的 Renderer)
+            try:
+                self.ball_rotation_cache = BallRotationCache(GameSettings.BALL_ROTATION_STEP_DEG, GameSettings.BALL_ROTATION_CACHE_MB)
+            except Exception as e:
+                print(f"[Renderer.__init__] Warning: could not read ball rotation settings ({e}). Using defaults.")
+                self.ball_rotation_cache = BallRotationCache()
             try:
                 self.visual_spin_multiplier = GameSettings.VISUAL_SPIN_MULTIPLIER
                 if DEBUG_RENDERER: print(f"[Renderer.__init__] Visual Spin Multiplier loaded from GameSettings: {self.visual_spin_multiplier}")
@@ -225,6 +241,38 @@ class Renderer:
             # 為了保持與您先前程式碼的兼容性，我暫時保留它們。
             self.skill_glow_position = 0; self.skill_glow_trail = []; self.max_skill_glow_trail_length = 15
 
+            # 濾鏡 / 暈影等疊色效果 (get_cost_breakdown() 可看各效果耗時)
+            self.post_process = PostProcessPipeline()
+
+            # 畫面品質等級 (QualityGovernor 調整；預設為最高品質)
+            self.quality_tier_name = "high"
+            self.trail_fraction = 1.0
+            self.particle_fraction = 1.0
+
+            # --- 分層 / 髒矩形渲染 ---
+            # 靜態層 (背景、UI 底色、牆壁、PvP 分隔線) 畫在離屏 Surface 上，只在輸入改變時重建；
+            # 每幀只把上一幀與這一幀動態物件 (球拍、球、拖尾) 所在的矩形從靜態層還原後重畫，
+            # 並以 last_dirty_rects 交給 FramePresenter 做 pygame.display.update(rects)。
+            # 技能特效 (煉獄濾鏡、時緩等) 啟用時整個遊戲區重畫；凍結閃爍、中央技能名、外部畫面覆蓋則整個畫面重畫。
+            try:
+                self.dirty_rect_rendering = bool(GameSettings.DIRTY_RECT_RENDERING)
+            except Exception as e:
+                print(f"[Renderer.__init__] Warning: could not read DIRTY_RECT_RENDERING ({e}). Defaulting to True.")
+                self.dirty_rect_rendering = True
+            self._static_layer = None
+            self._static_layer_key = None
+            self._needs_full_redraw = True
+            self._prev_dynamic_rects = []
+            self._ui_signature = None
+            self.last_dirty_rects = None # None 代表這一幀整個畫面都需要 flip
+
+            # PvP 整張重畫時，世界只畫一次再翻轉成第二個視角 (見 _render_pvp_shared_pass)
+            try:
+                self.pvp_shared_render_pass = bool(GameSettings.PVP_SHARED_RENDER_PASS)
+            except Exception as e:
+                print(f"[Renderer.__init__] Warning: could not read PVP_SHARED_RENDER_PASS ({e}). Defaulting to False.")
+                self.pvp_shared_render_pass = False
+
             if DEBUG_RENDERER: print("[Renderer.__init__] Renderer initialization complete with scaling parameters.")
 
 
@@ -239,7 +287,7 @@ class Renderer:
         left_wall_x = game_area_on_surface_rect.left + scaled_thickness // 2
         right_wall_x = game_area_on_surface_rect.right - scaled_thickness // 2
         wall_top_y = game_area_on_surface_rect.top
-        wall_bottom_y = game_area_on_surface_rect.bottom
+        wall_bottom_y = game_area_on_surface_rect.bottom - 1 # draw.line 含終點，不要畫進下方 UI 區 (分層渲染的靜態層才對得上)
 
         pygame.draw.line(target_surface, color, (left_wall_x, wall_top_y), (left_wall_x, wall_bottom_y), scaled_thickness)
         pygame.draw.line(target_surface, color, (right_wall_x, wall_top_y), (right_wall_x, wall_bottom_y), scaled_thickness)
@@ -289,12 +337,10 @@ class Renderer:
                 fill_color = wave_param["fill_color_rgba"]
                 border_color = wave_param["border_color_rgba"]
                 if fill_color[3] > 0: # Alpha > 0
-                    temp_circle_surf_size = current_radius_scaled_px * 2
-                    if temp_circle_surf_size > 0:
-                        temp_circle_surf = pygame.Surface((temp_circle_surf_size, temp_circle_surf_size), pygame.SRCALPHA)
-                        pygame.draw.circle(temp_circle_surf, fill_color,
-                                        (current_radius_scaled_px, current_radius_scaled_px), current_radius_scaled_px)
-                        target_surface.blit(temp_circle_surf, (cx_on_surface_px - current_radius_scaled_px, cy_on_surface_px - current_radius_scaled_px))
+                    # ⭐️ 只在與遊戲區相交的範圍內光柵化 (共用暫存畫布)，不再每幀配置半徑大小的 SRCALPHA Surface
+                    self.post_process.apply_translucent_circle(target_surface, game_render_area_on_target,
+                                                               (cx_on_surface_px, cy_on_surface_px), current_radius_scaled_px,
+                                                               fill_color, effect_name="slowmo_shockwave_fill")
                 if border_color[3] > 0 and scaled_wave_border_width > 0:
                     pygame.draw.circle(target_surface, border_color,
                                     (cx_on_surface_px, cy_on_surface_px), current_radius_scaled_px, width=scaled_wave_border_width)
@@ -317,8 +363,7 @@ class Renderer:
                 rect_center_x_on_surface_px = ga_left + trail_center_x_in_area_scaled
                 rect_left_on_surface_px = rect_center_x_on_surface_px - owner_paddle_width_scaled // 2
 
-                trail_surf = pygame.Surface((owner_paddle_width_scaled, owner_paddle_height_scaled), pygame.SRCALPHA)
-                trail_surf.fill(trail_color_rgba)
+                trail_surf = SPRITE_CACHE.rect(owner_paddle_width_scaled, owner_paddle_height_scaled, trail_color_rgba)
                 target_surface.blit(trail_surf, (rect_left_on_surface_px, rect_y_on_surface_px))
 
         # 3. 時鐘 UI 繪製 (在 game_render_area_on_target 中心)
@@ -358,7 +403,8 @@ class Renderer:
                                 trail_data,
                                 paddle_height_norm,
                                 game_render_area_on_target, # 這個是此視角在目標 surface 上的遊戲區域 Rect
-                                is_top_player_perspective=False):
+                                is_top_player_perspective=False,
+                                draw_ball_image=True): # PvP 共用渲染時球體圖像改由每個視角各自疊加
 
             s = self.game_content_scale_factor
             ga_left = game_render_area_on_target.left
@@ -434,9 +480,9 @@ class Renderer:
             if domain_filter_color_to_apply:
                 if isinstance(domain_filter_color_to_apply, (list, tuple)) and len(domain_filter_color_to_apply) == 4:
                     if domain_filter_color_to_apply[3] > 0: # 僅當 Alpha 大於 0 時繪製
-                        filter_surface = pygame.Surface((ga_width_scaled, ga_height_scaled), pygame.SRCALPHA)
-                        filter_surface.fill(domain_filter_color_to_apply)
-                        target_surface_for_view.blit(filter_surface, (ga_left, ga_top))
+                        # ⭐️ 疊色 Surface 依區域大小快取，顏色沒變時不重新填色，不再每幀配置遊戲區大小的 SRCALPHA Surface
+                        self.post_process.apply_color_filter(target_surface_for_view, game_render_area_on_target,
+                                                             domain_filter_color_to_apply, effect_name="purgatory_filter")
                         # if DEBUG_RENDERER: print(f"Applied Purgatory Domain filter: {domain_filter_color_to_apply} (Anim playing: {is_purgatory_anim_playing})")
 
             # --- 繪製煉獄領域入場動畫 - 邊緣暈影效果 ---
@@ -453,21 +499,9 @@ class Renderer:
                     v_thickness_px = int(short_side * v_thickness_factor)
 
                     if v_thickness_px > 0 and len(v_color) == 4 and v_color[3] > 0: # 有厚度且透明度大於0
-                        # 創建一個獨立的 Surface 來繪製暈影，然後 blit 到主目標上
-                        # 這樣可以確保暈影的透明度正確應用
-                        vignette_layer_surf = pygame.Surface((ga_width_scaled, ga_height_scaled), pygame.SRCALPHA)
-                        vignette_layer_surf.fill((0,0,0,0)) # 先填充完全透明
-
-                        # 上邊緣
-                        pygame.draw.rect(vignette_layer_surf, v_color, (0, 0, ga_width_scaled, v_thickness_px))
-                        # 下邊緣
-                        pygame.draw.rect(vignette_layer_surf, v_color, (0, ga_height_scaled - v_thickness_px, ga_width_scaled, v_thickness_px))
-                        # 左邊緣 (注意Y座標和高度，避免與上下邊緣重疊繪製區域的角部)
-                        pygame.draw.rect(vignette_layer_surf, v_color, (0, v_thickness_px, v_thickness_px, ga_height_scaled - 2 * v_thickness_px))
-                        # 右邊緣
-                        pygame.draw.rect(vignette_layer_surf, v_color, (ga_width_scaled - v_thickness_px, v_thickness_px, v_thickness_px, ga_height_scaled - 2 * v_thickness_px))
-                        
-                        target_surface_for_view.blit(vignette_layer_surf, (ga_left, ga_top))
+                        # 上下左右四條邊框 (左右扣掉角落，避免與上下重疊)，邊框矩形依 (區域大小, 厚度) 快取
+                        self.post_process.apply_vignette(target_surface_for_view, game_render_area_on_target,
+                                                         v_color, v_thickness_px, effect_name="purgatory_vignette")
                         # if DEBUG_RENDERER: print(f"Applied Purgatory Vignette: Color {v_color}, ThicknessPx {v_thickness_px}")
 
             # --- 其他技能的非全局濾鏡類視覺效果渲染 (例如 SlowMo 的時鐘等) ---
@@ -505,17 +539,16 @@ class Renderer:
             if trail_data:
                 # ... (拖尾繪製邏輯與您上一版本相同, 此處省略) ...
                 scaled_trail_radius = max(1, int(self.logical_ball_radius_px * 0.4 * s))
+                base_ball_color_rgb = Style.BALL_COLOR[:3] if isinstance(Style.BALL_COLOR, tuple) and len(Style.BALL_COLOR) >=3 else (255,255,255)
+                trail_blits = []
                 for i, (tx_norm, ty_norm_raw) in enumerate(trail_data):
                     trail_ty_norm_for_view = 1.0 - ty_norm_raw if is_top_player_perspective else ty_norm_raw
                     fade = int(200 * (i + 1) / len(trail_data))
-                    base_ball_color_rgb = Style.BALL_COLOR[:3] if isinstance(Style.BALL_COLOR, tuple) and len(Style.BALL_COLOR) >=3 else (255,255,255)
-                    trail_color_with_alpha = (*base_ball_color_rgb, fade)
-                    if scaled_trail_radius > 0 :
-                        temp_surf = pygame.Surface((scaled_trail_radius * 2, scaled_trail_radius * 2), pygame.SRCALPHA)
-                        pygame.draw.circle(temp_surf, trail_color_with_alpha, (scaled_trail_radius, scaled_trail_radius), scaled_trail_radius)
-                        trail_x_scaled = ga_left + int(tx_norm * ga_width_scaled)
-                        trail_y_scaled = ga_top + int(trail_ty_norm_for_view * ga_height_scaled)
-                        target_surface_for_view.blit(temp_surf, (trail_x_scaled - scaled_trail_radius, trail_y_scaled - scaled_trail_radius))
+                    trail_x_scaled = ga_left + int(tx_norm * ga_width_scaled)
+                    trail_y_scaled = ga_top + int(trail_ty_norm_for_view * ga_height_scaled)
+                    trail_blits.append((SPRITE_CACHE.circle(scaled_trail_radius, (*base_ball_color_rgb, fade)),
+                                        (trail_x_scaled - scaled_trail_radius, trail_y_scaled - scaled_trail_radius)))
+                target_surface_for_view.blits(trail_blits, doreturn=False)
             
             try: # 球體相關繪製
                 ball_norm_x = ball_data["x_norm"]
@@ -537,9 +570,7 @@ class Renderer:
                     aura_radius_factor = 1.3 
                     aura_radius_px = int(self.scaled_ball_diameter_px / 2 * aura_radius_factor)
                     if aura_radius_px > 0:
-                        aura_surface_size = max(1, aura_radius_px * 2)
-                        aura_surface = pygame.Surface((aura_surface_size, aura_surface_size), pygame.SRCALPHA)
-                        pygame.draw.circle(aura_surface, ball_aura_color, (aura_radius_px, aura_radius_px), aura_radius_px)
+                        aura_surface = SPRITE_CACHE.circle(aura_radius_px, ball_aura_color)
                         aura_rect = aura_surface.get_rect(center=(ball_center_x_scaled, ball_center_y_scaled))
                         target_surface_for_view.blit(aura_surface, aura_rect)
                 
@@ -568,43 +599,25 @@ class Renderer:
                                 layer_alpha = int(current_inner_alpha * (1.0 - (1.0 - current_outer_alpha_factor) * layer_ratio))
                                 layer_alpha = max(0, min(255, layer_alpha))
                                 if layer_alpha > 5 and layer_radius_px > scaled_ball_radius_px:
-                                    glow_layer_surface_size = max(1, layer_radius_px * 2)
-                                    glow_layer_surface = pygame.Surface((glow_layer_surface_size, glow_layer_surface_size), pygame.SRCALPHA)
-                                    pygame.draw.circle(glow_layer_surface, (*base_glow_rgb, layer_alpha),
-                                                       (layer_radius_px, layer_radius_px), layer_radius_px)
+                                    glow_layer_surface = SPRITE_CACHE.circle(layer_radius_px, (*base_glow_rgb, layer_alpha))
                                     glow_layer_rect = glow_layer_surface.get_rect(center=(ball_center_x_scaled, ball_center_y_scaled))
                                     target_surface_for_view.blit(glow_layer_surface, glow_layer_rect)
                 
                 # --- 繪製球體本身 (圖像) ---
-                original_ball_surf = Renderer._original_ball_visuals.get(ball_image_key, Renderer._original_ball_visuals["default"])
-                # ... (球體圖像繪製邏輯與您上一版本相同, 此處省略) ...
-                current_ball_render_image_scaled = pygame.transform.smoothscale(original_ball_surf, (self.scaled_ball_diameter_px, self.scaled_ball_diameter_px))
-                rotated_ball = pygame.transform.rotate(current_ball_render_image_scaled, self.ball_angle)
-                ball_rect = rotated_ball.get_rect(center=(ball_center_x_scaled, ball_center_y_scaled))
-                target_surface_for_view.blit(rotated_ball, ball_rect)
+                if draw_ball_image:
+                    self._draw_ball_image(target_surface_for_view, ball_image_key, ball_center_x_scaled, ball_center_y_scaled)
 
                 # --- 像素火焰粒子效果繪製 ---
                 pixel_flames_data_to_render = None
                 if purgatory_visual_params_to_use and purgatory_visual_params_to_use.get("pixel_flames_enabled", False):
                      pixel_flames_data_to_render = purgatory_visual_params_to_use.get("pixel_flames_data")
 
-                if pixel_flames_data_to_render:
-                    flame_particles = pixel_flames_data_to_render.get("particles", [])
-                    # flame_config = pixel_flames_data_to_render.get("config", {}) # 如果渲染時需要配置信息
-                    for particle in flame_particles:
-                        # ... (像素火焰粒子繪製邏輯與您上一版本相同, 此處省略) ...
-                        particle_x_norm = particle.get('x_norm', 0.5)
-                        particle_y_norm_raw = particle.get('y_norm', 0.5)
-                        particle_y_norm_for_view = 1.0 - particle_y_norm_raw if is_top_player_perspective else particle_y_norm_raw
-                        particle_center_x_scaled = ga_left + int(particle_x_norm * ga_width_scaled)
-                        particle_center_y_scaled = ga_top + int(particle_y_norm_for_view * ga_height_scaled)
-                        particle_color_rgba = particle.get('current_color_rgba', (255,0,0,255))
-                        particle_logical_size_px = particle.get('current_size_px', 3)
-                        particle_render_size_px = max(1, int(particle_logical_size_px * s))
-                        if particle_color_rgba[3] > 0 and particle_render_size_px > 0:
-                            particle_surf = pygame.Surface((particle_render_size_px, particle_render_size_px), pygame.SRCALPHA)
-                            particle_surf.fill(particle_color_rgba)
-                            target_surface_for_view.blit(particle_surf, (particle_center_x_scaled - particle_render_size_px // 2, particle_center_y_scaled - particle_render_size_px // 2))
+                if pixel_flames_data_to_render and pixel_flames_data_to_render.get("particle_system") is not None:
+                    # ⭐️ 直接從粒子系統的 NumPy 陣列計算螢幕座標並批次 blit
+                    flame_system = pixel_flames_data_to_render["particle_system"]
+                    blit_square_particles(target_surface_for_view, flame_system, game_render_area_on_target, s, SPRITE_CACHE,
+                                          flip_y=is_top_player_perspective,
+                                          max_count=None if self.particle_fraction >= 1.0 else max(1, int(flame_system.capacity * self.particle_fraction)))
             
             except Exception as e:
                 player_id_for_debug = view_player_data.get("identifier", "UnknownPlayer")
@@ -612,30 +625,241 @@ class Renderer:
                 import traceback; traceback.print_exc()
 
 
+    def apply_quality_tier(self, tier):
+        """套用 QualityGovernor 的品質等級 (光芒層數、拖尾 / 粒子的繪製比例)。"""
+        if tier["name"] == self.quality_tier_name:
+            return
+        self.quality_tier_name = tier["name"]
+        self.glow_layers = tier["glow_layers"]
+        self.trail_fraction = tier["trail_fraction"]
+        self.particle_fraction = tier["particle_fraction"]
+        self.invalidate()
+        if DEBUG_RENDERER: print(f"[Renderer.apply_quality_tier] Quality tier '{self.quality_tier_name}': {tier}")
+
+    def invalidate(self):
+        """外部直接在 window 上畫了東西 (例如倒數、結果橫幅) 之後呼叫，下一幀會整個重畫。"""
+        self._needs_full_redraw = True
+
     def render(self, render_data):
         if not self.window: return
+        SPRITE_CACHE.ensure_scale(self.game_content_scale_factor, self.window.get_size()) # 解析度改變時 sprite 全部作廢
+
+        ball_physics_spin = render_data["ball"].get("spin", 0)
+        # 每幀只更新一次 self.ball_angle (累積的視覺旋轉角度)
+        self.ball_angle = (self.ball_angle + ball_physics_spin * self.visual_spin_multiplier) % 360
+
+        if self.trail_fraction < 1.0 and render_data.get("trail"):
+            # 較低品質只畫最新的一段拖尾 (髒矩形計算用的也是同一段)
+            trail = render_data["trail"]
+            render_data["trail"] = trail[len(trail) - max(1, int(len(trail) * self.trail_fraction)):]
 
-        current_bg_color = Style.BACKGROUND_COLOR
         freeze_active = render_data.get("freeze_active", False)
+        banner_visible = self._is_central_skill_banner_visible(render_data)
+        # 技能特效 (濾鏡、暗角、時鐘、衝擊波) 會畫到遊戲區以外，靜態層無法只還原局部
+        effects_active = self._has_active_skill_effects(render_data)
+        if not self.dirty_rect_rendering or freeze_active or banner_visible or effects_active or self._needs_full_redraw:
+            self._render_full_frame(render_data, freeze_active)
+            # 閃爍 / 大字 / 特效結束後再完整重畫一幀，把殘影清掉
+            self._needs_full_redraw = freeze_active or banner_visible or effects_active
+            self.last_dirty_rects = None
+        else:
+            self._render_dirty_frame(render_data)
+        self._prev_dynamic_rects = self._collect_dynamic_rects(render_data)
+        # ⭐️ 這裡只負責畫到 self.window；flip / update 與幀率節拍由 GameApp 的 FramePresenter 統一處理
+
+    def _render_full_frame(self, render_data, freeze_active):
+        current_bg_color = Style.BACKGROUND_COLOR
         if freeze_active:
             current_time_ticks = pygame.time.get_ticks()
             current_bg_color = (200,200,200) if (current_time_ticks // 150) % 2 == 0 else (50,50,50)
         self.window.fill(current_bg_color)
 
+        if self.game_mode != GameSettings.GameMode.PLAYER_VS_PLAYER:
+            ui_overlay_color = self._get_ui_overlay_color()
+            pygame.draw.rect(self.window, ui_overlay_color, self.pva_top_ui_rect_on_screen)
+            pygame.draw.rect(self.window, ui_overlay_color, self.pva_bottom_ui_rect_on_screen)
+        self._render_views(render_data, allow_shared_pass=True)
+        self._render_ui(render_data)
+        self._ui_signature = self._compute_ui_signature(render_data)
+        if self.game_mode == GameSettings.GameMode.PLAYER_VS_PLAYER:
+            self._draw_pvp_divider(self.window)
+        self._render_central_skill_banner(render_data)
+
+    def _render_dirty_frame(self, render_data):
+        static_layer = self._get_static_layer()
+        window_rect = self.window.get_rect()
+
+        current_rects = self._collect_dynamic_rects(render_data)
+        restore_rects = [r.clip(window_rect) for r in self._prev_dynamic_rects + current_rects]
+        restore_rects = [r for r in restore_rects if r.width > 0 and r.height > 0]
+
+        ui_rects = self._get_ui_rects()
+        ui_signature = self._compute_ui_signature(render_data)
+        ui_dirty = ui_signature != self._ui_signature or \
+                   any(r.colliderect(ui_rect) for r in restore_rects for ui_rect in ui_rects)
+        if ui_dirty:
+            restore_rects.extend(ui_rects)
+
+        for rect in restore_rects:
+            self.window.blit(static_layer, rect, rect)
+        self._render_views(render_data)
+        if ui_dirty:
+            self._render_ui(render_data)
+            self._ui_signature = ui_signature
+        if self.game_mode == GameSettings.GameMode.PLAYER_VS_PLAYER:
+            self._draw_pvp_divider(self.window)
+        self.last_dirty_rects = restore_rects
+
+    # ------------------------------------------------------------------
+    # 分層渲染輔助
+    # ------------------------------------------------------------------
+    def _get_ui_overlay_color(self):
         bg_r, bg_g, bg_b = Style.BACKGROUND_COLOR[:3] if isinstance(Style.BACKGROUND_COLOR, tuple) and len(Style.BACKGROUND_COLOR) >=3 else (0,0,0)
-        ui_overlay_color = tuple(max(0, c - 20) for c in (bg_r, bg_g, bg_b))
+        return tuple(max(0, c - 20) for c in (bg_r, bg_g, bg_b))
+
+    def _get_view_areas(self):
+        """[(遊戲區 Rect, is_top_player_perspective), ...]"""
+        if self.game_mode == GameSettings.GameMode.PLAYER_VS_PLAYER:
+            return [(self.viewport1_game_area_on_screen, False), (self.viewport2_game_area_on_screen, True)]
+        return [(self.game_area_rect_on_screen, False)]
 
+    def _get_ui_rects(self):
+        if self.game_mode == GameSettings.GameMode.PLAYER_VS_PLAYER:
+            return [self.pvp_shared_bottom_ui_rect_on_screen]
+        return [self.pva_top_ui_rect_on_screen, self.pva_bottom_ui_rect_on_screen]
 
+    def _get_static_layer(self):
+        ui_bg_color = Style.UI_BACKGROUND_COLOR if hasattr(Style, 'UI_BACKGROUND_COLOR') else (30,30,30)
+        key = (self.window.get_size(), tuple(Style.BACKGROUND_COLOR), tuple(ui_bg_color))
+        if self._static_layer is None or key != self._static_layer_key:
+            try:
+                layer = pygame.Surface(self.window.get_size()).convert(self.window)
+            except pygame.error:
+                layer = pygame.Surface(self.window.get_size())
+            layer.fill(Style.BACKGROUND_COLOR)
+            if self.game_mode == GameSettings.GameMode.PLAYER_VS_PLAYER:
+                pygame.draw.rect(layer, ui_bg_color, self.pvp_shared_bottom_ui_rect_on_screen)
+            else:
+                ui_overlay_color = self._get_ui_overlay_color()
+                pygame.draw.rect(layer, ui_overlay_color, self.pva_top_ui_rect_on_screen)
+                pygame.draw.rect(layer, ui_overlay_color, self.pva_bottom_ui_rect_on_screen)
+            for area, _ in self._get_view_areas():
+                self._draw_walls(layer, area)
+            if self.game_mode == GameSettings.GameMode.PLAYER_VS_PLAYER:
+                self._draw_pvp_divider(layer)
+            self._static_layer = layer
+            self._static_layer_key = key
+            if DEBUG_RENDERER: print(f"[Renderer._get_static_layer] Rebuilt static layer for key {key}")
+        return self._static_layer
+
+    def _has_active_skill_effects(self, render_data):
+        for key in ("player1", "opponent"):
+            skill_data = render_data[key].get("skill_data")
+            if skill_data and skill_data.get("visual_params", {}).get("active_effects", False):
+                return True
+        return False
+
+    def _compute_ui_signature(self, render_data):
+        signature = []
+        for key in ("player1", "opponent"):
+            player_data = render_data[key]
+            skill_data = player_data.get("skill_data") or {}
+            signature.append((player_data.get("lives"), player_data.get("max_lives"), player_data.get("identifier"),
+                              skill_data.get("code_name"), round(skill_data.get("energy_ratio", 0.0), 3)))
+        return tuple(signature)
+
+    def _collect_dynamic_rects(self, render_data):
+        """這一幀球拍、球 (含光芒 / 旋轉後的外框)、拖尾在螢幕上的保守外框。"""
+        rects = []
+        for area, is_top in self._get_view_areas():
+            rects.extend(self._dynamic_rects_for_view(render_data, area, is_top))
+        return rects
+
+    def _dynamic_rects_for_view(self, render_data, area, is_top):
+        s = self.game_content_scale_factor
+        paddle_h = int(self.logical_paddle_height_px * s) + 1
+        ball_extent = int(self.scaled_ball_diameter_px / 2 * max(self.glow_max_total_radius_factor, 1.5)) + 2
+        trail_extent = max(1, int(self.logical_ball_radius_px * 0.4 * s)) + 1
+        ball_data = render_data["ball"]
+        trail_data = render_data.get("trail") or []
+        rects = []
+        rects.append(pygame.Rect(area.left, area.top, area.width, paddle_h))
+        rects.append(pygame.Rect(area.left, area.bottom - paddle_h, area.width, paddle_h))
+
+        ball_y_norm = 1.0 - ball_data["y_norm"] if is_top else ball_data["y_norm"]
+        ball_cx = area.left + int(ball_data["x_norm"] * area.width)
+        ball_cy = area.top + int(ball_y_norm * area.height)
+        rects.append(pygame.Rect(ball_cx - ball_extent, ball_cy - ball_extent, ball_extent * 2, ball_extent * 2))
+
+        if trail_data:
+            xs = [area.left + int(tx * area.width) for tx, _ in trail_data]
+            ys = [area.top + int((1.0 - ty if is_top else ty) * area.height) for _, ty in trail_data]
+            rects.append(pygame.Rect(min(xs) - trail_extent, min(ys) - trail_extent,
+                                     max(xs) - min(xs) + trail_extent * 2, max(ys) - min(ys) + trail_extent * 2))
+        return rects
+
+    def _draw_pvp_divider(self, target_surface):
+        scaled_divider_thickness = max(1, int(2 * self.game_content_scale_factor))
+        divider_x_abs = self.viewport1_game_area_on_screen.right + (self.viewport2_game_area_on_screen.left - self.viewport1_game_area_on_screen.right) // 2
+        pygame.draw.line(target_surface, (80,80,80),
+                        (divider_x_abs, self.viewport1_game_area_on_screen.top),
+                        (divider_x_abs, self.viewport1_game_area_on_screen.bottom),
+                        scaled_divider_thickness)
+
+    def _draw_ball_image(self, target_surface, ball_image_key, center_x, center_y):
+        original_ball_surf = Renderer._original_ball_visuals.get(ball_image_key, Renderer._original_ball_visuals["default"])
+        rotated_ball = self.ball_rotation_cache.get(ball_image_key if ball_image_key in Renderer._original_ball_visuals else "default",
+                                                    original_ball_surf, self.scaled_ball_diameter_px, self.ball_angle)
+        ball_rect = rotated_ball.get_rect(center=(center_x, center_y))
+        target_surface.blit(rotated_ball, ball_rect)
+
+    def _render_pvp_shared_pass(self, render_data):
+        """
+        PvP 共用渲染：世界 (牆壁、球拍、拖尾、光芒) 只以 P1 視角畫一次，
+        P2 視角用 pygame.transform.flip 把有動態物件的區塊上下翻轉後貼上；
+        球體圖像不能翻轉 (旋轉方向會反)，所以最後再各自疊加一次。
+        只用於沒有視角專屬技能特效的畫面 (特效會畫在球拍下方，順序無法用翻轉重現)。
+        """
+        area1 = self.viewport1_game_area_on_screen
+        area2 = self.viewport2_game_area_on_screen
+        # P1 視角直接畫在視窗上 (底色已由 _render_full_frame 填好)，再把這塊翻轉貼到 P2 視角
+        self._render_player_view(
+            self.window,
+            render_data["player1"],
+            render_data["opponent"],
+            render_data["ball"],
+            render_data["trail"],
+            render_data["paddle_height_norm"],
+            area1,
+            is_top_player_perspective=False,
+            draw_ball_image=False,
+        )
+        # 背景與牆壁在兩個視角完全相同，只需要把有動態物件的區塊翻轉過去
+        self._draw_walls(self.window, area2)
+        for rect in self._dynamic_rects_for_view(render_data, area1, False):
+            rect = rect.clip(area1)
+            if rect.width <= 0 or rect.height <= 0:
+                continue
+            flipped_piece = pygame.transform.flip(self.window.subsurface(rect), False, True)
+            self.window.blit(flipped_piece, (area2.left + rect.left - area1.left, area2.top + area1.bottom - rect.bottom))
+
+        ball_data = render_data["ball"]
+        ball_image_key = ball_data.get("image_key", "default")
+        for area, is_top in ((area1, False), (area2, True)):
+            ball_y_norm = 1.0 - ball_data["y_norm"] if is_top else ball_data["y_norm"]
+            self._draw_ball_image(self.window, ball_image_key,
+                                  area.left + int(ball_data["x_norm"] * area.width),
+                                  area.top + int(ball_y_norm * area.height))
+
+    def _render_views(self, render_data, allow_shared_pass=False):
+        """allow_shared_pass 只在整張重畫時為 True (底色已填好)：PvP 可使用共用渲染。"""
         player1_data = render_data["player1"]
         opponent_data = render_data["opponent"]
-        ball_physics_spin = render_data["ball"].get("spin", 0)
-
-        # 每幀只更新一次 self.ball_angle (累積的視覺旋轉角度)
-        self.ball_angle = (self.ball_angle + ball_physics_spin * self.visual_spin_multiplier) % 360
-        current_ball_visual_angle_for_frame = self.ball_angle
-
-
         if self.game_mode == GameSettings.GameMode.PLAYER_VS_PLAYER:
+            if allow_shared_pass and self.pvp_shared_render_pass and \
+               not self._has_active_skill_effects(render_data):
+                self._render_pvp_shared_pass(render_data)
+                return
             self._render_player_view(
                 self.window,
                 player1_data,
@@ -656,16 +880,7 @@ class Renderer:
                 self.viewport2_game_area_on_screen,
                 is_top_player_perspective=True,
             )
-            self._render_pvp_bottom_ui(self.window, player1_data, opponent_data, self.pvp_shared_bottom_ui_rect_on_screen)
-            scaled_divider_thickness = max(1, int(2 * self.game_content_scale_factor))
-            divider_x_abs = self.viewport1_game_area_on_screen.right + (self.viewport2_game_area_on_screen.left - self.viewport1_game_area_on_screen.right) // 2
-            pygame.draw.line(self.window, (80,80,80),
-                            (divider_x_abs, self.viewport1_game_area_on_screen.top),
-                            (divider_x_abs, self.viewport1_game_area_on_screen.bottom),
-                            scaled_divider_thickness)
         else: # PvA
-            pygame.draw.rect(self.window, ui_overlay_color, self.pva_top_ui_rect_on_screen)
-            pygame.draw.rect(self.window, ui_overlay_color, self.pva_bottom_ui_rect_on_screen)
             self._render_player_view(
                 self.window,
                 player1_data,
@@ -676,9 +891,24 @@ class Renderer:
                 self.game_area_rect_on_screen,
                 is_top_player_perspective=False,
             )
+
+    def _render_ui(self, render_data):
+        player1_data = render_data["player1"]
+        opponent_data = render_data["opponent"]
+        if self.game_mode == GameSettings.GameMode.PLAYER_VS_PLAYER:
+            self._render_pvp_bottom_ui(self.window, player1_data, opponent_data, self.pvp_shared_bottom_ui_rect_on_screen)
+        else:
             self._render_health_bar_for_pva(player1_data, is_opponent=False)
             self._render_health_bar_for_pva(opponent_data, is_opponent=True)
             self._render_skill_ui_for_pva(player1_data)
+
+    def _is_central_skill_banner_visible(self, render_data):
+        if not render_data.get("central_skill_name_text"):
+            return False
+        elapsed_time_ms = pygame.time.get_ticks() - render_data.get("central_skill_name_start_time_ms", 0)
+        return elapsed_time_ms < render_data.get("central_skill_name_duration_ms", 2000)
+
+    def _render_central_skill_banner(self, render_data):
         # --- 新增：繪製螢幕中央的技能名大字效果 ---
         central_skill_name_text = render_data.get("central_skill_name_text")
         if central_skill_name_text:
@@ -701,24 +931,17 @@ class Renderer:
                 logical_font_size = getattr(Style, 'CENTRAL_SKILL_NAME_LOGICAL_FONT_SIZE', 70) # 預設70
                 scaled_font_size = int(logical_font_size * self.game_content_scale_factor)
 
-                # 使用 Style.get_font() 來獲取當前主題的字體 (unifont)
-                # 注意：如果 Style.FONT_PATH 沒有被設定為 unifont，這裡可能需要直接指定字體路徑
-                try:
-                    central_font = Style.get_font(scaled_font_size)
-                except Exception as e: # 字體加載失敗的備用方案
-                    if DEBUG_RENDERER: # 假設你有 DEBUG_RENDERER 開關
-                        print(f"[Renderer] Error loading font via Style.get_font for central skill name: {e}. Using fallback.")
-                    central_font = pygame.font.Font(resource_path('assets/unifont-16.0.03.otf'), scaled_font_size)
-
-
                 text_color_rgb = Style.TEXT_COLOR[:3] # 取RGB部分
 
                 # 創建帶有透明度的文字表面
                 try:
                     # Pygame 的 render 不直接接受帶 alpha 的顏色元組來實現半透明文字，
                     # 而是先渲染不透明文字，然後設定整個 surface 的 alpha。
-                    text_surface = central_font.render(central_skill_name_text, True, text_color_rgb)
-                    text_surface.set_alpha(int(alpha))
+                    # ⭐️ 文字 Surface 來自共用快取；淡出期間才 copy 一份來設定 alpha
+                    text_surface = Style.render_text(central_skill_name_text, scaled_font_size, text_color_rgb)
+                    if alpha < 255:
+                        text_surface = text_surface.copy()
+                        text_surface.set_alpha(int(alpha))
                 except Exception as e:
                     if DEBUG_RENDERER:
                         print(f"[Renderer] Error rendering central skill name text: {e}")
@@ -734,9 +957,6 @@ class Renderer:
                     self.window.blit(text_surface, text_rect)
                     if DEBUG_RENDERER and random.random() < 0.1: # 降低打印頻率
                          print(f"    Displaying Central Skill: '{central_skill_name_text}', Alpha: {alpha:.0f}, Elapsed: {elapsed_time_ms}ms")
-        # --- 新增結束 ---
-        pygame.display.flip()
-        self.clock.tick(60)
 
     def _render_pvp_bottom_ui(self, target_surface, player1_data, player2_data, scaled_ui_rect):
         s = self.game_content_scale_factor
@@ -749,14 +969,13 @@ class Renderer:
         scaled_skill_bar_h = int(8 * s)
         scaled_spacing = int(10 * s)
         scaled_text_font_size = int(14 * s)
-        text_font = Style.get_font(scaled_text_font_size)
         scaled_border_radius = max(1, int(2*s))
 
         # P1 UI (在共享條的左側)
         p1_base_x = scaled_ui_rect.left + scaled_spacing * 2
         p1_ui_y_center = scaled_ui_rect.centery 
 
-        p1_label_surf = text_font.render(player1_data.get("identifier", "P1").upper(), True, Style.PLAYER_COLOR)
+        p1_label_surf = Style.render_text(player1_data.get("identifier", "P1").upper(), scaled_text_font_size, Style.PLAYER_COLOR)
         p1_label_rect = p1_label_surf.get_rect(
             midright=(p1_base_x - scaled_spacing / 2, p1_ui_y_center - scaled_bar_h / 2 - scaled_skill_bar_h / 2 - scaled_spacing / 2) 
         )
@@ -770,14 +989,14 @@ class Renderer:
 
         p1_skill_y = p1_ui_y_center + scaled_spacing // 4 
         if player1_data.get("skill_data"):
-            self._render_single_skill_bar(target_surface, player1_data["skill_data"], text_font, p1_base_x, p1_skill_y, scaled_skill_bar_w, scaled_skill_bar_h, s)
+            self._render_single_skill_bar(target_surface, player1_data["skill_data"], p1_base_x, p1_skill_y, scaled_skill_bar_w, scaled_skill_bar_h, s)
 
         # P2 UI (在共享條的右側)
         p2_base_end_x = scaled_ui_rect.right - scaled_spacing * 2
         p2_ui_x_health_bar_start = p2_base_end_x - scaled_bar_w
         p2_ui_y_center = scaled_ui_rect.centery 
 
-        p2_label_surf = text_font.render(player2_data.get("identifier", "P2").upper(), True, Style.AI_COLOR) 
+        p2_label_surf = Style.render_text(player2_data.get("identifier", "P2").upper(), scaled_text_font_size, Style.AI_COLOR)
         p2_label_rect = p2_label_surf.get_rect(
             midleft=(p2_base_end_x + scaled_spacing / 2, p2_ui_y_center - scaled_bar_h / 2 - scaled_skill_bar_h / 2 - scaled_spacing / 2)
         )
@@ -792,9 +1011,9 @@ class Renderer:
         p2_skill_y = p2_ui_y_center + scaled_spacing // 4 
         if player2_data.get("skill_data"):
             p2_skill_x = p2_ui_x_health_bar_start + (scaled_bar_w - scaled_skill_bar_w) // 2 
-            self._render_single_skill_bar(target_surface, player2_data["skill_data"], text_font, p2_skill_x, p2_skill_y, scaled_skill_bar_w, scaled_skill_bar_h, s)
+            self._render_single_skill_bar(target_surface, player2_data["skill_data"], p2_skill_x, p2_skill_y, scaled_skill_bar_w, scaled_skill_bar_h, s)
 
-    def _render_single_skill_bar(self, surface, skill_data, font, x, y, width_scaled, height_scaled, scale_factor):
+    def _render_single_skill_bar(self, surface, skill_data, x, y, width_scaled, height_scaled, scale_factor):
         # skill_data is expected to be a dictionary like:
         # { "code_name": "slowmo", "is_active": False, "energy_ratio": 1.0, "cooldown_seconds": 0.0 }
 
@@ -802,7 +1021,7 @@ class Renderer:
         scaled_border_radius = max(1, int(2*scale_factor))
 
         skill_code_name = skill_data.get("code_name", "unknown_skill")
-        skill_cfg = SKILL_CONFIGS.get(skill_code_name, {}) # 確保導入 SKILL_CONFIGS
+        skill_cfg = self.config.skill_params(skill_code_name)
         bar_fill_color_rgb = skill_cfg.get("bar_color", (200, 200, 200))
         bar_bg_color_rgb = (50,50,50) # 可以考慮也加入到 Style 或 skill_cfg 中
 
@@ -849,7 +1068,6 @@ class Renderer:
         scaled_bar_h = int(15 * s) 
         scaled_spacing = int(20 * s)
         scaled_text_font_size = int(14 * s)
-        font = Style.get_font(scaled_text_font_size)
         scaled_border_radius = max(1, int(2*s))
 
         bar_bg_color = Style.AI_BAR_BG if is_opponent else Style.PLAYER_BAR_BG
@@ -858,7 +1076,7 @@ class Renderer:
         default_label = "AI" if is_opponent else "P1"
         label_text = player_data.get("identifier", default_label).upper()
         label_color = Style.AI_COLOR if is_opponent else Style.PLAYER_COLOR
-        label_surf = font.render(label_text, True, label_color)
+        label_surf = Style.render_text(label_text, scaled_text_font_size, label_color)
 
         max_lives = player_data.get("max_lives", 1)
         life_ratio = player_data.get("lives", 0) / max_lives if max_lives > 0 else 0
@@ -890,14 +1108,12 @@ class Renderer:
         scaled_spacing_between = int(15 * s)
         scaled_skill_bar_w = int(self.logical_game_area_size * 0.25 * s)
         scaled_skill_bar_h = int(10 * s)
-        scaled_text_font_size = int(12 * s)
-        font = Style.get_font(scaled_text_font_size)
 
         skill_bar_x = target_ui_bar_rect.left + scaled_spacing_from_edge + scaled_health_bar_w + scaled_spacing_between
         skill_bar_y = target_ui_bar_rect.top + (target_ui_bar_rect.height - scaled_skill_bar_h) // 2
 
-        self._render_single_skill_bar(self.window, skill_data, font, skill_bar_x, skill_bar_y, scaled_skill_bar_w, scaled_skill_bar_h, s)
+        self._render_single_skill_bar(self.window, skill_data, skill_bar_x, skill_bar_y, scaled_skill_bar_w, scaled_skill_bar_h, s)
 
     def close(self):
-        if DEBUG_RENDERER: print("[Renderer.close] Closing Renderer.")
+        if DEBUG_RENDERER: print(f"[Renderer.close] Closing Renderer. Post-process costs: {self.post_process.format_cost_breakdown()}")
         # No pygame.quit() here
\ No newline at end of file
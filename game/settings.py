@@ -41,6 +41,19 @@ class _GameSettingsSingleton:
             "renderer.ball_glow.color_rgb": [255, 223, 186],
             "renderer.ball_glow.min_alpha": 30,
             "renderer.ball_glow.max_alpha": 150,
+            "renderer.ball_rotation.angle_step_deg": 2.0,
+            "renderer.ball_rotation.memory_budget_mb": 16,
+            "renderer.dirty_rect_rendering": True,
+            "renderer.pvp_shared_render_pass": False,
+            "renderer.quality.tier": "auto",
+            "renderer.quality.percentile": 95,
+            "renderer.quality.evaluate_every_frames": 60,
+            "renderer.quality.upgrade_after_evaluations": 3,
+            "display.target_fps": 60,
+            "display.vsync": False,
+            "display.frame_stats_window": 600,
+            "development.hot_reload_configs": True,
+            "development.hot_reload_poll_ms": 500,
         }
 
     _key_map = {
@@ -70,6 +83,19 @@ class _GameSettingsSingleton:
             "BALL_GLOW_COLOR_RGB": "renderer.ball_glow.color_rgb",
             "BALL_GLOW_MIN_ALPHA": "renderer.ball_glow.min_alpha",
             "BALL_GLOW_MAX_ALPHA": "renderer.ball_glow.max_alpha",
+            "BALL_ROTATION_STEP_DEG": "renderer.ball_rotation.angle_step_deg",
+            "BALL_ROTATION_CACHE_MB": "renderer.ball_rotation.memory_budget_mb",
+            "DIRTY_RECT_RENDERING": "renderer.dirty_rect_rendering",
+            "PVP_SHARED_RENDER_PASS": "renderer.pvp_shared_render_pass",
+            "QUALITY_TIER": "renderer.quality.tier",
+            "QUALITY_PERCENTILE": "renderer.quality.percentile",
+            "QUALITY_EVALUATE_EVERY_FRAMES": "renderer.quality.evaluate_every_frames",
+            "QUALITY_UPGRADE_AFTER_EVALUATIONS": "renderer.quality.upgrade_after_evaluations",
+            "TARGET_FPS": "display.target_fps",
+            "VSYNC": "display.vsync",
+            "FRAME_STATS_WINDOW": "display.frame_stats_window",
+            "CONFIG_HOT_RELOAD": "development.hot_reload_configs",
+            "CONFIG_HOT_RELOAD_POLL_MS": "development.hot_reload_poll_ms",
         }
 
     class GameMode:
@@ -177,6 +203,16 @@ class _SettingsProxy:
         else:
             super().__setattr__(name, value)
 
+    def get_config_snapshot(self):
+        """
+        編譯後的唯讀設定快照 (game.config_snapshot.ConfigSnapshot)。
+        PongDuelEnv / 技能在建構時取一次，遊戲迴圈中不再經過這個 proxy 的 __getattr__。
+        """
+        if _GameSettingsSingleton._config_manager is not None:
+            return _GameSettingsSingleton._config_manager.get_config_snapshot()
+        from game.config_snapshot import default_config_snapshot
+        return default_config_snapshot()
+
     def set_active_theme(self, theme_name: str):
         """
         Sets the active theme name at runtime and triggers a style reload.
@@ -1,15 +1,14 @@
 # pong-soul/game/skills/long_paddle_skill.py
 import pygame
 from game.skills.base_skill import Skill
-from game.skills.skill_config import SKILL_CONFIGS # 假設 SKILL_CONFIGS["long_paddle"] 存在且正確
 
 class LongPaddleSkill(Skill):
     def __init__(self, env, owner_player_state): # ⭐️ 修改參數
         super().__init__(env, owner_player_state) # ⭐️ 調用父類構造函數
         cfg_key = "long_paddle"
-        if cfg_key not in SKILL_CONFIGS:
+        cfg = self.env.config.skill_params(cfg_key) # ⭐️ 編譯後的唯讀設定快照
+        if not cfg:
              raise ValueError(f"Skill configuration for '{cfg_key}' not found.")
-        cfg = SKILL_CONFIGS[cfg_key]
 
         self.duration_ms = cfg["duration_ms"]
         self.cooldown_ms = cfg["cooldown_ms"]
@@ -5,8 +5,8 @@ import math
 import numpy as np
 
 from game.skills.base_skill import Skill
-from game.skills.skill_config import SKILL_CONFIGS # 用於讀取設定
-from utils import resource_path # 用於載入音效等資源
+from game.particles import ParticleSystem
+from game.sound_scheduler import PRIORITY_IMPACT, PRIORITY_LOOP
 
 DEBUG_PURGATORY_SKILL = True # 技能專用除錯開關
 
@@ -14,7 +14,7 @@ class PurgatoryDomainSkill(Skill):
     def __init__(self, env, owner_player_state):
         super().__init__(env, owner_player_state)
         skill_key = "purgatory_domain"
-        cfg = SKILL_CONFIGS.get(skill_key, {})
+        cfg = self.env.config.skill_params(skill_key) # ⭐️ 編譯後的唯讀設定快照
 
         if not cfg:
             if DEBUG_PURGATORY_SKILL:
@@ -60,7 +60,17 @@ class PurgatoryDomainSkill(Skill):
 
         self.pixel_flame_config = cfg.get("pixel_flame_effect", {})
         self.flame_particles_enabled = self.pixel_flame_config.get("enabled", False)
-        self.flame_particles = []
+        # ⭐️ 火焰粒子存在預先配置的 NumPy 陣列中 (見 game/particles.py)
+        self.flame_particles = ParticleSystem(
+            capacity=max(1, int(self.pixel_flame_config.get("particle_count", 30))),
+            color_stops=[
+                (0.0, self.pixel_flame_config.get("color_end_rgba", [139, 0, 0, 50])),
+                (0.5, self.pixel_flame_config.get("color_mid_rgba", [255, 100, 0, 180])),
+                (1.0, self.pixel_flame_config.get("color_start_rgba", [255, 200, 0, 220])),
+            ],
+            size_start_factor=1.0,
+            size_end_factor=0.5,
+        )
         self.last_particle_emission_time = 0
 
         self.activation_animation_config = cfg.get("activation_animation", {})
@@ -100,9 +110,9 @@ class PurgatoryDomainSkill(Skill):
     
     
     def _create_flame_particle(self):
-        """創建一個新的火焰粒子並返回其屬性字典。"""
+        """在 self.flame_particles 中生成一個新的火焰粒子；成功回傳 True。"""
         if not self.flame_particles_enabled:
-            return None
+            return False
 
         # 從環境中獲取當前球的位置和速度 (正規化座標)
         # 確保 self.env.ball_x, self.env.ball_y, self.env.ball_vx, self.env.ball_vy 是最新的
@@ -154,26 +164,20 @@ class PurgatoryDomainSkill(Skill):
         final_vx *= particle_speed_magnitude
         final_vy *= particle_speed_magnitude
         
-        particle = {
-            'x_norm': particle_x,
-            'y_norm': particle_y,
-            'vx_norm': final_vx,
-            'vy_norm': final_vy,
-            'lifetime_ms_remaining': lifetime_ms + random.uniform(-lifetime_ms * 0.2, lifetime_ms * 0.2), # 生命週期帶一點隨機
-            'initial_lifetime_ms': lifetime_ms, # 用於計算顏色漸變的比例
-            'current_color_rgba': list(color_start), # 確保是可變列表
-            'current_size_px': base_size_px, # 初始大小
-        }
-        return particle
+        return self.flame_particles.emit(
+            particle_x, particle_y, final_vx, final_vy,
+            life_ms=lifetime_ms + random.uniform(-lifetime_ms * 0.2, lifetime_ms * 0.2), # 生命週期帶一點隨機
+            initial_life_ms=lifetime_ms, # 用於計算顏色漸變的比例
+            base_size=base_size_px,
+            color=color_start,
+        )
     
+    def _play_ball_event_sound(self):
+        # 牆壁 / 球拍反彈時觸發：走 impact channel，快速連續反彈時由排程器限制頻率
+        self.env.sound_manager.play_sfx(self.sound_ball_event, "impact", priority=PRIORITY_IMPACT)
+
     def _load_sound(self, sound_path_str):
-        if sound_path_str:
-            try:
-                return pygame.mixer.Sound(resource_path(sound_path_str))
-            except pygame.error as e:
-                if DEBUG_PURGATORY_SKILL:
-                    print(f"[SKILL_DEBUG][{self.__class__.__name__}] Error loading sound '{sound_path_str}': {e}")
-        return None
+        return self.env.sound_manager.load_sound(sound_path_str) # 共用實例；載入失敗或停用音效時回傳 None
 
     @property
     def overrides_ball_physics(self):
@@ -217,10 +221,8 @@ class PurgatoryDomainSkill(Skill):
         
         if DEBUG_PURGATORY_SKILL: print(f"[SKILL_DEBUG][{self.__class__.__name__}] ({self.owner.identifier}) Activated!")
 
-        if self.sound_activate:
-            self.sound_activate.play()
-        if self.sound_domain_loop:
-            self.domain_loop_channel = self.sound_domain_loop.play(loops=-1)
+        self.env.sound_manager.play_sfx(self.sound_activate)
+        self.domain_loop_channel = self.env.sound_manager.play_sfx(self.sound_domain_loop, priority=PRIORITY_LOOP, loops=-1)
         return True
     # <<< 新增的 update 方法 >>>
     def update(self):
@@ -250,9 +252,7 @@ class PurgatoryDomainSkill(Skill):
                 
                 if len(self.flame_particles) < max_particles and \
                     (current_time_ms - self.last_particle_emission_time) > emission_interval_ms:
-                    new_particle = self._create_flame_particle()
-                    if new_particle:
-                        self.flame_particles.append(new_particle)
+                    if self._create_flame_particle():
                         self.last_particle_emission_time = current_time_ms
         
         # --- 像素火焰粒子更新 (無論技能是否 active，只要有粒子就需要更新，直到它們消失) ---
@@ -263,47 +263,8 @@ class PurgatoryDomainSkill(Skill):
             # 為了簡化，這裡粒子的速度 vx_norm, vy_norm 可以理解為每幀的偏移量
             
             dt_frame_simulated_norm = self.env.time_scale # 使用環境的 time_scale 來調整粒子速度的應用
-
-            particles_to_remove = []
-            for particle in self.flame_particles:
-                particle['lifetime_ms_remaining'] -= (1000/60) # 假設60FPS，每幀約16.67ms
-
-                if particle['lifetime_ms_remaining'] <= 0:
-                    particles_to_remove.append(particle)
-                else:
-                    # 更新位置
-                    particle['x_norm'] += particle['vx_norm'] * dt_frame_simulated_norm
-                    particle['y_norm'] += particle['vy_norm'] * dt_frame_simulated_norm
-
-                    # 更新顏色和大小 (生命週期比例：1 -> 0)
-                    life_ratio = particle['lifetime_ms_remaining'] / particle['initial_lifetime_ms']
-                    life_ratio = max(0, min(1, life_ratio)) # 確保在 0-1 之間
-
-                    # 簡單的兩段顏色插值 (從 start 到 mid，再從 mid 到 end)
-                    color_start = self.pixel_flame_config.get("color_start_rgba", [255, 200, 0, 220])
-                    color_mid = self.pixel_flame_config.get("color_mid_rgba", [255, 100, 0, 180])
-                    color_end = self.pixel_flame_config.get("color_end_rgba", [139, 0, 0, 50])
-
-                    current_rgba = [0,0,0,0]
-                    if life_ratio > 0.5: # 從 start 到 mid
-                        # 0.5 到 1.0 的 life_ratio 映射到 0 到 1 的插值因子 (interp_ratio)
-                        interp_ratio = (life_ratio - 0.5) * 2 
-                        for i in range(4):
-                            current_rgba[i] = int(color_mid[i] + (color_start[i] - color_mid[i]) * interp_ratio)
-                    else: # 從 mid 到 end
-                        # 0 到 0.5 的 life_ratio 映射到 0 到 1 的插值因子 (interp_ratio)
-                        interp_ratio = life_ratio * 2
-                        for i in range(4):
-                            current_rgba[i] = int(color_end[i] + (color_mid[i] - color_end[i]) * interp_ratio)
-                    
-                    particle['current_color_rgba'] = current_rgba
-
-                    # 大小也可以隨生命週期變化 (例如，逐漸變小)
-                    base_size = self.pixel_flame_config.get("particle_base_size_px", 3)
-                    particle['current_size_px'] = max(1, int(base_size * (life_ratio * 0.5 + 0.5))) # 從 base_size 到 base_size*0.5
-
-            for p_remove in particles_to_remove:
-                self.flame_particles.remove(p_remove)
+            # ⭐️ 向量化：壽命遞減 (假設60FPS，每幀約16.67ms)、剔除、位移、顏色 (start → mid → end) 與大小 (base → base*0.5)
+            self.flame_particles.update(1000 / 60, velocity_scale=dt_frame_simulated_norm)
         elif not self.active and not self.flame_particles:
             # 如果技能未激活，且沒有粒子了，可以考慮停止頻繁的update檢查（如果有的話）
             pass
@@ -423,11 +384,11 @@ class PurgatoryDomainSkill(Skill):
             if new_ball_x - env_ball_radius_norm <= 0:
                 new_ball_x = env_ball_radius_norm
                 new_ball_vx *= -0.9 
-                if self.sound_ball_event: self.sound_ball_event.play()
+                self._play_ball_event_sound()
             elif new_ball_x + env_ball_radius_norm >= 1.0:
                 new_ball_x = 1.0 - env_ball_radius_norm
                 new_ball_vx *= -0.9
-                if self.sound_ball_event: self.sound_ball_event.play()
+                self._play_ball_event_sound()
             
             new_ball_y = np.clip(new_ball_y, env_ball_radius_norm, 1.0 - env_ball_radius_norm)
 
@@ -447,7 +408,7 @@ class PurgatoryDomainSkill(Skill):
                 round_done = True
                 info['reason'] = f"{self.owner.identifier}_purgatory_scored"
                 self.deactivate(scored_by_skill=True) 
-                if self.sound_ball_event: self.sound_ball_event.play()
+                self._play_ball_event_sound()
 
             owner_scored_this_step = False # 判斷是否打到自己龍門
             if not scored_this_step: 
@@ -464,7 +425,7 @@ class PurgatoryDomainSkill(Skill):
                     info['scorer'] = target_player_state.identifier 
                     info['reason'] = f"{target_player_state.identifier}_purgatory_own_goal"
                     self.deactivate(own_goal_by_skill=True)
-                    if self.sound_ball_event: self.sound_ball_event.play()
+                    self._play_ball_event_sound()
 
             # 板子碰撞 (常規階段)
             if not round_done:
@@ -506,7 +467,7 @@ class PurgatoryDomainSkill(Skill):
                     new_ball_vx += hit_offset_from_paddle_center * base_speed * 0.7 * random_vx_factor
                     new_ball_vx = np.clip(new_ball_vx, -base_speed * 1.8, base_speed * 1.8) 
                     new_ball_vy *= (1 + self.ball_instability_factor * random.uniform(0.1, 0.3))
-                    if self.sound_ball_event: self.sound_ball_event.play()
+                    self._play_ball_event_sound()
 
             if hasattr(self.env, 'trail') and hasattr(self.env, 'max_trail_length'):
                 self.env.trail.append((new_ball_x, new_ball_y))
@@ -538,11 +499,10 @@ class PurgatoryDomainSkill(Skill):
             if DEBUG_PURGATORY_SKILL:
                 print(f"    Cooldown started at: {self.cooldown_start_time}")
 
-        if self.sound_deactivate:
-            self.sound_deactivate.play()
+        self.env.sound_manager.play_sfx(self.sound_deactivate)
 
         if self.domain_loop_channel:
-            self.domain_loop_channel.stop()
+            self.env.sound_manager.stop_sfx(self.domain_loop_channel)
             self.domain_loop_channel = None
             if DEBUG_PURGATORY_SKILL:
                 print("    Domain loop sound channel stopped.")
@@ -595,7 +555,7 @@ class PurgatoryDomainSkill(Skill):
             "pixel_flames_enabled": self.flame_particles_enabled,
             "pixel_flames_data": {
                 "config": self.pixel_flame_config, # 傳遞火焰效果的靜態配置
-                "particles": list(self.flame_particles) # 傳遞當前所有活動粒子的數據副本
+                "particle_system": self.flame_particles # Renderer 直接從陣列 blit (同一幀內先 update 再 render，不需要複本)
             },
             "activation_animation_props": { # 預先準備好動畫屬性字典
                 "is_playing": False,
@@ -3,7 +3,6 @@
 import math
 import pygame
 from game.skills.base_skill import Skill
-from game.skills.skill_config import SKILL_CONFIGS
 from game.theme import Style # 為了 Style.PLAYER_COLOR 等
 
 DEBUG_SKILL_SLOWMO = False # 您原有的 DEBUG 開關
@@ -14,10 +13,10 @@ class SlowMoSkill(Skill):
         cfg_key = "slowmo"
         # ⭐️ 從 SKILL_CONFIGS 獲取設定，如果 key 不存在，cfg 會是空字典或 None (取決於 get 实现)
         #    我們的 skill_config.py 在載入失敗時 SKILL_CONFIGS 會是 {}
-        cfg = SKILL_CONFIGS.get(cfg_key, {}) # 使用 .get() 避免 KeyError，並提供預設空字典
+        cfg = self.env.config.skill_params(cfg_key) # ⭐️ 編譯後的唯讀設定快照；沒有此技能時為空 mapping
 
         if not cfg: # 如果 SKILL_CONFIGS 中沒有 "slowmo" 或載入失敗
-            print(f"[SKILL_DEBUG][SlowMoSkill] ({self.owner.identifier}) CRITICAL: Config for '{cfg_key}' not found in SKILL_CONFIGS! Using internal defaults.")
+            print(f"[SKILL_DEBUG][SlowMoSkill] ({self.owner.identifier}) CRITICAL: Config for '{cfg_key}' not found in skills_config.yaml! Using internal defaults.")
             # 技能內部預設值 (如果 SKILL_CONFIGS 中完全沒有 "slowmo")
             internal_default_cfg = {
                 "duration_ms": 3000, "cooldown_ms": 5000, "fog_duration_ms": 4000,
@@ -6,8 +6,9 @@ import numpy as np
 import torch
 
 from game.skills.base_skill import Skill
-from game.skills.skill_config import SKILL_CONFIGS
 from utils import resource_path
+from game.asset_manager import asset_manager
+from game.sound_scheduler import PRIORITY_IMPACT, PRIORITY_LOOP
 import os
 
 from game.ai_agent import AIAgent
@@ -20,10 +21,10 @@ class SoulEaterBugSkill(Skill):
     def __init__(self, env, owner_player_state):
         super().__init__(env, owner_player_state)
         cfg_key = "soul_eater_bug"
-        cfg = SKILL_CONFIGS.get(cfg_key, {})
+        cfg = self.env.config.skill_params(cfg_key) # ⭐️ 編譯後的唯讀設定快照
 
         if not cfg:
-            print(f"[SKILL_DEBUG][SoulEaterBugSkill] ({self.owner.identifier}) CRITICAL: Config for '{cfg_key}' not found in SKILL_CONFIGS! Using internal defaults for core params.")
+            print(f"[SKILL_DEBUG][SoulEaterBugSkill] ({self.owner.identifier}) CRITICAL: Config for '{cfg_key}' not found in skills_config.yaml! Using internal defaults for core params.")
             internal_core_cfg = {
                 "duration_ms": 8000, "cooldown_ms": 12000,
                 "bug_image_path": "assets/soul_eater_bug.png",
@@ -57,7 +58,9 @@ class SoulEaterBugSkill(Skill):
             scaled_height = int(base_diameter * self.bug_display_scale_factor)
             if scaled_width <=0 or scaled_height <=0 :
                 scaled_width, scaled_height = int(20 * self.bug_display_scale_factor), int(20 * self.bug_display_scale_factor)
-            self.bug_image_surface_loaded = pygame.image.load(resource_path(bug_image_path)).convert_alpha()
+            self.bug_image_surface_loaded = asset_manager.get_image(bug_image_path) # 共用的 Surface，不要直接修改
+            if self.bug_image_surface_loaded is None:
+                raise FileNotFoundError(bug_image_path)
             self.bug_image_transformed = pygame.transform.smoothscale(self.bug_image_surface_loaded, (scaled_width, scaled_height))
             if DEBUG_BUG_SKILL:
                 print(f"[SKILL_DEBUG][SoulEaterBugSkill] ({self.owner.identifier}) Bug Image Details:")
@@ -135,10 +138,7 @@ class SoulEaterBugSkill(Skill):
         return np.array(observation, dtype=np.float32)
 
     def _load_sound(self, sound_path):
-        if sound_path:
-            try: return pygame.mixer.Sound(resource_path(sound_path))
-            except pygame.error as e: print(f"[SKILL_DEBUG][SoulEaterBugSkill] Error loading sound: {sound_path}. Error: {e}")
-        return None
+        return self.env.sound_manager.load_sound(sound_path) # 共用實例；載入失敗或停用音效時回傳 None
 
     @property
     def overrides_ball_physics(self):
@@ -176,9 +176,9 @@ class SoulEaterBugSkill(Skill):
         self.was_crawl_sound_playing = False
         
         if DEBUG_BUG_SKILL: print(f"[SKILL_DEBUG][SoulEaterBugSkill] ({self.owner.identifier}) Activated! Target: {self.target_player_state.identifier}. Duration: {self.duration_ms}ms.")
-        if self.sound_activate_sfx: self.sound_activate_sfx.play()
+        self.env.sound_manager.play_sfx(self.sound_activate_sfx)
         if self.sound_crawl_sfx:
-            self.crawl_channel = self.sound_crawl_sfx.play(-1)
+            self.crawl_channel = self.env.sound_manager.play_sfx(self.sound_crawl_sfx, priority=PRIORITY_LOOP, loops=-1)
             self.was_crawl_sound_playing = True
         return True
 
@@ -350,17 +350,17 @@ class SoulEaterBugSkill(Skill):
 
             if self.sound_hit_paddle_sfx and hit_paddle and not scored:
                 if DEBUG_BUG_SKILL: print("    Playing hit paddle sound.")
-                self.sound_hit_paddle_sfx.play()
+                self.env.sound_manager.play_sfx(self.sound_hit_paddle_sfx, "impact", priority=PRIORITY_IMPACT)
             if self.sound_score_sfx and scored:
                 if DEBUG_BUG_SKILL: print("    Playing score sound.")
-                self.sound_score_sfx.play()
+                self.env.sound_manager.play_sfx(self.sound_score_sfx)
         
         if hasattr(self.env, 'set_ball_visual_override'):
             self.env.set_ball_visual_override(skill_identifier="soul_eater_bug", active=False, owner_identifier=self.owner.identifier)
             if DEBUG_BUG_SKILL: print(f"    Notified Env to restore ball visual from bug.")
         
         if self.crawl_channel:
-            self.crawl_channel.stop()
+            self.env.sound_manager.stop_sfx(self.crawl_channel)
             self.crawl_channel = None
             if DEBUG_BUG_SKILL: print("    Crawl sound channel stopped.")
         self.was_crawl_sound_playing = False
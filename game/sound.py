@@ -1,87 +1,128 @@
 # game/sound.py
 import pygame
-pygame.mixer.init()
+# mixer 在 SoundManager() 建構時才初始化 (import 本模組不再有副作用)
 from game.settings import GameSettings  # ⭐️ 引用設定
-from utils import resource_path # <--- 加入這行
+from game.asset_manager import asset_manager, CORE_SOUNDS
+from game.sound_scheduler import (SoundScheduler, NullSoundScheduler, PRIORITY_IMPACT, PRIORITY_SKILL,
+                                  PRIORITY_UI, PRIORITY_LOOP)
 
 class SoundManager:
-    def __init__(self):
-        pygame.mixer.init()
-        self.slowmo_sound = pygame.mixer.Sound(resource_path("assets/slowmo.mp3"))
-        self.click_sound = pygame.mixer.Sound(resource_path("assets/click.mp3")) # 保留給UI等其他點擊音效
-        self.countdown_sound = pygame.mixer.Sound(resource_path("assets/countdown.mp3"))
-        
-        # ⭐ 新增載入球拍碰撞音效 ⭐
-        try:
-            self.paddle_hit_sound = pygame.mixer.Sound(resource_path("assets/paddle_hit.mp3"))
-            # 您可以為此音效設定獨立的音量，或使用現有的設定
-            self.paddle_hit_sound.set_volume(GameSettings.CLICK_SOUND_VOLUME) # 暫時使用CLICK_SOUND_VOLUME，可後續調整
-        except pygame.error as e:
-            print(f"Warning: Could not load paddle_hit sound: {e}")
-            self.paddle_hit_sound = None
-
-        # ⭐ 新增載入勝利和失敗音效 ⭐
-        try:
-            self.win_sound = pygame.mixer.Sound(resource_path("assets/win.mp3"))
-            self.lose_sound = pygame.mixer.Sound(resource_path("assets/lose.mp3"))
-            # 設定音量，這裡我們暫定一個值，或者您可以根據需求在 GameSettings 中添加新設定
-            # 為了最小化改動，我們可以使用一個現有的音量設定，例如 CLICK_SOUND_VOLUME
-            self.win_sound.set_volume(GameSettings.CLICK_SOUND_VOLUME) 
-            self.lose_sound.set_volume(GameSettings.CLICK_SOUND_VOLUME)
-        except pygame.error as e:
-            print(f"Warning: Could not load win/lose sound: {e}")
-            self.win_sound = None
-            self.lose_sound = None
-
-        self.slowmo_sound.set_volume(GameSettings.SLOWMO_SOUND_VOLUME)
-        self.slowmo_channel = None
-        self.click_sound.set_volume(GameSettings.CLICK_SOUND_VOLUME)
-        self.countdown_sound.set_volume(GameSettings.COUNTDOWN_SOUND_VOLUME)
-        pygame.mixer.music.set_volume(GameSettings.BACKGROUND_MUSIC_VOLUME)
+    # name -> 音量設定 (GameSettings 屬性)；paddle_hit / win / lose 暫時沿用 CLICK_SOUND_VOLUME
+    _VOLUME_SETTINGS = {
+        "slowmo": "SLOWMO_SOUND_VOLUME",
+        "click": "CLICK_SOUND_VOLUME",
+        "countdown": "COUNTDOWN_SOUND_VOLUME",
+        "paddle_hit": "CLICK_SOUND_VOLUME",
+        "win": "CLICK_SOUND_VOLUME",
+        "lose": "CLICK_SOUND_VOLUME",
+    }
+
+    def __init__(self, enabled=True):
+        """enabled=False (headless / 批次模擬)：不初始化 mixer、不載入音效，所有播放都是 no-op。"""
+        # ⭐️ 音效由 asset_manager 解碼 (背景預載、全程式共用)，這裡只在第一次播放時取得並設定音量
+        self._sounds = {}
+        self.slowmo_channel = None # 目前的 slowmo Voice
+        self.enabled = enabled
+        if self.enabled:
+            try:
+                pygame.mixer.init()
+            except pygame.error as e:
+                print(f"[SoundManager] Warning: could not initialize the mixer ({e}). Sound is disabled.")
+                self.enabled = False
+        if self.enabled:
+            # ⭐️ 所有音效經過排程器：每類別固定的 channel、重複觸發間隔、優先度搶占
+            self.scheduler = SoundScheduler()
+            pygame.mixer.music.set_volume(GameSettings.BACKGROUND_MUSIC_VOLUME)
+        else:
+            self.scheduler = NullSoundScheduler()
+
+    def load_sound(self, relative_path):
+        """技能等使用：共用的 Sound (停用音效時回傳 None，不解碼)。"""
+        return asset_manager.get_sound(relative_path) if self.enabled else None
+
+    def play_sfx(self, sound, category="skill", priority=PRIORITY_SKILL, loops=0):
+        """經排程器播放，回傳 Voice (可交給 stop_sfx)；被略過時回傳 None。"""
+        return self.scheduler.play(sound, category, priority=priority, loops=loops)
+
+    def stop_sfx(self, voice):
+        self.scheduler.stop(voice)
+
+    def _get_sound(self, name):
+        if not self.enabled:
+            return None
+        if name not in self._sounds:
+            sound = asset_manager.get_sound(CORE_SOUNDS[name])
+            if sound is not None:
+                sound.set_volume(getattr(GameSettings, self._VOLUME_SETTINGS[name]))
+            self._sounds[name] = sound
+        return self._sounds[name]
+
+    @property
+    def slowmo_sound(self):
+        return self._get_sound("slowmo")
+
+    @property
+    def click_sound(self):
+        return self._get_sound("click")
+
+    @property
+    def countdown_sound(self):
+        return self._get_sound("countdown")
+
+    @property
+    def paddle_hit_sound(self):
+        return self._get_sound("paddle_hit")
+
+    @property
+    def win_sound(self):
+        return self._get_sound("win")
+
+    @property
+    def lose_sound(self):
+        return self._get_sound("lose")
 
 
     # === 原有 slowmo 音效 ===
     def play_slowmo(self):
-        if self.slowmo_channel is None:
-            self.slowmo_channel = self.slowmo_sound.play(-1)
-            # 確保 channel 存在才設定音量
-            if self.slowmo_channel:
-                 self.slowmo_channel.set_volume(GameSettings.SLOWMO_SOUND_VOLUME) # 使用 GameSettings 中的音量
+        if self.slowmo_channel is None and self.slowmo_sound:
+            # channel 音量使用 GameSettings 中的音量
+            self.slowmo_channel = self.scheduler.play(self.slowmo_sound, "skill", priority=PRIORITY_LOOP, loops=-1,
+                                                      volume=GameSettings.SLOWMO_SOUND_VOLUME)
 
     def stop_slowmo(self):
         if self.slowmo_channel is not None:
-            self.slowmo_channel.stop()
+            self.scheduler.stop(self.slowmo_channel)
             self.slowmo_channel = None
     
     # 播放點擊音效 (用於UI等)
     def play_click(self):
-        self.click_sound.play()
+        self.scheduler.play(self.click_sound, "ui", priority=PRIORITY_UI)
 
     # ⭐ 新增播放球拍碰撞音效的方法 ⭐
     def play_paddle_hit(self):
         if self.paddle_hit_sound:
-            self.paddle_hit_sound.play()
-        else:
+            self.scheduler.play(self.paddle_hit_sound, "impact", priority=PRIORITY_IMPACT)
+        elif self.enabled:
             # 如果 paddle_hit.mp3 載入失敗，可以選擇播放預設的 click 音效或不播放
-            self.click_sound.play() # Fallback to click sound if paddle_hit_sound is not available
+            self.play_click() # Fallback to click sound if paddle_hit_sound is not available
 
     # 播放倒數音效
     def play_countdown(self):
-        self.countdown_sound.play()
+        self.scheduler.play(self.countdown_sound, "ui", priority=PRIORITY_UI)
 
     # 控制背景音樂
     def play_bg_music(self, loop=True):
-        pygame.mixer.music.play(-1 if loop else 0)
+        if self.enabled:
+            pygame.mixer.music.play(-1 if loop else 0)
 
     def stop_bg_music(self):
-        pygame.mixer.music.stop()
+        if self.enabled:
+            pygame.mixer.music.stop()
 
     # ⭐ 新增播放勝利音效的方法 ⭐
     def play_win_sound(self):
-        if self.win_sound:
-            self.win_sound.play()
+        self.scheduler.play(self.win_sound, "ui", priority=PRIORITY_LOOP) # 勝負音效不可被點擊聲搶走
 
     # ⭐ 新增播放失敗音效的方法 ⭐
     def play_lose_sound(self):
-        if self.lose_sound:
-            self.lose_sound.play()
\ No newline at end of file
+        self.scheduler.play(self.lose_sound, "ui", priority=PRIORITY_LOOP)
\ No newline at end of file
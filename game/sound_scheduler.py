@@ -0,0 +1,135 @@
+# game/sound_scheduler.py
+"""
+音效播放排程：每個類別有固定保留的 mixer channel (pygame.mixer.set_reserved)，
+同一個音效在 min_interval_ms 內重複觸發時直接略過，channel 用完時以優先度搶占 (voice stealing)：
+只會搶走優先度不高於新音效的 channel，同優先度時搶最早開始的那個。
+
+    voice = scheduler.play(sound, "impact", priority=PRIORITY_IMPACT)
+    scheduler.stop(voice)   # 只有 channel 仍在播這個 voice 時才停止 (已被搶占就不影響新的音效)
+
+headless / 批次模擬使用 NullSoundScheduler：同樣的介面，什麼都不做。
+"""
+import pygame
+
+DEBUG_SOUND_SCHEDULER = False
+
+# 類別 -> 保留的 channel 數
+CHANNEL_POOLS = {
+    "ui": 2,      # 點擊、倒數、勝負
+    "impact": 3,  # 球拍 / 牆壁碰撞、技能中的球體事件
+    "skill": 4,   # 技能啟動 / 結束與持續音效 (loop)
+}
+# 類別 -> 同一個音效重新觸發的最短間隔 (ms)
+MIN_INTERVAL_MS = {
+    "ui": 0,
+    "impact": 60,
+    "skill": 0,
+}
+FREE_CHANNELS = 4 # 保留 channel 以外，留給直接呼叫 Sound.play() 的數量
+
+PRIORITY_IMPACT = 1
+PRIORITY_SKILL = 5
+PRIORITY_UI = 8
+PRIORITY_LOOP = 10 # 持續音效不應被一次性的音效搶走
+
+
+class Voice:
+    __slots__ = ("sound", "channel", "category", "priority", "started_ms")
+
+    def __init__(self, sound, channel, category, priority, started_ms):
+        self.sound = sound
+        self.channel = channel
+        self.category = category
+        self.priority = priority
+        self.started_ms = started_ms
+
+    def is_playing(self):
+        return self.channel.get_busy() and self.channel.get_sound() is self.sound
+
+
+class SoundScheduler:
+    def __init__(self, pools=None, min_interval_ms=None):
+        self.pools = dict(CHANNEL_POOLS if pools is None else pools)
+        self.min_interval_ms = dict(MIN_INTERVAL_MS if min_interval_ms is None else min_interval_ms)
+        total_reserved = sum(self.pools.values())
+        pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), total_reserved + FREE_CHANNELS))
+        pygame.mixer.set_reserved(total_reserved) # 保留 channel 0..total-1，Sound.play() 不會自動使用
+
+        self._channels = {}
+        index = 0
+        for category, count in self.pools.items():
+            self._channels[category] = [pygame.mixer.Channel(index + i) for i in range(count)]
+            index += count
+        self._voices = {} # Channel -> 最後在該 channel 開始的 Voice
+        self._last_played_ms = {} # id(sound) -> ticks
+        self.stats = {"played": 0, "rate_limited": 0, "stolen": 0, "dropped": 0}
+
+    def play(self, sound, category="skill", priority=PRIORITY_SKILL, loops=0, volume=1.0, min_interval_ms=None):
+        """播放並回傳 Voice；被頻率限制或沒有可用 channel 時回傳 None。"""
+        if sound is None:
+            return None
+        channels = self._channels.get(category)
+        if channels is None:
+            raise ValueError(f"Unknown sound category '{category}'. Known: {list(self._channels)}")
+
+        now_ms = pygame.time.get_ticks()
+        interval = self.min_interval_ms.get(category, 0) if min_interval_ms is None else min_interval_ms
+        last_ms = self._last_played_ms.get(id(sound))
+        if interval > 0 and last_ms is not None and now_ms - last_ms < interval:
+            self.stats["rate_limited"] += 1
+            return None
+
+        channel = self._free_channel(channels)
+        if channel is None:
+            channel = self._channel_to_steal(channels, priority)
+            if channel is None:
+                self.stats["dropped"] += 1
+                if DEBUG_SOUND_SCHEDULER: print(f"[SoundScheduler] Dropped sound in '{category}' (priority {priority}): pool busy.")
+                return None
+            self.stats["stolen"] += 1
+
+        channel.set_volume(volume) # channel 音量會保留，每次都要重設
+        channel.play(sound, loops=loops)
+        voice = Voice(sound, channel, category, priority, now_ms)
+        self._voices[channel] = voice
+        self._last_played_ms[id(sound)] = now_ms
+        self.stats["played"] += 1
+        return voice
+
+    def _free_channel(self, channels):
+        for channel in channels:
+            if not channel.get_busy():
+                return channel
+        return None
+
+    def _channel_to_steal(self, channels, priority):
+        candidates = [self._voices[channel] for channel in channels
+                      if channel in self._voices and self._voices[channel].priority <= priority]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda voice: (voice.priority, voice.started_ms)).channel
+
+    def stop(self, voice):
+        if voice is not None and self._voices.get(voice.channel) is voice:
+            voice.channel.stop()
+            del self._voices[voice.channel]
+
+    def stop_all(self):
+        for channels in self._channels.values():
+            for channel in channels:
+                channel.stop()
+        self._voices.clear()
+
+
+class NullSoundScheduler:
+    """headless / 批次模擬用：與 SoundScheduler 相同的介面，不碰 mixer。"""
+    stats = {}
+
+    def play(self, sound, category="skill", priority=PRIORITY_SKILL, loops=0, volume=1.0, min_interval_ms=None):
+        return None
+
+    def stop(self, voice):
+        pass
+
+    def stop_all(self):
+        pass
@@ -0,0 +1,138 @@
+# game/sprite_cache.py
+import pygame
+from collections import OrderedDict
+
+DEBUG_SPRITE_CACHE = False
+
+SPRITE_CACHE_MAX_ENTRIES = 1024
+COLOR_BUCKET_SIZE = 8 # RGBA 每個通道量化到 8 的倍數，漸變中的顏色 / 透明度才會命中同一張 sprite
+
+
+def _quantize_rgba(rgba, bucket):
+    if len(rgba) == 3:
+        rgba = (*rgba, 255)
+    if bucket <= 1:
+        return tuple(int(c) for c in rgba[:4])
+    return tuple(min(255, int(round(c / bucket)) * bucket) for c in rgba[:4])
+
+
+class SpriteCache:
+    """
+    預先光柵化的特效圖元 (圓形光暈 / 拖尾點 / 方形粒子) 快取。
+    以 (形狀, 尺寸, 量化後的 RGBA) 為 key，第一次用到時畫一次 SRCALPHA Surface，之後每幀直接 blit。
+    尺寸已經是縮放後的像素，所以縮放比例 (解析度) 改變時由 ensure_scale() 整個清掉；
+    主題切換時由 theme.reload_active_style() 呼叫 clear()。
+    回傳的 Surface 是共用的，呼叫端不要修改它。
+    """
+    def __init__(self, max_entries=SPRITE_CACHE_MAX_ENTRIES, color_bucket=COLOR_BUCKET_SIZE):
+        self.max_entries = max_entries
+        self.color_bucket = color_bucket
+        self._entries = OrderedDict()
+        self._scale_key = None
+        self.hits = 0
+        self.misses = 0
+
+    def ensure_scale(self, scale_factor, surface_size=None):
+        scale_key = (round(scale_factor, 6), surface_size)
+        if scale_key != self._scale_key:
+            if DEBUG_SPRITE_CACHE and self._scale_key is not None:
+                print(f"[SpriteCache.ensure_scale] Scale changed {self._scale_key} -> {scale_key}, clearing {len(self._entries)} sprites.")
+            self._entries.clear()
+            self._scale_key = scale_key
+
+    def _get(self, key, build):
+        surface = self._entries.get(key)
+        if surface is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = build()
+        self._entries[key] = surface
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return surface
+
+    def circle(self, radius_px, rgba):
+        """直徑 2*radius_px 的實心圓 sprite，blit 時左上角對齊 (cx - radius_px, cy - radius_px)。"""
+        radius_px = max(1, int(radius_px))
+        color = _quantize_rgba(rgba, self.color_bucket)
+
+        def build():
+            surf = pygame.Surface((radius_px * 2, radius_px * 2), pygame.SRCALPHA)
+            pygame.draw.circle(surf, color, (radius_px, radius_px), radius_px)
+            return surf
+        return self._get(("circle", radius_px, color), build)
+
+    def rect(self, width_px, height_px, rgba):
+        """實心半透明矩形 sprite (方形粒子、球拍殘影)。"""
+        width_px = max(1, int(width_px))
+        height_px = max(1, int(height_px))
+        color = _quantize_rgba(rgba, self.color_bucket)
+
+        def build():
+            surf = pygame.Surface((width_px, height_px), pygame.SRCALPHA)
+            surf.fill(color)
+            return surf
+        return self._get(("rect", width_px, height_px, color), build)
+
+    def clear(self):
+        self._entries.clear()
+        if DEBUG_SPRITE_CACHE: print("[SpriteCache.clear] Sprite cache cleared.")
+
+
+SPRITE_CACHE = SpriteCache()
+
+
+class BallRotationCache:
+    """
+    球體圖像的旋轉快取：每個 (image_key, 直徑) 只 smoothscale 一次，
+    旋轉後的畫面依 angle_step_deg 的角度解析度存起來 (第一次用到該角度時才旋轉)。
+    渲染時只需要查表 + blit，不再每幀 smoothscale + rotate。
+
+    memory_budget_mb 限制所有旋轉畫面的總量；若一整圈的畫面放不下，自動放大角度間隔。
+    """
+    def __init__(self, angle_step_deg=2.0, memory_budget_mb=16.0):
+        self.requested_step_deg = max(0.1, float(angle_step_deg))
+        self.memory_budget_bytes = max(0, float(memory_budget_mb)) * 1024 * 1024
+        self._sets = {} # (image_key, diameter) -> {"scaled": Surface, "step": float, "frames": [Surface or None, ...]}
+        self.bytes_reserved = 0 # 已建立的旋轉組一整圈所需的量 (預算依這個計算)
+        self.bytes_used = 0     # 實際已旋轉出來的畫面
+
+    def _create_set(self, image_key, original_surface, diameter_px):
+        scaled = pygame.transform.smoothscale(original_surface, (diameter_px, diameter_px))
+        # 旋轉後的 bounding box 最大約為 (d * sqrt(2))^2，每像素 4 bytes
+        frame_bytes = int((diameter_px * 1.4143) ** 2) * 4 + 1
+        remaining = max(frame_bytes, self.memory_budget_bytes - self.bytes_reserved)
+        max_frames = max(1, int(remaining // frame_bytes))
+        step = self.requested_step_deg
+        if 360.0 / step > max_frames:
+            step = 360.0 / max_frames
+            print(f"[BallRotationCache] Memory budget too small for '{image_key}' @ {diameter_px}px at "
+                  f"{self.requested_step_deg}°; using {step:.2f}° steps instead.")
+        num_frames = max(1, int(round(360.0 / step)))
+        entry = {"scaled": scaled, "step": 360.0 / num_frames, "frames": [None] * num_frames, "frame_bytes": frame_bytes}
+        self._sets[(image_key, diameter_px)] = entry
+        self.bytes_reserved += num_frames * frame_bytes
+        if DEBUG_SPRITE_CACHE:
+            print(f"[BallRotationCache] New set '{image_key}' @ {diameter_px}px: {num_frames} frames of {entry['step']:.2f}°")
+        return entry
+
+    def get(self, image_key, original_surface, diameter_px, angle_deg):
+        diameter_px = max(1, int(diameter_px))
+        entry = self._sets.get((image_key, diameter_px))
+        if entry is None:
+            entry = self._create_set(image_key, original_surface, diameter_px)
+        frames = entry["frames"]
+        index = int(round((angle_deg % 360.0) / entry["step"])) % len(frames)
+        frame = frames[index]
+        if frame is None:
+            frame = pygame.transform.rotate(entry["scaled"], index * entry["step"])
+            frames[index] = frame
+            self.bytes_used += entry["frame_bytes"]
+        return frame
+
+    def clear(self):
+        self._sets.clear()
+        self.bytes_reserved = 0
+        self.bytes_used = 0
@@ -0,0 +1,117 @@
+# game/startup.py
+"""
+啟動流程的延遲載入與診斷工具。
+
+標題畫面 (SelectGameModeState) 只需要 pygame + 主題 + 設定；PongDuelEnv、Renderer、技能與 torch
+都是進入 GameplayState 才需要。GameApp 顯示標題畫面後呼叫 start_background_preload()，
+在背景執行緒先把這些模組 import 進來 (只 import，不建立任何 pygame 物件)，
+玩家選完選單時通常已經載入完成；若還沒完成，主執行緒的 import 會等待同一把 import lock，不會重複載入。
+
+診斷指令 (類似 python -X importtime)：
+    python main.py --profile-imports [--top 15]
+"""
+import os
+import subprocess
+import sys
+import threading
+import time
+import importlib
+
+DEBUG_STARTUP = False
+
+# 進入遊戲才需要的重量級模組 (依序載入；torch 最重，放最後)
+DEFERRED_MODULES = (
+    "envs.pong_duel_env",
+    "game.states.gameplay_state",
+    "game.ai_agent",
+    "game.skills.soul_eater_bug_skill",
+)
+
+PRELOAD_TIMINGS = {} # module name -> 背景載入耗時 (ms)；失敗時為 None
+_preload_thread = None
+
+
+def _preload(module_names):
+    for name in module_names:
+        t0 = time.perf_counter()
+        try:
+            importlib.import_module(name)
+            PRELOAD_TIMINGS[name] = (time.perf_counter() - t0) * 1000.0
+            if DEBUG_STARTUP: print(f"[startup] Preloaded '{name}' in {PRELOAD_TIMINGS[name]:.1f}ms")
+        except Exception as e:
+            PRELOAD_TIMINGS[name] = None
+            print(f"[startup] Warning: background preload of '{name}' failed ({e}). It will be imported on first use.")
+
+
+def start_background_preload(module_names=DEFERRED_MODULES):
+    """在 daemon 執行緒中 import module_names；重複呼叫時不會再開新的執行緒。"""
+    global _preload_thread
+    if _preload_thread is not None:
+        return _preload_thread
+    _preload_thread = threading.Thread(target=_preload, args=(tuple(module_names),), name="module-preload", daemon=True)
+    _preload_thread.start()
+    return _preload_thread
+
+
+def is_preload_finished():
+    return _preload_thread is None or not _preload_thread.is_alive()
+
+
+# ----------------------------------------------------------------------
+# Import-time profile
+# ----------------------------------------------------------------------
+def _parse_importtime(stderr_text):
+    """解析 -X importtime 的輸出 → [(cumulative_us, self_us, module_name), ...]"""
+    rows = []
+    for line in stderr_text.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue # 標題列
+        rows.append((cumulative_us, self_us, parts[2].rstrip()))
+    return rows
+
+
+def profile_imports(module_name, cwd=None):
+    """在全新的直譯器中以 -X importtime import module_name，回傳解析後的列 (依 cumulative 由大到小)。"""
+    env = dict(os.environ)
+    env.setdefault("SDL_VIDEODRIVER", "dummy")
+    env.setdefault("SDL_AUDIODRIVER", "dummy")
+    env["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+                            cwd=cwd, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        print(f"[startup] Warning: importing '{module_name}' failed:\n{result.stderr.strip().splitlines()[-1] if result.stderr.strip() else ''}")
+    return sorted(_parse_importtime(result.stderr), key=lambda row: -row[0])
+
+
+def print_import_profile(top_n=15, cwd=None):
+    """
+    分別量測 main (標題畫面出現前會 import 的部分) 與延遲載入的模組，
+    列出各自最耗時的 import (cumulative = 含子模組)。
+    """
+    cwd = cwd or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    startup_rows = profile_imports("main", cwd=cwd)
+    startup_names = {row[2].strip() for row in startup_rows}
+    total_startup_ms = sum(row[1] for row in startup_rows) / 1000.0
+    print(f"=== Startup path: import main ({total_startup_ms:.1f}ms, {len(startup_rows)} modules) ===")
+    _print_rows(startup_rows, top_n)
+
+    for module_name in DEFERRED_MODULES:
+        rows = profile_imports(module_name, cwd=cwd)
+        # 只算標題畫面之後才會多出來的模組
+        extra_rows = [row for row in rows if row[2].strip() not in startup_names]
+        extra_ms = sum(row[1] for row in extra_rows) / 1000.0
+        print(f"\n=== Deferred: {module_name} (+{extra_ms:.1f}ms, +{len(extra_rows)} modules beyond startup) ===")
+        _print_rows(extra_rows, top_n)
+
+
+def _print_rows(rows, top_n):
+    print(f"{'cumulative(ms)':>15} {'self(ms)':>10}  module")
+    for cumulative_us, self_us, name in rows[:top_n]:
+        print(f"{cumulative_us / 1000.0:>15.1f} {self_us / 1000.0:>10.1f}  {name}")
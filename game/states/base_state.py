@@ -13,6 +13,9 @@ class BaseState(ABC):
         self.scale_factor = 1.0
         self.render_area = pygame.Rect(0, 0, self.game_app.ACTUAL_SCREEN_WIDTH, self.game_app.ACTUAL_SCREEN_HEIGHT)
 
+        # 為 True 時 GameApp 不會在 render 前先填滿背景 (狀態自己負責整個畫面，例如髒矩形渲染)
+        self.clears_own_background = False
+
 
     @abstractmethod
     def handle_event(self, event):
@@ -32,6 +35,14 @@ class BaseState(ABC):
         """
         pass
 
+    def get_dirty_rects(self):
+        """這一幀需要更新到螢幕上的矩形清單；None 代表整個畫面 flip。"""
+        return None
+
+    def on_config_reloaded(self, changed_files):
+        """設定檔熱重載後 (game.config_watcher) 由 GameApp 呼叫；changed_files 為檔名清單。"""
+        pass
+
     def on_enter(self, previous_state_data=None):
         """當進入此狀態時調用。可以接收來自前一個狀態的數據。"""
         if previous_state_data:
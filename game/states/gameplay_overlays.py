@@ -0,0 +1,91 @@
+# game/states/gameplay_overlays.py
+"""
+GameplayState 上層的計時覆蓋畫面 (倒數、勝負橫幅)。
+由主迴圈每幀的 dt 推進，不再以 pygame.time.wait / delay 阻塞：
+覆蓋畫面期間事件照常處理 (ESC / 關閉視窗立即有效)，背景的 AI 載入與資源預載也持續進行。
+
+覆蓋畫面存在時 GameplayState 不執行 env.step()，但照常 render() 遊戲畫面，再把文字畫在上面。
+"""
+from game.theme import Style
+
+DEBUG_OVERLAYS = False
+
+# 單幀最多推進的時間：進入狀態那一幀的 dt 含建立 env / 載入模型的時間，不應直接吃掉倒數
+MAX_OVERLAY_STEP_MS = 100.0
+
+
+class TimedOverlay:
+    def __init__(self, duration_ms, on_finish=None):
+        self.duration_ms = duration_ms
+        self.elapsed_ms = 0.0
+        self.on_finish = on_finish
+        self.finished = False
+
+    def is_ready_to_finish(self):
+        """時間到之後是否可以結束 (子類別可以額外等待條件)。"""
+        return True
+
+    def update(self, dt_ms):
+        """推進計時；結束的那一幀呼叫 on_finish 並回傳 True。"""
+        if self.finished:
+            return True
+        self.elapsed_ms += min(dt_ms, MAX_OVERLAY_STEP_MS)
+        self._on_advance()
+        if self.elapsed_ms >= self.duration_ms and self.is_ready_to_finish():
+            self.finished = True
+            if DEBUG_OVERLAYS: print(f"[{self.__class__.__name__}] Finished after {self.elapsed_ms:.0f}ms")
+            if self.on_finish:
+                self.on_finish()
+        return self.finished
+
+    def _on_advance(self):
+        pass
+
+    def draw(self, surface, center, scale):
+        pass
+
+    @staticmethod
+    def _draw_text(surface, text, base_font_size, color, center, scale):
+        text_surface = Style.render_text(text, max(1, int(base_font_size * scale)), color)
+        surface.blit(text_surface, text_surface.get_rect(center=center))
+
+
+class CountdownOverlay(TimedOverlay):
+    """每秒顯示一個數字並呼叫 on_tick(number) (播放倒數音效)；wait_until() 為 False 時停在最後一秒。"""
+
+    def __init__(self, seconds, on_tick=None, wait_until=None, on_finish=None):
+        super().__init__(max(0, seconds) * 1000.0, on_finish=on_finish)
+        self.seconds = max(0, seconds)
+        self.on_tick = on_tick
+        self.wait_until = wait_until
+        self._last_number = None
+
+    def is_ready_to_finish(self):
+        return self.wait_until is None or self.wait_until()
+
+    def current_number(self):
+        if self.seconds == 0:
+            return None
+        return max(1, self.seconds - int(self.elapsed_ms // 1000))
+
+    def _on_advance(self):
+        number = self.current_number()
+        if number is not None and number != self._last_number and self.elapsed_ms < self.duration_ms:
+            self._last_number = number
+            if self.on_tick:
+                self.on_tick(number)
+
+    def draw(self, surface, center, scale):
+        number = self.current_number()
+        if number is not None:
+            self._draw_text(surface, str(number), 60, Style.TEXT_COLOR, center, scale)
+
+
+class ResultBannerOverlay(TimedOverlay):
+    def __init__(self, text, color, duration_ms=2000, on_finish=None):
+        super().__init__(duration_ms, on_finish=on_finish)
+        self.text = text
+        self.color = color
+
+    def draw(self, surface, center, scale):
+        self._draw_text(surface, self.text, 40, self.color, center, scale)
@@ -2,20 +2,46 @@
 import pygame
 import random # 需要隨機發球等
 import os     # 需要 os.path.exists
-import time   # 需要 time.sleep (雖然Renderer有clock.tick)
+import time   # 需要 time.sleep (幀率節拍由 FramePresenter 負責)
+import threading
 
 from game.states.base_state import BaseState
 from game.theme import Style
 from game.settings import GameSettings
 from envs.pong_duel_env import PongDuelEnv # 遊戲環境
-from game.ai_agent import AIAgent         # AI 代理
 from game.level import LevelManager       # 關卡管理器
 from utils import resource_path           # 資源路徑輔助函數
+from game.asset_archive import open_asset, asset_exists
 from game.constants import P1_GAME_CONTROLS, P2_GAME_CONTROLS
+from game.states.gameplay_overlays import CountdownOverlay, ResultBannerOverlay
 
 
 DEBUG_GAMEPLAY_STATE = False
 
+
+class _AIWarmUp:
+    """在背景執行緒載入 AI 模型並先做一次推論 (torch 第一次推論較慢)，倒數期間主迴圈不會被卡住。"""
+
+    def __init__(self, model_path):
+        self.model_path = model_path
+        self.agent = None
+        self.error = None
+        self.done = threading.Event()
+        self.started_at = time.perf_counter()
+        self.load_ms = None
+        threading.Thread(target=self._run, name="ai-warm-up", daemon=True).start()
+
+    def _run(self):
+        try:
+            from game.ai_agent import AIAgent # ⭐️ 延遲載入 (torch)；只有 PvA 需要
+            agent = AIAgent(self.model_path)
+            agent.select_action([0.0] * agent.input_dim)
+            self.agent = agent
+        except Exception as e:
+            self.error = e
+        self.load_ms = (time.perf_counter() - self.started_at) * 1000.0
+        self.done.set()
+
 class GameplayState(BaseState):
     def __init__(self, game_app):
         super().__init__(game_app)
@@ -30,9 +56,10 @@ class GameplayState(BaseState):
 
         self.game_session_result_state_name = self.game_app.GameFlowStateName.SELECT_GAME_MODE # 預設返回狀態
 
-        # 用於倒數和結果橫幅的臨時解決方案
-        self.font_countdown = None
-        self.font_banner = None
+        # 倒數 / 勝負橫幅 (gameplay_overlays)；不為 None 時不執行 env.step()
+        self.overlay = None
+        self._ai_warm_up = None # PvA：背景載入中的 AI 模型
+        self._bg_music_source = None # 正在串流的背景音樂來源
 
         # 遊戲內的邏輯，例如 freeze timer，現在由 env 管理
         # 但像回合結束後的短暫等待，或遊戲結束後的等待，可能由狀態管理
@@ -41,6 +68,8 @@ class GameplayState(BaseState):
         self.is_round_over_displaying = False
 
         self.game_over_banner_shown = False # 避免重複顯示遊戲結束橫幅
+        self.clears_own_background = True # Renderer 自己維護整個畫面 (髒矩形渲染)
+        self._internal_surface = None # 品質等級降低內部解析度時，Renderer 先畫到這裡再放大到 main_screen
 
     def on_enter(self, previous_state_data=None):
         super().on_enter(previous_state_data) # 這會將 previous_state_data 更新到 self.persistent_data
@@ -95,9 +124,9 @@ class GameplayState(BaseState):
         self.ai_agent = None
 
         if self.current_game_mode == GameSettings.GameMode.PLAYER_VS_AI:
-            # 使用 game_app 傳過來的 config_manager 實例來初始化 LevelManager
+            # 使用 game_app 共用的關卡目錄 (不重新掃描 models/ 與讀 YAML) 來初始化 LevelManager
             levels = LevelManager(config_manager=self.game_app.config_manager,
-                                  models_folder=resource_path("models"))
+                                  models_folder=resource_path("models"), catalog=self.game_app.level_catalog)
             
             # ⭐️ 使用從 persistent_data 傳來的 selected_level_index
             if selected_level_index is not None and 0 <= selected_level_index < len(levels.model_files):
@@ -142,8 +171,8 @@ class GameplayState(BaseState):
             if relative_model_path:
                 absolute_model_path = resource_path(relative_model_path)
                 if os.path.exists(absolute_model_path): 
-                    self.ai_agent = AIAgent(absolute_model_path)
-                    if DEBUG_GAMEPLAY_STATE: print(f"    AI Agent loaded from: {absolute_model_path}")
+                    self._ai_warm_up = _AIWarmUp(absolute_model_path) # 倒數期間在背景載入，倒數結束前接上
+                    if DEBUG_GAMEPLAY_STATE: print(f"    AI Agent loading from: {absolute_model_path}")
                 else: 
                     print(f"[GameplayState] AI model not found at: {absolute_model_path}. AI will be inactive.")
             else:
@@ -180,7 +209,8 @@ class GameplayState(BaseState):
             render_size=render_size_for_env,
             paddle_height_px=paddle_height_for_env,
             ball_radius_px=ball_radius_for_env,
-            initial_main_screen_surface_for_renderer=self.game_app.main_screen
+            initial_main_screen_surface_for_renderer=self.game_app.main_screen,
+            sound_manager=self.game_app.sound_manager
         )
         self.obs, _ = self.env.reset() # reset 會初始化球的位置和速度
         
@@ -198,10 +228,12 @@ class GameplayState(BaseState):
         # 3. 播放背景音樂
         bg_music_to_play = common_game_config.get("bg_music", "bg_music_level1.mp3")
         if hasattr(self.env, 'sound_manager') and self.env.sound_manager and bg_music_to_play:
-            bg_music_path = resource_path(f"assets/{bg_music_to_play}")
-            if os.path.exists(bg_music_path):
+            bg_music_path = f"assets/{bg_music_to_play}"
+            if asset_exists(bg_music_path):
                 try:
-                    pygame.mixer.music.load(bg_music_path)
+                    # 音樂是串流播放，來源 (資源檔中的 file-like 物件) 要一直保留到換下一首
+                    self._bg_music_source = open_asset(bg_music_path)
+                    pygame.mixer.music.load(self._bg_music_source, bg_music_path)
                     pygame.mixer.music.set_volume(GameSettings.BACKGROUND_MUSIC_VOLUME)
                     self.env.sound_manager.play_bg_music() # 使用 env 的 sound_manager 播放
                 except pygame.error as e:
@@ -209,88 +241,55 @@ class GameplayState(BaseState):
             else:
                 if DEBUG_GAMEPLAY_STATE: print(f"[GameplayState] Warning: Music file not found: {bg_music_path}")
 
-        # 4. 遊戲開始倒數
+        # 4. 遊戲開始倒數 (由主迴圈推進；AI 仍在載入時停在最後一秒等待)
         initial_countdown_duration = common_game_config.get('countdown_seconds', GameSettings.COUNTDOWN_SECONDS)
-        if initial_countdown_duration > 0 and self.env and self.env.renderer: # 確保 env 和 renderer 已準備好
+        if initial_countdown_duration > 0 or self._ai_warm_up is not None:
             if DEBUG_GAMEPLAY_STATE: print(f"[GameplayState] Starting initial countdown for {initial_countdown_duration} seconds.")
-            self._show_countdown_internal(initial_countdown_duration) # 這個方法依賴 self.env.renderer
+            self.overlay = CountdownOverlay(initial_countdown_duration,
+                                            on_tick=lambda number: self.env.sound_manager.play_countdown(),
+                                            wait_until=self._poll_ai_warm_up)
 
         self.game_over_banner_shown = False
         self.is_round_over_displaying = False
         if DEBUG_GAMEPLAY_STATE: print(f"[State:Gameplay] on_enter finished successfully.")
 
 
-    def _show_countdown_internal(self, seconds):
-        """內部實現的倒數計時顯示，直接在 main_screen 上繪製。"""
-        # Renderer 已經初始化並設定了 self.env.renderer.window 為 main_screen
-        if not self.env or not self.env.renderer or not self.env.renderer.window:
-            print("[GameplayState._show_countdown_internal] Error: Env or Renderer not ready.")
-            return
-
-        screen_to_draw_on = self.env.renderer.window # 即 self.game_app.main_screen
-        # 倒計時文字大小應基於遊戲內容的縮放因子
-        # Renderer 應該有一個方法或屬性提供遊戲內容的縮放因子和居中渲染區域
-        # 假設 Renderer 有 self.env.renderer.game_content_render_area_on_screen
-        # 和 self.env.renderer.game_content_scale_factor
-        
-        base_font_size = 60
-        scale = getattr(self.env.renderer, 'game_content_scale_factor', 1.0)
-        scaled_font_size = int(base_font_size * scale)
-        if not self.font_countdown or self.font_countdown.get_height() != Style.get_font(scaled_font_size).get_height(): # 避免重複創建相同字體
-            self.font_countdown = Style.get_font(scaled_font_size)
-
-        game_area_center_x, game_area_center_y = screen_to_draw_on.get_width() // 2, screen_to_draw_on.get_height() // 2
-        if hasattr(self.env.renderer, 'game_content_render_area_on_screen'): # 如果Renderer提供了遊戲內容的實際渲染區域
-            game_render_rect = self.env.renderer.game_content_render_area_on_screen
-            game_area_center_x = game_render_rect.centerx
-            game_area_center_y = game_render_rect.centery
-        
-        for i in range(seconds, 0, -1):
-            if hasattr(self.env, 'sound_manager') and self.env.sound_manager:
-                self.env.sound_manager.play_countdown()
-            
-            # 倒數計時的背景應該是當前遊戲畫面的樣子，所以我們先渲染遊戲
-            if self.env: self.env.render() # 這會 flip
-            
-            countdown_surface = self.font_countdown.render(str(i), True, Style.TEXT_COLOR)
-            countdown_rect = countdown_surface.get_rect(center=(game_area_center_x, game_area_center_y))
-            screen_to_draw_on.blit(countdown_surface, countdown_rect) # 直接畫在 env.render() 之後的表面上
-            
-            pygame.display.flip() # 確保倒計時數字更新顯示
-            pygame.time.wait(1000)
-        
-        # 倒數結束後，可能需要再渲染一次乾淨的遊戲畫面
-        if self.env: self.env.render()
-
+    def _poll_ai_warm_up(self):
+        """背景 AI 載入完成時接上 self.ai_agent；回傳 AI 是否已就緒 (沒有要載入的 AI 也算就緒)。"""
+        warm_up = self._ai_warm_up
+        if warm_up is None:
+            return True
+        if not warm_up.done.is_set():
+            return False
+        self._ai_warm_up = None
+        if warm_up.error is not None:
+            print(f"[GameplayState] Failed to load AI model '{warm_up.model_path}': {warm_up.error}. AI will be inactive.")
+        else:
+            self.ai_agent = warm_up.agent
+            if DEBUG_GAMEPLAY_STATE: print(f"[State:Gameplay] AI Agent ready after {warm_up.load_ms:.0f}ms")
+        return True
 
-    def _show_result_banner_internal(self, text, color):
-        """內部實現的結果橫幅顯示。"""
-        if not self.env or not self.env.renderer or not self.env.renderer.window:
-            print("[GameplayState._show_result_banner_internal] Error: Env or Renderer not ready.")
-            return
-        screen_to_draw_on = self.env.renderer.window
-        base_font_size = 40
-        scale = getattr(self.env.renderer, 'game_content_scale_factor', 1.0)
-        scaled_font_size = int(base_font_size * scale)
-        if not self.font_banner or self.font_banner.get_height() != Style.get_font(scaled_font_size).get_height():
-            self.font_banner = Style.get_font(scaled_font_size)
-
-        game_area_center_x, game_area_center_y = screen_to_draw_on.get_width() // 2, screen_to_draw_on.get_height() // 2
-        if hasattr(self.env.renderer, 'game_content_render_area_on_screen'):
-            game_render_rect = self.env.renderer.game_content_render_area_on_screen
-            game_area_center_x = game_render_rect.centerx
-            game_area_center_y = game_render_rect.centery
-
-        # 橫幅顯示前也先渲染遊戲背景
-        if self.env: self.env.render()
-
-        banner_surface = self.font_banner.render(text, True, color)
-        banner_rect = banner_surface.get_rect(center=(game_area_center_x, game_area_center_y))
-        screen_to_draw_on.blit(banner_surface, banner_rect)
-        pygame.display.flip()
-        pygame.time.delay(2000) # 原版是 delay，不是 wait
+    def _show_result_banner(self, text, color):
+        """顯示勝負橫幅 2 秒後返回遊戲模式選擇 (不阻塞主迴圈)。"""
         self.game_over_banner_shown = True
+        self.overlay = ResultBannerOverlay(
+            text, color, duration_ms=2000,
+            on_finish=lambda: self.request_state_change(self.game_app.GameFlowStateName.SELECT_GAME_MODE))
+
+    def _draw_overlay(self):
+        """把覆蓋畫面的文字畫在 Renderer 的畫面上 (遊戲區中央)。"""
+        renderer = self.env.renderer if self.env else None
+        if self.overlay is None or not renderer or not renderer.window:
+            return
+        center = renderer.window.get_rect().center
+        if hasattr(renderer, 'game_content_render_area_on_screen'):
+            center = renderer.game_content_render_area_on_screen.center
+        self.overlay.draw(renderer.window, center, getattr(renderer, 'game_content_scale_factor', 1.0))
+        renderer.invalidate() # 文字直接畫在畫面上，下一次 render 要整個重畫
 
+    def on_config_reloaded(self, changed_files):
+        # 比賽中途不換物理 / 技能參數；下一場 (下一次 on_enter 建立的 PongDuelEnv) 才使用新設定
+        print(f"[GameplayState] Config reloaded ({', '.join(changed_files)}); changes apply from the next match.")
 
     def handle_event(self, event):
         if event.type == pygame.KEYDOWN:
@@ -299,7 +298,13 @@ class GameplayState(BaseState):
                 self.request_state_change(self.game_app.GameFlowStateName.SELECT_GAME_MODE)
         # 遊戲內的按鍵（移動、技能）在 update 方法中通過 pygame.key.get_pressed() 處理
 
-    def update(self, dt): # dt 目前未使用，因為遊戲邏輯是基於幀的
+    def update(self, dt): # dt 只用於倒數 / 橫幅計時；遊戲邏輯是基於幀的
+        if self.overlay is not None:
+            if self.overlay.update(dt * 1000.0):
+                self.overlay = None
+                if self.env and self.env.renderer:
+                    self.env.renderer.invalidate()
+            return # 覆蓋畫面期間不執行遊戲邏輯
         if not self.env or self.game_over_banner_shown : # 如果環境未初始化或遊戲結束橫幅已顯示，則不更新
             return
         
@@ -326,6 +331,10 @@ class GameplayState(BaseState):
             elif keys[P1_GAME_CONTROLS['RIGHT_KB']]: p1_ingame_action = 2
         elif self.current_input_mode == "mouse" and self.current_game_mode == GameSettings.GameMode.PLAYER_VS_AI:
             mouse_x_abs, mouse_y_abs = pygame.mouse.get_pos()
+            if self._internal_surface is not None: # Renderer 的座標是內部解析度
+                internal_w, internal_h = self._internal_surface.get_size()
+                screen_w, screen_h = self.game_app.main_screen.get_size()
+                mouse_x_abs, mouse_y_abs = mouse_x_abs * internal_w / screen_w, mouse_y_abs * internal_h / screen_h
             logical_mouse_x = -1
             if hasattr(self.env.renderer, 'game_area_rect_on_screen') and \
                hasattr(self.env.renderer, 'game_content_scale_factor'):
@@ -370,13 +379,13 @@ class GameplayState(BaseState):
                 
                 if self.env.player1.lives <= 0:
                     if self.env.sound_manager: self.env.sound_manager.play_lose_sound()
-                    self._show_result_banner_internal(p1_loses_msg, Style.AI_COLOR)
+                    self._show_result_banner(p1_loses_msg, Style.AI_COLOR)
                 elif self.env.opponent.lives <= 0:
                     if self.env.sound_manager: self.env.sound_manager.play_win_sound()
-                    self._show_result_banner_internal(p1_wins_msg, Style.PLAYER_COLOR)
-                
-                # 遊戲結束後，請求返回遊戲模式選擇
-                self.request_state_change(self.game_app.GameFlowStateName.SELECT_GAME_MODE)
+                    self._show_result_banner(p1_wins_msg, Style.PLAYER_COLOR)
+                else:
+                    # 遊戲結束後，請求返回遊戲模式選擇 (有橫幅時由橫幅結束後切換)
+                    self.request_state_change(self.game_app.GameFlowStateName.SELECT_GAME_MODE)
                 return # 避免後續的 reset_ball_after_score
             else:
                 # 回合結束，但遊戲未結束，進入短暫停頓
@@ -386,15 +395,66 @@ class GameplayState(BaseState):
                 if DEBUG_GAMEPLAY_STATE: print(f"[State:Gameplay] Round ended, not game over. Scorer: {self.last_scorer}. Displaying round over.")
         # --- 舊 game_session 核心邏輯結束 ---
 
+    def _sync_quality_tier(self):
+        """
+        把上一幀的工作時間交給 QualityGovernor，並套用目前的品質等級。
+        render_scale < 1 時 Renderer 改畫到較小的內部 Surface (需要重建 Renderer，版面依 Surface 大小計算)。
+        """
+        presenter = self.game_app.frame_presenter
+        governor = self.game_app.quality_governor
+        governor.record_frame(presenter.last_work_ms, presenter.frame_budget_ms)
+        tier = governor.tier
+
+        screen = self.game_app.main_screen
+        render_target = screen
+        if tier["render_scale"] < 1.0:
+            internal_size = (max(1, int(screen.get_width() * tier["render_scale"])),
+                             max(1, int(screen.get_height() * tier["render_scale"])))
+            if self._internal_surface is None or self._internal_surface.get_size() != internal_size:
+                self._internal_surface = pygame.Surface(internal_size).convert()
+            render_target = self._internal_surface
+        else:
+            self._internal_surface = None
+
+        if self.env.provided_main_screen_surface is not render_target:
+            if DEBUG_GAMEPLAY_STATE: print(f"[State:Gameplay] Render target -> {render_target.get_size()} for quality tier '{tier['name']}'.")
+            if self.env.renderer:
+                self.env.renderer.close()
+                self.env.renderer = None # 下一次 env.render() 以新的 Surface 重建
+            self.env.provided_main_screen_surface = render_target
+        if self.env.renderer:
+            self.env.renderer.apply_quality_tier(tier)
+        return tier
+
+    def _present_internal_surface(self, tier=None):
+        """內部解析度較低時，把內部 Surface 放大到 main_screen (低品質等級用最近鄰縮放)。"""
+        if self._internal_surface is None:
+            return
+        tier = tier or self.game_app.quality_governor.tier
+        scale = pygame.transform.smoothscale if tier["smooth_scaling"] else pygame.transform.scale
+        scale(self._internal_surface, self.game_app.main_screen.get_size(), self.game_app.main_screen)
+
     def render(self, surface): # surface 就是 self.game_app.main_screen
-        if self.env and self.env.renderer:
-            self.env.render() # PongDuelEnv.render() 內部會調用 Renderer.render()，Renderer 會 flip
+        if self.env:
+            tier = self._sync_quality_tier()
+            self.env.render() # PongDuelEnv.render() 內部會調用 Renderer.render()；flip 由 GameApp 的 FramePresenter 處理
+            if self.env.renderer:
+                self.env.renderer.apply_quality_tier(tier) # Renderer 剛重建時
+            self._draw_overlay()
+            self._present_internal_surface(tier)
         else:
             # 如果 env 還沒準備好，可以畫一個載入畫面或保持背景色
-            # GameApp 的 run() 已經填充了背景色
-            pass 
+            # (clears_own_background 為 True，GameApp 不會幫我們填背景)
+            surface.fill(Style.BACKGROUND_COLOR)
             # if DEBUG_GAMEPLAY_STATE: print("[State:Gameplay] Env or Renderer not ready for rendering.")
 
+    def get_dirty_rects(self):
+        if self._internal_surface is not None or self.overlay is not None:
+            return None # 放大後 / 有覆蓋文字時整個畫面都變了
+        if self.env and self.env.renderer:
+            return self.env.renderer.last_dirty_rects
+        return None
+
     def on_exit(self):
         if DEBUG_GAMEPLAY_STATE: print("[State:Gameplay] Exiting.")
         if self.env:
@@ -402,4 +462,7 @@ class GameplayState(BaseState):
                 self.env.sound_manager.stop_bg_music()
             self.env.close() # 清理 PongDuelEnv 資源
             self.env = None
+        self._internal_surface = None
+        self.overlay = None
+        self._ai_warm_up = None # 仍在載入的話，背景執行緒完成後結果直接丟棄
         return super().on_exit() # 返回 persistent_data
\ No newline at end of file
@@ -1,18 +1,14 @@
 # game/states/level_selection_pva_state.py
 import pygame
-import os
 from game.states.base_state import BaseState
 from game.theme import Style
-from game.level import LevelManager # 需要 LevelManager
-from utils import resource_path     # 需要 resource_path
 
 DEBUG_LEVEL_SELECT_STATE = False
 
 class LevelSelectionPvaState(BaseState):
     def __init__(self, game_app):
         super().__init__(game_app)
-        self.level_manager = LevelManager(config_manager=self.game_app.config_manager,
-                                          models_folder=resource_path("models"))
+        self.level_catalog = self.game_app.level_catalog # ⭐️ 共用的關卡目錄 (game.level_catalog)
         self.level_names = []
         self.display_level_names = []
         self.selected_index = 0
@@ -29,6 +25,17 @@ class LevelSelectionPvaState(BaseState):
 
         if DEBUG_LEVEL_SELECT_STATE: print(f"[State:LevelSelectionPva] Initialized.")
 
+    def _refresh_level_list(self):
+        self.level_names = self.level_catalog.display_names() # models/ 或關卡 YAML 有變動時目錄會自己重建
+        self.display_level_names = [f"{i+1}. {name}" for i, name in enumerate(self.level_names)]
+        self.item_rects = [None] * len(self.level_names)
+
+    def on_config_reloaded(self, changed_files):
+        # 關卡 YAML 變動 (或新增關卡) 時選單立即反映 (config_version 改變，目錄會重建)
+        if any(name.endswith(".yaml") and name != "skills_config.yaml" for name in changed_files):
+            self._refresh_level_list()
+            self.selected_index = min(self.selected_index, max(0, len(self.level_names) - 1))
+
     def on_enter(self, previous_state_data=None):
         super().on_enter(previous_state_data)
 
@@ -39,10 +46,7 @@ class LevelSelectionPvaState(BaseState):
             if DEBUG_LEVEL_SELECT_STATE:
                 print(f"  Received data: mode={self.game_mode_data}, input={self.input_mode_data}, p1_skill={self.p1_skill_data}")
 
-        self.level_names = [os.path.basename(f).replace(".pth", "").replace("level","Level ") for f in self.level_manager.model_files]
-        self.display_level_names = [f"{i+1}. {name}" for i, name in enumerate(self.level_names)]
-        
-        self.item_rects = [None] * len(self.level_names)
+        self._refresh_level_list()
         self.selected_index = 0
 
         scaled_title_font_size = int(Style.TITLE_FONT_SIZE * self.scale_factor)
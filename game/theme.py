@@ -1,8 +1,65 @@
 # game/theme.py
 
 import pygame
+from collections import OrderedDict
 from game.settings import GameSettings # GameSettings 會在運行時被 GameApp 初始化
-from utils import resource_path
+from game.asset_archive import open_asset
+from game.sprite_cache import SPRITE_CACHE
+
+DEBUG_FONT_CACHE = False
+
+# --- Font / text surface caches ---
+# ⭐️ pygame.font.Font(...) 每次都會重新開檔解析字型，font.render(...) 每次都會重新點陣化。
+#    HUD 每幀都會用同樣的 (字型, 大小) 畫同樣的字，所以兩者都快取起來。
+#    主題切換時由 reload_active_style() 清空。
+_FONT_CACHE = OrderedDict() # (font_path or None, size) -> pygame.font.Font，LRU
+FONT_CACHE_MAX_ENTRIES = 32 # 字型大小依 scale_factor 計算，視窗 / 內部解析度改變時會產生新的大小
+TEXT_SURFACE_CACHE_MAX_ENTRIES = 256
+
+def get_cached_font(font_path, size):
+    key = (font_path, size)
+    font = _FONT_CACHE.get(key)
+    if font is not None:
+        _FONT_CACHE.move_to_end(key)
+        return font
+    font = pygame.font.Font(open_asset(font_path) if font_path else None, size)
+    _FONT_CACHE[key] = font
+    if len(_FONT_CACHE) > FONT_CACHE_MAX_ENTRIES:
+        _FONT_CACHE.popitem(last=False)
+    if DEBUG_FONT_CACHE: print(f"[theme.get_cached_font] Loaded font {key} (cached fonts: {len(_FONT_CACHE)})")
+    return font
+
+class TextSurfaceCache:
+    """(字型路徑, 文字, 大小, 顏色, antialias) -> 已渲染 Surface 的 LRU 快取。回傳的 Surface 是共用的，呼叫端不要修改它。"""
+    def __init__(self, max_entries=TEXT_SURFACE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font_path, text, size, color, antialias=True):
+        key = (font_path, text, size, tuple(color), antialias)
+        surface = self._entries.get(key)
+        if surface is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = get_cached_font(font_path, size).render(text, antialias, color)
+        self._entries[key] = surface
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self._entries.clear()
+
+TEXT_SURFACE_CACHE = TextSurfaceCache()
+
+def clear_font_caches():
+    _FONT_CACHE.clear()
+    TEXT_SURFACE_CACHE.clear()
+    if DEBUG_FONT_CACHE: print("[theme.clear_font_caches] Font and text surface caches cleared.")
 
 # --- Theme definitions ---
 class Theme:
@@ -20,7 +77,7 @@ class Theme:
         self.FONT_PATH = font_path # 這個 FONT_PATH 將被修改
 
     def get_font(self, size):
-        return pygame.font.Font(resource_path(self.FONT_PATH), size)
+        return get_cached_font(self.FONT_PATH, size)
 
 NEW_FONT_PATH = 'assets/PressStart2P.ttf' # 定義新的字體路徑
 
@@ -175,10 +232,18 @@ class Style:
             return ACTIVE_THEME.get_font(size)
         else:
             print("[Style.get_font] WARNING: ACTIVE_THEME not set or FONT_PATH missing. Using default Pygame font.")
-            return pygame.font.Font(None, size)
+            return get_cached_font(None, size)
+
+    @staticmethod
+    def render_text(text, size, color, antialias=True):
+        """用目前主題字型渲染文字 (經過 LRU 快取)。回傳的 Surface 為共用物件，需要 set_alpha 等修改時請先 copy()。"""
+        font_path = ACTIVE_THEME.FONT_PATH if ACTIVE_THEME else None
+        return TEXT_SURFACE_CACHE.render(font_path, text, size, color, antialias)
 
 def reload_active_style():
     global ACTIVE_THEME
+    clear_font_caches() # 主題 (字型) 可能改變，舊的字型與文字 Surface 全部作廢
+    SPRITE_CACHE.clear() # 主題顏色可能改變，特效 sprite 也一併作廢
     active_theme_name_from_settings = GameSettings.ACTIVE_THEME_NAME
     if active_theme_name_from_settings not in ALL_THEMES:
         print(f"[theme.py] WARNING: Theme '{active_theme_name_from_settings}' not found in ALL_THEMES. Defaulting to 'Retro Arcade'.")
@@ -1,16 +1,24 @@
 # main.py
+import time
+_MAIN_START_EPOCH = time.time() # ⭐️ 啟動時間基準 (--benchmark-run 以此計算 first_menu_frame 等時間)
 
 import pygame
 import sys
-import time
+import importlib
+import argparse
 from enum import Enum
 
 # 遊戲內部模組
 from game.theme import Style
 from game.settings import GameSettings # GameSettings 也需要被 menu_states 訪問
 from game.sound import SoundManager
+from game.asset_manager import asset_manager, default_preload_manifest
 from utils import resource_path
 from game.config_manager import ConfigManager # <--- 新增這一行
+from game.level_catalog import LevelCatalog
+from game.frame_presenter import FramePresenter
+from game.quality_governor import QualityGovernor
+from game.startup import start_background_preload
 
 # 引入狀態
 from game.states.base_state import BaseState
@@ -38,10 +46,20 @@ class GameApp:
         if DEBUG_GAME_APP: print(f"[GameApp] ConfigManager instance created.")
         GameSettings._config_manager = self.config_manager # <--- 新增：將實例賦值給 GameSettings
         if DEBUG_GAME_APP: print(f"[GameApp] ConfigManager passed to GameSettings.")
+        # ⭐️ 關卡目錄 (模型路徑 / YAML / 難度 / 雜湊)：選單與 GameplayState 共用，models/ 沒變動時不重新掃描
+        self.level_catalog = LevelCatalog(self.config_manager)
+        self.config_watcher = None
+        if GameSettings.CONFIG_HOT_RELOAD and not getattr(sys, "frozen", False): # ⭐️ 調整數值時不必重開遊戲
+            from game.config_watcher import ConfigWatcher
+            self.config_watcher = ConfigWatcher.from_settings(self.config_manager).start()
 
         self.sound_manager = SoundManager()
-        self.clock = pygame.time.Clock()
+        # ⭐️ mixer 已初始化：背景解碼音效 / 圖片 (SoundManager、技能、Renderer 共用同一份)
+        asset_manager.preload(*default_preload_manifest(self.config_manager.get_config_snapshot()))
+        self.frame_presenter = FramePresenter() # ⭐️ 唯一負責 flip 與幀率節拍的物件
+        self.quality_governor = QualityGovernor.from_settings() # ⭐️ 依幀時間調整遊戲畫面品質 (GameplayState 使用)
         self.running = True
+        self.benchmark_driver = None # ⭐️ --benchmark-run 時由 game.benchmark_driver 以腳本輸入驅動
 
         try:
             screen_info = pygame.display.Info()
@@ -53,7 +71,7 @@ class GameApp:
             self.ACTUAL_SCREEN_WIDTH, self.ACTUAL_SCREEN_HEIGHT = 1280, 720
 
         try:
-            self.main_screen = pygame.display.set_mode(
+            self.main_screen = self.frame_presenter.set_display_mode(
                 (self.ACTUAL_SCREEN_WIDTH, self.ACTUAL_SCREEN_HEIGHT),
                 pygame.FULLSCREEN
             )
@@ -91,27 +109,34 @@ class GameApp:
             "p2_selected_skill": None,
         }
         
-        self._register_states()
         self.change_state(GameFlowStateName.SELECT_GAME_MODE)
-
-    def _register_states(self):
-        from game.states.select_game_mode_state import SelectGameModeState
-        from game.states.select_input_pva_state import SelectInputPvaState
-        from game.states.select_skill_pva_state import SelectSkillPvaState
-        from game.states.level_selection_pva_state import LevelSelectionPvaState
-        from game.states.run_pvp_skill_selection_state import RunPvpSkillSelectionState
-        from game.states.gameplay_state import GameplayState
-        from game.states.settings_menu_state import SettingsMenuState          # <-- 導入新狀態
-        from game.states.theme_selection_state import ThemeSelectionState      # <-- 導入新狀態
-
-        self.states[GameFlowStateName.SELECT_GAME_MODE] = SelectGameModeState(self)
-        self.states[GameFlowStateName.SELECT_INPUT_PVA] = SelectInputPvaState(self)
-        self.states[GameFlowStateName.SELECT_SKILL_PVA] = SelectSkillPvaState(self)
-        self.states[GameFlowStateName.SELECT_LEVEL_PVA] = LevelSelectionPvaState(self)
-        self.states[GameFlowStateName.RUN_PVP_SKILL_SELECTION] = RunPvpSkillSelectionState(self)
-        self.states[GameFlowStateName.GAMEPLAY] = GameplayState(self)
-        self.states[GameFlowStateName.SETTINGS_MENU] = SettingsMenuState(self)          # <-- 註冊新狀態
-        self.states[GameFlowStateName.THEME_SELECTION] = ThemeSelectionState(self)      # <-- 註冊新狀態
+        # 標題畫面已經可以顯示；進入遊戲才需要的模組 (env / renderer / torch) 在背景先 import
+        start_background_preload()
+
+    # ⭐️ 狀態延遲載入：(模組, 類別名稱)。標題畫面只需要 SelectGameModeState，
+    # 其他狀態 (尤其 GameplayState → env / renderer / 技能 / torch) 第一次切換過去時才 import 並建構。
+    _STATE_CLASSES = {
+        GameFlowStateName.SELECT_GAME_MODE: ("game.states.select_game_mode_state", "SelectGameModeState"),
+        GameFlowStateName.SELECT_INPUT_PVA: ("game.states.select_input_pva_state", "SelectInputPvaState"),
+        GameFlowStateName.SELECT_SKILL_PVA: ("game.states.select_skill_pva_state", "SelectSkillPvaState"),
+        GameFlowStateName.SELECT_LEVEL_PVA: ("game.states.level_selection_pva_state", "LevelSelectionPvaState"),
+        GameFlowStateName.RUN_PVP_SKILL_SELECTION: ("game.states.run_pvp_skill_selection_state", "RunPvpSkillSelectionState"),
+        GameFlowStateName.GAMEPLAY: ("game.states.gameplay_state", "GameplayState"),
+        GameFlowStateName.SETTINGS_MENU: ("game.states.settings_menu_state", "SettingsMenuState"),
+        GameFlowStateName.THEME_SELECTION: ("game.states.theme_selection_state", "ThemeSelectionState"),
+    }
+
+    def _get_state(self, state_name_enum):
+        """回傳狀態物件；第一次使用時才 import 模組並建構 (之後沿用同一個實例)。"""
+        state_object = self.states.get(state_name_enum)
+        if state_object is None:
+            module_name, class_name = self._STATE_CLASSES[state_name_enum]
+            t0 = time.perf_counter()
+            state_class = getattr(importlib.import_module(module_name), class_name)
+            state_object = state_class(self)
+            self.states[state_name_enum] = state_object
+            if DEBUG_GAME_APP: print(f"[GameApp] Loaded state {state_name_enum.name} in {(time.perf_counter() - t0) * 1000:.1f}ms")
+        return state_object
 
     def _calculate_and_set_render_context(self, state_object, state_name_enum):
         """為指定的狀態物件計算並設定 scale_factor 和 render_area。"""
@@ -168,9 +193,9 @@ class GameApp:
             if DEBUG_GAME_APP: print(f"[GameApp] Changing state to: QUIT")
             return
 
-        if next_state_name_enum in self.states:
+        if next_state_name_enum in self._STATE_CLASSES:
             self.current_state_name = next_state_name_enum
-            next_state_object = self.states[next_state_name_enum] # 先獲取下一個狀態物件
+            next_state_object = self._get_state(next_state_name_enum) # 先獲取下一個狀態物件 (第一次使用時才載入)
             self.current_state_debug_name = next_state_name_enum.name
             
             # ⭐️ 在調用 on_enter 之前，為新狀態計算並設定其渲染上下文
@@ -185,7 +210,9 @@ class GameApp:
 
     def run(self):
         while self.running:
-            dt = self.clock.tick(60) / 1000.0 
+            dt = self.frame_presenter.begin_frame()
+            if self.benchmark_driver:
+                self.benchmark_driver.before_frame()
 
             events = pygame.event.get()
             for event in events:
@@ -196,6 +223,11 @@ class GameApp:
 
             if not self.running: break 
 
+            if self.config_watcher:
+                changed_files = self.config_watcher.apply_pending()
+                if changed_files and self.current_state_object:
+                    self.current_state_object.on_config_reloaded(changed_files)
+
             if self.current_state_object:
                 self.current_state_object.update(dt)
 
@@ -220,12 +252,15 @@ class GameApp:
                 # ‼️‼️ 且 render 依賴 on_enter 初始化的字體，所以這裡不需要再為當前狀態重新賦值 self.scale_factor/render_area
                 # ‼️‼️ 除非狀態的邏輯尺寸可以在運行時改變（目前我們的選單不會）。
 
-                self.main_screen.fill(Style.BACKGROUND_COLOR) 
+                if not self.current_state_object.clears_own_background:
+                    self.main_screen.fill(Style.BACKGROUND_COLOR) 
                 self.current_state_object.render(self.main_screen) 
             
-            pygame.display.flip()
+            self.frame_presenter.present(self.current_state_object.get_dirty_rects() if self.current_state_object else None)
+            if self.benchmark_driver:
+                self.benchmark_driver.after_present()
 
-        if DEBUG_GAME_APP: print("[GameApp] Exiting game loop.")
+        if DEBUG_GAME_APP: print(f"[GameApp] Exiting game loop. Frame stats: {self.frame_presenter.format_stats()}")
         pygame.quit()
         sys.exit()
 
@@ -234,5 +269,24 @@ if __name__ == '__main__':
     # 確保 GameApp 可以訪問 GameFlowStateName 枚舉
     # 可以通過將 GameFlowStateName 定義在 GameApp 外部或作為 GameApp 的類屬性來實現
     # 在這裡，GameApp 內部創建了一個實例屬性 self.GameFlowStateName
+    parser = argparse.ArgumentParser(description="Pong Soul")
+    parser.add_argument("--profile-imports", action="store_true",
+                        help="print an import-time profile (startup path vs. deferred gameplay modules) and exit")
+    parser.add_argument("--top", type=int, default=15, help="rows per section for --profile-imports")
+    parser.add_argument("--benchmark-run", action="store_true",
+                        help="drive mode select -> level select -> gameplay with scripted input, record timings and exit "
+                             "(see benchmarks/startup_benchmark.py)")
+    parser.add_argument("--benchmark-output", default=None, help="JSON file for --benchmark-run (default: stdout)")
+    parser.add_argument("--benchmark-frames", type=int, default=300, help="steady-state gameplay frames for --benchmark-run")
+    args = parser.parse_args()
+    if args.profile_imports:
+        from game.startup import print_import_profile
+        print_import_profile(top_n=args.top)
+        sys.exit(0)
+
     game = GameApp()
+    if args.benchmark_run:
+        from game.benchmark_driver import BenchmarkDriver
+        game.benchmark_driver = BenchmarkDriver(game, _MAIN_START_EPOCH, output_path=args.benchmark_output,
+                                                gameplay_frames=args.benchmark_frames)
     game.run()
\ No newline at end of file
@@ -0,0 +1,174 @@
+# pong-soul/rl_training/checkpoint.py
+"""
+訓練用的完整 checkpoint：模型、目標網路、optimizer、replay buffer、epsilon、
+回合數與所有 RNG 狀態。
+
+目錄結構 (每個 checkpoint 一個資料夾，命名沿用 bug_models/bug_agent_epNNNN 的風格)：
+
+    checkpoints/bug_agent_ep1200/
+        agent.pth            # 含 model_state_dict，可直接給 AIAgent 載入
+        replay_state.npy ... # replay buffer 各欄位，resume 時以 mmap 讀取
+
+寫入流程：
+    - 主執行緒只負責拍快照 (複製到 CPU / numpy)，真正的寫檔由背景執行緒完成。
+    - 先寫到 <name>.tmp 資料夾，全部寫完後 os.replace 成正式名稱 (atomic)，
+      中途被中斷也不會留下半套 checkpoint。
+    - 只保留最近 keep_last 個 checkpoint。
+"""
+import os
+import re
+import queue
+import random
+import shutil
+import threading
+
+import numpy as np
+import torch
+
+DEBUG_CHECKPOINT = False
+
+AGENT_FILENAME = "agent.pth"
+REPLAY_PREFIX = "replay_"
+
+
+class TrainingCheckpointer:
+    def __init__(self, checkpoint_dir, prefix="bug_agent", keep_last=5):
+        self.checkpoint_dir = checkpoint_dir
+        self.prefix = prefix
+        self.keep_last = max(1, int(keep_last))
+        self._dir_pattern = re.compile(rf"^{re.escape(prefix)}_ep(\d+)$")
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+
+        # maxsize=1：上一份還沒寫完時，下一次 save 會在這裡等 (避免快照無限堆積吃記憶體)
+        self._queue = queue.Queue(maxsize=1)
+        self._last_error = None
+        self._worker = threading.Thread(target=self._worker_loop, name="CheckpointWriter", daemon=True)
+        self._worker.start()
+
+    # ------------------------------------------------------------------
+    # 快照 / 還原
+    # ------------------------------------------------------------------
+    @staticmethod
+    def capture_rng_state():
+        rng = {
+            'python': random.getstate(),
+            'numpy': np.random.get_state(),
+            'torch': torch.get_rng_state(),
+        }
+        if torch.cuda.is_available():
+            rng['torch_cuda'] = torch.cuda.get_rng_state_all()
+        return rng
+
+    @staticmethod
+    def restore_rng_state(rng):
+        if not rng:
+            return
+        random.setstate(rng['python'])
+        np.random.set_state(rng['numpy'])
+        torch.set_rng_state(rng['torch'])
+        if 'torch_cuda' in rng and torch.cuda.is_available():
+            try:
+                torch.cuda.set_rng_state_all(rng['torch_cuda'])
+            except Exception as e:
+                print(f"[TrainingCheckpointer] Warning: could not restore CUDA RNG state: {e}")
+
+    def save(self, agent, episode, eps, extra=None):
+        """在主執行緒拍快照後交給背景執行緒寫檔；不等待寫入完成。"""
+        if self._last_error is not None:
+            print(f"[TrainingCheckpointer] Warning: previous checkpoint write failed: {self._last_error}")
+            self._last_error = None
+
+        payload = agent.get_training_state()
+        payload['episode'] = int(episode)
+        payload['eps'] = float(eps)
+        payload['rng_state'] = self.capture_rng_state()
+        if extra:
+            payload['extra'] = extra
+        replay_arrays = agent.memory.to_arrays()
+
+        name = f"{self.prefix}_ep{int(episode)}"
+        self._queue.put((name, payload, replay_arrays))
+        if DEBUG_CHECKPOINT:
+            print(f"[TrainingCheckpointer.save] Queued '{name}' ({len(agent.memory)} transitions).")
+        return os.path.join(self.checkpoint_dir, name)
+
+    def load_latest(self, agent):
+        """
+        載入最新的 checkpoint 並還原 agent 與 RNG。
+        回傳 (episode, eps, extra)；找不到 checkpoint 時回傳 None。
+        """
+        existing = self._list_checkpoints()
+        if not existing:
+            print(f"[TrainingCheckpointer] No checkpoint found in {self.checkpoint_dir}")
+            return None
+        _, name = existing[-1]
+        path = os.path.join(self.checkpoint_dir, name)
+
+        payload = torch.load(os.path.join(path, AGENT_FILENAME), map_location=agent.device, weights_only=False)
+        agent.load_training_state(payload)
+
+        replay_arrays = {}
+        for filename in os.listdir(path):
+            if filename.startswith(REPLAY_PREFIX) and filename.endswith(".npy"):
+                field = filename[len(REPLAY_PREFIX):-len(".npy")]
+                replay_arrays[field] = np.load(os.path.join(path, filename), mmap_mode='r')
+        agent.memory.load_arrays(replay_arrays)
+        del replay_arrays # 釋放 mmap
+
+        self.restore_rng_state(payload.get('rng_state'))
+        print(f"[TrainingCheckpointer] Resumed from {path} (episode {payload['episode']}, eps {payload['eps']:.3f}, replay {len(agent.memory)})")
+        return payload['episode'], payload['eps'], payload.get('extra')
+
+    def wait(self):
+        """等待所有排隊中的 checkpoint 寫完 (訓練結束前呼叫)。"""
+        self._queue.join()
+        if self._last_error is not None:
+            print(f"[TrainingCheckpointer] Warning: checkpoint write failed: {self._last_error}")
+            self._last_error = None
+
+    # ------------------------------------------------------------------
+    # 背景寫檔
+    # ------------------------------------------------------------------
+    def _worker_loop(self):
+        while True:
+            name, payload, replay_arrays = self._queue.get()
+            try:
+                self._write_checkpoint(name, payload, replay_arrays)
+                self._apply_retention()
+            except Exception as e:
+                self._last_error = e
+            finally:
+                self._queue.task_done()
+
+    def _write_checkpoint(self, name, payload, replay_arrays):
+        final_path = os.path.join(self.checkpoint_dir, name)
+        tmp_path = final_path + ".tmp"
+        if os.path.exists(tmp_path):
+            shutil.rmtree(tmp_path)
+        os.makedirs(tmp_path)
+
+        torch.save(payload, os.path.join(tmp_path, AGENT_FILENAME))
+        for field, array in replay_arrays.items():
+            np.save(os.path.join(tmp_path, f"{REPLAY_PREFIX}{field}.npy"), array)
+
+        if os.path.exists(final_path):
+            shutil.rmtree(final_path)
+        os.replace(tmp_path, final_path)
+        if DEBUG_CHECKPOINT:
+            print(f"[TrainingCheckpointer._write_checkpoint] Wrote {final_path}")
+
+    def _list_checkpoints(self):
+        found = []
+        for entry in os.listdir(self.checkpoint_dir):
+            match = self._dir_pattern.match(entry)
+            if match and os.path.isfile(os.path.join(self.checkpoint_dir, entry, AGENT_FILENAME)):
+                found.append((int(match.group(1)), entry))
+        found.sort()
+        return found
+
+    def _apply_retention(self):
+        existing = self._list_checkpoints()
+        for _, name in existing[:-self.keep_last]:
+            shutil.rmtree(os.path.join(self.checkpoint_dir, name), ignore_errors=True)
+            if DEBUG_CHECKPOINT:
+                print(f"[TrainingCheckpointer._apply_retention] Removed old checkpoint {name}")
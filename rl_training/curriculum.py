@@ -0,0 +1,158 @@
+# pong-soul/rl_training/curriculum.py
+"""
+由關卡 YAML (models/levelN.yaml) 驅動的訓練難度 curriculum。
+
+CurriculumScheduler 維護一個「關卡參數組」的混合分佈：
+    - 目前階段 (stage) 的關卡佔大部分 (focus_weight)
+    - 已經通過的較簡單關卡保留一點比例複習 (review_weight)
+    - 下一個較難的關卡先少量預習 (lookahead_weight)
+當目前階段關卡的滾動勝率超過 promote_threshold 就升級到下一階段；
+低於 demote_threshold 則退回一階。
+
+支援向量化 (多個平行) 環境：每個 env slot 各自抽一個關卡，同一個 batch 中
+不同 env 可以跑在不同難度。結果用 report(env_index, won) 回報，會記到該 env
+當下被指派的關卡上。
+"""
+import os
+import re
+import random
+from collections import deque
+
+DEBUG_CURRICULUM = False
+
+
+def _level_sort_key(filename):
+    """level1 < level2 < ... < level-impossible (沒有數字的視為最難)。"""
+    match = re.search(r"(\d+)", filename)
+    return (0, int(match.group(1)), filename) if match else (1, 0, filename)
+
+
+def load_level_parameter_sets(config_manager, models_folder):
+    """
+    讀取 models_folder 中所有關卡 YAML，回傳依難度排序的 [(level_name, config_dict), ...]。
+    config_manager 需提供 get_level_config(yaml_filename)。
+    """
+    yaml_files = sorted((f for f in os.listdir(models_folder) if f.endswith(".yaml")), key=_level_sort_key)
+    parameter_sets = []
+    for yaml_filename in yaml_files:
+        cfg = config_manager.get_level_config(yaml_filename)
+        if cfg:
+            parameter_sets.append((os.path.splitext(yaml_filename)[0], dict(cfg)))
+        else:
+            print(f"[Curriculum] Warning: could not load level config '{yaml_filename}', skipped.")
+    return parameter_sets
+
+
+def level_to_bug_env_config(level_cfg, default_paddle_width_px=60):
+    """
+    把關卡參數換算成 BugSkillTrainingEnv 用的難度設定。
+    遊戲中噬魂蟲的目標是 AI 的板子，所以：
+        - target_paddle_width_px : 關卡的 ai_paddle_width (板子越寬越難繞過)
+        - target_track_speed     : 目標板子每步追蹤蟲的速度，取關卡的 initial_speed
+                                   (球速越快的關卡，AI 板子反應也越快)
+    """
+    return {
+        'target_paddle_width_px': int(level_cfg.get('ai_paddle_width', default_paddle_width_px)),
+        'target_track_speed': float(level_cfg.get('initial_speed', 0.0)),
+    }
+
+
+class CurriculumScheduler:
+    def __init__(self, parameter_sets, num_envs=1,
+                 promote_threshold=0.7, demote_threshold=0.2, window=200, min_episodes=100,
+                 focus_weight=0.7, review_weight=0.2, lookahead_weight=0.1, seed=None):
+        if not parameter_sets:
+            raise ValueError("CurriculumScheduler needs at least one parameter set.")
+        self.parameter_sets = list(parameter_sets)
+        self.promote_threshold = promote_threshold
+        self.demote_threshold = demote_threshold
+        self.min_episodes = min_episodes
+        self.focus_weight = focus_weight
+        self.review_weight = review_weight
+        self.lookahead_weight = lookahead_weight
+        self.rng = random.Random(seed)
+
+        self.stage = 0
+        self.results = [deque(maxlen=window) for _ in self.parameter_sets] # 每個關卡各自的滾動結果
+        self.env_assignments = [None] * num_envs
+        self._weights = self._compute_weights()
+
+    # ------------------------------------------------------------------
+    # 混合分佈
+    # ------------------------------------------------------------------
+    def _compute_weights(self):
+        n = len(self.parameter_sets)
+        weights = [0.0] * n
+        weights[self.stage] += self.focus_weight
+        if self.stage > 0:
+            for i in range(self.stage):
+                weights[i] += self.review_weight / self.stage
+        else:
+            weights[self.stage] += self.review_weight
+        if self.stage + 1 < n:
+            weights[self.stage + 1] += self.lookahead_weight
+        else:
+            weights[self.stage] += self.lookahead_weight
+        total = sum(weights)
+        return [w / total for w in weights]
+
+    def get_mixture(self):
+        return {name: w for (name, _), w in zip(self.parameter_sets, self._weights)}
+
+    def sample_level_index(self):
+        return self.rng.choices(range(len(self.parameter_sets)), weights=self._weights, k=1)[0]
+
+    # ------------------------------------------------------------------
+    # 向量化環境介面
+    # ------------------------------------------------------------------
+    def assign(self, env_index=0):
+        """幫 env_index 抽一個新的關卡，回傳 (level_name, config_dict)。"""
+        level_index = self.sample_level_index()
+        self.env_assignments[env_index] = level_index
+        return self.parameter_sets[level_index]
+
+    def assign_batch(self):
+        """幫所有 env slot 各抽一個關卡 (同一個 batch 內可以不同)。"""
+        return [self.assign(i) for i in range(len(self.env_assignments))]
+
+    def report(self, env_index, won):
+        """回報 env_index 上一個回合的結果，必要時調整 stage。回傳 stage 是否改變。"""
+        level_index = self.env_assignments[env_index]
+        if level_index is None:
+            return False
+        self.results[level_index].append(1.0 if won else 0.0)
+        return self._maybe_change_stage()
+
+    def _maybe_change_stage(self):
+        current = self.results[self.stage]
+        if len(current) < self.min_episodes:
+            return False
+        win_rate = sum(current) / len(current)
+        old_stage = self.stage
+        if win_rate >= self.promote_threshold and self.stage + 1 < len(self.parameter_sets):
+            self.stage += 1
+        elif win_rate <= self.demote_threshold and self.stage > 0:
+            self.stage -= 1
+        if self.stage == old_stage:
+            return False
+        self.results[self.stage].clear() # 新階段重新累積滾動勝率
+        self._weights = self._compute_weights()
+        print(f"[Curriculum] Stage {old_stage} -> {self.stage} "
+              f"({self.parameter_sets[old_stage][0]} win rate {win_rate:.2f}); now focusing '{self.parameter_sets[self.stage][0]}'")
+        return True
+
+    def rolling_win_rates(self):
+        return {name: (sum(r) / len(r) if r else None) for (name, _), r in zip(self.parameter_sets, self.results)}
+
+    # checkpoint 用
+    def state_dict(self):
+        return {'stage': self.stage, 'results': [list(r) for r in self.results], 'rng': self.rng.getstate()}
+
+    def load_state_dict(self, state):
+        self.stage = min(state.get('stage', 0), len(self.parameter_sets) - 1)
+        for r, saved in zip(self.results, state.get('results', [])):
+            r.clear()
+            r.extend(saved)
+        if 'rng' in state:
+            self.rng.setstate(state['rng'])
+        self._weights = self._compute_weights()
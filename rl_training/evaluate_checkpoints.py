@@ -0,0 +1,350 @@
+# pong-soul/rl_training/evaluate_checkpoints.py
+"""
+所有 checkpoint 的離線評估與排行榜。
+
+    python rl_training/evaluate_checkpoints.py --episodes 200 --workers 4
+
+評估對象：
+    - bug_models/*.pth   : 噬魂蟲 RL agent (input 6 / output 5)，在 BugSkillTrainingEnv 中跑
+    - models/*.pth       : 關卡 AI (input 7 / output 3)，用對應的 levelN.yaml 在 PongDuelEnv
+                           中與固定的「追球」腳本玩家對戰
+
+每個 checkpoint 在獨立的 worker process 中以 headless (SDL dummy driver) 執行，
+pygame.time.get_ticks 被換成固定步長的模擬時鐘，加上固定的 seed，結果可重現。
+結果以 checkpoint 檔案的 sha256 (加上評估參數) 作為 key 快取，只有新的 / 變更過的
+checkpoint 才會重新評估。輸出 leaderboard.csv / leaderboard.json。
+"""
+import os
+import sys
+import csv
+import json
+import math
+import time
+import random
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+DEBUG_EVAL = False
+
+EVAL_VERSION = 1 # 評估邏輯改變時遞增，讓舊快取失效
+FRAME_MS = 1000.0 / 60.0 # 模擬時鐘每步前進的時間 (與遊戲 60 FPS 一致)
+
+BUG_OUTCOMES = ('scored', 'hit_paddle', 'duration_expired', 'step_limit')
+LEVEL_OUTCOMES = ('ai_won', 'ai_lost', 'step_limit')
+
+
+class DeterministicClock:
+    """取代 pygame.time.get_ticks 的模擬時鐘；每個環境步只前進固定的 FRAME_MS。"""
+    def __init__(self, frame_ms=FRAME_MS):
+        self.frame_ms = frame_ms
+        self.now_ms = 0.0
+
+    def get_ticks(self):
+        return int(self.now_ms)
+
+    def advance(self, frames=1):
+        self.now_ms += self.frame_ms * frames
+
+    def install(self):
+        import pygame
+        pygame.time.get_ticks = self.get_ticks
+        return self
+
+
+# ----------------------------------------------------------------------
+# 統計
+# ----------------------------------------------------------------------
+def wilson_interval(successes, n, z=1.96):
+    if n <= 0:
+        return 0.0, 0.0
+    p = successes / n
+    denom = 1.0 + z * z / n
+    centre = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+def mean_interval(values, z=1.96):
+    n = len(values)
+    if n == 0:
+        return 0.0, 0.0, 0.0
+    mean = sum(values) / n
+    if n == 1:
+        return mean, mean, mean
+    var = sum((v - mean) ** 2 for v in values) / (n - 1)
+    half = z * math.sqrt(var / n)
+    return mean, mean - half, mean + half
+
+
+def summarize(outcomes, lengths, outcome_names, success_key):
+    n = len(outcomes)
+    summary = {'episodes': n}
+    for name in outcome_names:
+        count = sum(1 for o in outcomes if o == name)
+        lo, hi = wilson_interval(count, n)
+        summary[f'{name}_rate'] = count / n if n else 0.0
+        summary[f'{name}_ci_low'] = lo
+        summary[f'{name}_ci_high'] = hi
+    summary['success_rate'] = summary[f'{success_key}_rate']
+    summary['success_ci_low'] = summary[f'{success_key}_ci_low']
+    summary['success_ci_high'] = summary[f'{success_key}_ci_high']
+    mean, lo, hi = mean_interval(lengths)
+    summary['mean_length'] = mean
+    summary['length_ci_low'] = lo
+    summary['length_ci_high'] = hi
+    return summary
+
+
+# ----------------------------------------------------------------------
+# Worker (在子 process 中執行)
+# ----------------------------------------------------------------------
+def _init_worker(verbose):
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    if not verbose:
+        sys.stdout = open(os.devnull, "w")
+
+
+def _seed_everything(seed):
+    import numpy as np
+    import torch
+    random.seed(seed)
+    np.random.seed(seed)
+    torch.manual_seed(seed)
+
+
+def _evaluate_bug_checkpoint(path, episodes, base_seed, max_steps):
+    import pygame
+    import numpy as np
+    import game.skills.soul_eater_bug_skill as bug_skill_module
+    from game.ai_agent import AIAgent
+    from rl_training.train_bug_rl import BugSkillTrainingEnv
+
+    bug_skill_module.DEBUG_BUG_SKILL = False
+    pygame.init()
+    clock = DeterministicClock().install()
+
+    agent = AIAgent(path, input_dim=6, output_dim=5)
+    env = BugSkillTrainingEnv(render_training=False)
+
+    outcomes, lengths = [], []
+    for episode in range(episodes):
+        _seed_everything(base_seed + episode)
+        rng = np.random.RandomState(base_seed + episode)
+        bug_start = (float(rng.uniform(0.1, 0.9)), float(rng.uniform(0.5, 0.9)))
+        state = env.reset(bug_start=bug_start)
+        outcome = 'step_limit'
+        steps = 0
+        for steps in range(1, max_steps + 1):
+            clock.advance()
+            action = agent.select_action(state)
+            state, _, done, info = env.step(action)
+            if done:
+                outcome = info.get('result', 'duration_expired')
+                break
+        outcomes.append(outcome)
+        lengths.append(steps)
+    pygame.quit()
+    return summarize(outcomes, lengths, BUG_OUTCOMES, success_key='scored')
+
+
+def _scripted_tracker_action(env, deadzone=0.02):
+    """固定的對手腳本：球朝自己飛來時追球的 x，否則回到中間。0 左 / 1 不動 / 2 右。"""
+    target_x = env.ball_x if env.ball_vy > 0 else 0.5
+    if env.player1.x < target_x - deadzone:
+        return 2
+    if env.player1.x > target_x + deadzone:
+        return 0
+    return 1
+
+
+def _evaluate_level_checkpoint(path, episodes, base_seed, max_steps):
+    import pygame
+    from game.ai_agent import AIAgent
+    from game.config_manager import ConfigManager
+    from game.settings import GameSettings
+    from envs.pong_duel_env import PongDuelEnv
+
+    pygame.init()
+    clock = DeterministicClock().install()
+
+    config_manager = ConfigManager()
+    GameSettings._config_manager = config_manager
+    level_config = config_manager.get_level_config(os.path.basename(path).replace(".pth", ".yaml")) or {}
+    common_config = {**level_config, 'freeze_duration_ms': 0}
+
+    agent = AIAgent(path)
+
+    outcomes, lengths = [], []
+    for episode in range(episodes):
+        _seed_everything(base_seed + episode)
+        env = PongDuelEnv(
+            game_mode=GameSettings.GameMode.PLAYER_VS_AI,
+            player1_config={'initial_x': 0.5, 'initial_paddle_width': level_config.get('player_paddle_width', 100),
+                            'initial_lives': level_config.get('player_life', 3), 'skill_code': None, 'is_ai': False},
+            opponent_config={'initial_x': 0.5, 'initial_paddle_width': level_config.get('ai_paddle_width', 60),
+                             'initial_lives': level_config.get('ai_life', 3), 'skill_code': None, 'is_ai': True},
+            common_config=common_config,
+        )
+        obs, _ = env.reset()
+        outcome = 'step_limit'
+        steps = 0
+        for steps in range(1, max_steps + 1):
+            clock.advance()
+            obs, _, _, game_over, _ = env.step(_scripted_tracker_action(env), agent.select_action(obs))
+            if game_over:
+                outcome = 'ai_won' if env.player1.lives <= 0 else 'ai_lost'
+                break
+        env.close()
+        outcomes.append(outcome)
+        lengths.append(steps)
+    pygame.quit()
+    return summarize(outcomes, lengths, LEVEL_OUTCOMES, success_key='ai_won')
+
+
+def evaluate_checkpoint(job):
+    """ProcessPool 的進入點。job: dict(kind, path, episodes, seed, max_steps)"""
+    start = time.perf_counter()
+    if job['kind'] == 'bug':
+        result = _evaluate_bug_checkpoint(job['path'], job['episodes'], job['seed'], job['max_steps'])
+    else:
+        result = _evaluate_level_checkpoint(job['path'], job['episodes'], job['seed'], job['max_steps'])
+    result['eval_seconds'] = time.perf_counter() - start
+    return job, result
+
+
+# ----------------------------------------------------------------------
+# 主程式：搜尋 checkpoint / 快取 / 排行榜
+# ----------------------------------------------------------------------
+def file_sha256(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def discover_checkpoints(only="all"):
+    found = []
+    folders = []
+    if only in ("all", "bug"):
+        folders.append(("bug", os.path.join(project_root, "bug_models")))
+    if only in ("all", "level"):
+        folders.append(("level", os.path.join(project_root, "models")))
+    for kind, folder in folders:
+        if not os.path.isdir(folder):
+            print(f"[evaluate_checkpoints] Warning: folder not found: {folder}")
+            continue
+        for filename in sorted(os.listdir(folder)):
+            if filename.endswith(".pth"):
+                found.append((kind, os.path.join(folder, filename)))
+    return found
+
+
+def _cache_key(file_hash, kind, episodes, seed, max_steps):
+    return f"{file_hash}:{kind}:{episodes}:{seed}:{max_steps}:v{EVAL_VERSION}"
+
+
+def _load_cache(cache_path):
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[evaluate_checkpoints] Warning: could not read cache {cache_path}: {e}")
+    return {}
+
+
+def _write_json_atomic(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def write_leaderboard(rows, out_dir):
+    rows = sorted(rows, key=lambda r: (r['kind'], -r['success_rate'], r['checkpoint']))
+    fieldnames = ['kind', 'checkpoint', 'episodes', 'success_rate', 'success_ci_low', 'success_ci_high',
+                  'mean_length', 'length_ci_low', 'length_ci_high']
+    extra = sorted({k for r in rows for k in r if k not in fieldnames and k not in ('sha256', 'path')})
+    fieldnames += extra + ['sha256']
+
+    csv_path = os.path.join(out_dir, "leaderboard.csv")
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+    json_path = os.path.join(out_dir, "leaderboard.json")
+    _write_json_atomic(json_path, rows)
+    return csv_path, json_path
+
+
+def run(episodes=100, workers=None, seed=1234, max_steps=20000, only="all", out_dir=None, use_cache=True, verbose=False):
+    out_dir = out_dir or os.path.join(project_root, "eval_results")
+    os.makedirs(out_dir, exist_ok=True)
+    cache_path = os.path.join(out_dir, "eval_cache.json")
+    cache = _load_cache(cache_path) if use_cache else {}
+
+    rows, jobs = [], []
+    for kind, path in discover_checkpoints(only):
+        file_hash = file_sha256(path)
+        key = _cache_key(file_hash, kind, episodes, seed, max_steps)
+        base_row = {'kind': kind, 'checkpoint': os.path.relpath(path, project_root), 'sha256': file_hash}
+        if key in cache:
+            rows.append({**base_row, **cache[key]})
+            if DEBUG_EVAL: print(f"[evaluate_checkpoints] Cache hit: {base_row['checkpoint']}")
+        else:
+            jobs.append({'kind': kind, 'path': path, 'episodes': episodes, 'seed': seed,
+                         'max_steps': max_steps, 'cache_key': key, 'base_row': base_row})
+
+    print(f"[evaluate_checkpoints] {len(rows)} cached, {len(jobs)} to evaluate ({episodes} episodes each).")
+    if jobs:
+        workers = workers or max(1, min(len(jobs), (os.cpu_count() or 2) - 1))
+        # spawn：子 process 不繼承父 process 的 pygame / torch 狀態，Windows 與 Linux 行為一致
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                                 initializer=_init_worker, initargs=(verbose,)) as pool:
+            futures = [pool.submit(evaluate_checkpoint, job) for job in jobs]
+            for future in as_completed(futures):
+                try:
+                    job, result = future.result()
+                except Exception as e:
+                    print(f"[evaluate_checkpoints] Evaluation failed: {e}")
+                    continue
+                cache[job['cache_key']] = result
+                rows.append({**job['base_row'], **result})
+                print(f"[evaluate_checkpoints] {job['base_row']['checkpoint']}: success {result['success_rate']:.3f} "
+                      f"[{result['success_ci_low']:.3f}, {result['success_ci_high']:.3f}], "
+                      f"len {result['mean_length']:.1f} ({result['eval_seconds']:.1f}s)")
+                if use_cache:
+                    _write_json_atomic(cache_path, cache) # 每完成一個就寫入，中斷也不會白跑
+
+    csv_path, json_path = write_leaderboard(rows, out_dir)
+    print(f"[evaluate_checkpoints] Leaderboard written to {csv_path} and {json_path}")
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate bug_models/ and models/ checkpoints and build a leaderboard.")
+    parser.add_argument("--episodes", type=int, default=100, help="episodes (bug) / matches (level) per checkpoint")
+    parser.add_argument("--workers", type=int, default=None, help="process pool size (default: cpu_count - 1)")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--max-steps", type=int, default=20000, help="step limit per episode")
+    parser.add_argument("--only", choices=("all", "bug", "level"), default="all")
+    parser.add_argument("--out-dir", default=None, help="output folder (default: eval_results/)")
+    parser.add_argument("--no-cache", action="store_true", help="ignore and do not update the result cache")
+    parser.add_argument("--verbose", action="store_true", help="keep worker stdout")
+    args = parser.parse_args(argv)
+    run(episodes=args.episodes, workers=args.workers, seed=args.seed, max_steps=args.max_steps,
+        only=args.only, out_dir=args.out_dir, use_cache=not args.no_cache, verbose=args.verbose)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+# pong-soul/rl_training/metrics.py
+"""
+訓練用的低開銷 metrics 串流。
+
+訓練迴圈只做記憶體內的 append / 加總 (不做 I/O、不格式化字串)，
+背景執行緒每 flush_interval 秒把累積的資料整理後寫到 TensorBoard 與 CSV。
+
+三種記錄方式：
+    scalar(name, value, step)  : 低頻、每一筆都要保留的值 (例如每回合 reward、epsilon)
+    accumulate(name, value)    : 高頻的值 (例如 loss、Q 值、取樣延遲)，每次 flush 只輸出
+                                 mean / min / max，TensorBoard 檔案不會隨 step 數爆炸
+    count(name, n=1)           : 計數器，flush 時換算成每秒速率 (<name>_per_sec)
+
+    metrics = MetricsLogger("runs/bug_rl")
+    metrics.count("env_steps")
+    metrics.accumulate("loss", loss)
+    metrics.scalar("episode_reward", score, step=i_episode)
+    ...
+    metrics.close()
+"""
+import os
+import csv
+import time
+import threading
+
+DEBUG_METRICS = False
+
+
+class CSVSink:
+    """long format：wall_time, step, name, value (新的 metric 不需要改表頭)。"""
+    def __init__(self, log_dir, filename="metrics.csv"):
+        self.path = os.path.join(log_dir, filename)
+        is_new = not os.path.exists(self.path)
+        self._file = open(self.path, "a", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        if is_new:
+            self._writer.writerow(("wall_time", "step", "name", "value"))
+
+    def write(self, rows):
+        self._writer.writerows(rows)
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class TensorBoardSink:
+    def __init__(self, log_dir):
+        from torch.utils.tensorboard import SummaryWriter # tensorboard 未安裝時由呼叫端處理
+        self._writer = SummaryWriter(log_dir)
+
+    def write(self, rows):
+        for wall_time, step, name, value in rows:
+            self._writer.add_scalar(name, value, global_step=step, walltime=wall_time)
+        self._writer.flush()
+
+    def close(self):
+        self._writer.close()
+
+
+class MetricsLogger:
+    def __init__(self, log_dir, flush_interval=2.0, sinks=("tensorboard", "csv"), step_counter="env_steps"):
+        self.log_dir = log_dir
+        self.flush_interval = flush_interval
+        self.step_counter = step_counter # accumulate / count 類 metric 的 x 軸使用這個計數器
+        os.makedirs(log_dir, exist_ok=True)
+
+        self.sinks = []
+        if "csv" in sinks:
+            self.sinks.append(CSVSink(log_dir))
+        if "tensorboard" in sinks:
+            try:
+                self.sinks.append(TensorBoardSink(log_dir))
+            except Exception as e:
+                print(f"[MetricsLogger] Warning: TensorBoard sink disabled ({e}). Falling back to CSV only.")
+
+        # 主執行緒寫入的緩衝；flush 時整個換掉 (寫入與 flush 的交換都由 _data_lock 串行化)
+        self._scalars = []
+        self._accumulators = {}
+        self.counters = {}
+
+        self._last_counters = {}
+        self._last_flush_time = time.perf_counter()
+        self._stop_event = threading.Event()
+        self._sink_lock = threading.Lock()
+        self._data_lock = threading.Lock() # 熱路徑的寫入 vs. flush 時的交換 (不然交換瞬間的更新會遺失)
+        self._thread = threading.Thread(target=self._flush_loop, name="MetricsFlusher", daemon=True)
+        self._thread.start()
+
+    # ------------------------------------------------------------------
+    # 熱路徑 (訓練迴圈呼叫)
+    # ------------------------------------------------------------------
+    def scalar(self, name, value, step):
+        with self._data_lock:
+            self._scalars.append((time.time(), step, name, value))
+
+    def accumulate(self, name, value):
+        with self._data_lock:
+            acc = self._accumulators.get(name)
+            if acc is None:
+                self._accumulators[name] = [value, 1, value, value]
+            else:
+                acc[0] += value
+                acc[1] += 1
+                if value < acc[2]: acc[2] = value
+                if value > acc[3]: acc[3] = value
+
+    def count(self, name, n=1):
+        with self._data_lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    # ------------------------------------------------------------------
+    # 背景 flush
+    # ------------------------------------------------------------------
+    def _flush_loop(self):
+        while not self._stop_event.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        with self._data_lock:
+            scalars, self._scalars = self._scalars, []
+            accumulators, self._accumulators = self._accumulators, {}
+            counters = dict(self.counters)
+
+        now_perf = time.perf_counter()
+        elapsed = max(1e-9, now_perf - self._last_flush_time)
+        self._last_flush_time = now_perf
+        wall_time = time.time()
+        step = counters.get(self.step_counter, 0)
+
+        rows = list(scalars)
+        for name, (total, n, min_v, max_v) in accumulators.items():
+            rows.append((wall_time, step, f"{name}/mean", total / n))
+            rows.append((wall_time, step, f"{name}/min", min_v))
+            rows.append((wall_time, step, f"{name}/max", max_v))
+        for name, value in counters.items():
+            delta = value - self._last_counters.get(name, 0)
+            rows.append((wall_time, step, f"{name}_per_sec", delta / elapsed))
+        self._last_counters = counters
+
+        if not rows:
+            return
+        with self._sink_lock:
+            for sink in self.sinks:
+                try:
+                    sink.write(rows)
+                except Exception as e:
+                    print(f"[MetricsLogger] Warning: {sink.__class__.__name__} write failed: {e}")
+        if DEBUG_METRICS:
+            print(f"[MetricsLogger.flush] Wrote {len(rows)} rows (step {step}).")
+
+    def close(self):
+        self._stop_event.set()
+        self._thread.join()
+        self.flush()
+        with self._sink_lock:
+            for sink in self.sinks:
+                sink.close()
@@ -3,9 +3,11 @@ import torch.optim as optim
 import torch.nn.functional as F
 import numpy as np
 import random
+import copy
 from collections import deque, namedtuple
 import os
 import sys
+import time
 import pygame
 
 # 為了能 import 專案內的模組
@@ -17,6 +19,11 @@ from game.ai_agent import QNet # 重用 QNet
 from game.settings import GameSettings # 可能需要一些全域設定
 from game.player_state import PlayerState
 from game.skills.soul_eater_bug_skill import SoulEaterBugSkill # 用於獲取觀察空間維度等
+from rl_training.checkpoint import TrainingCheckpointer
+from rl_training.metrics import MetricsLogger
+from rl_training.curriculum import CurriculumScheduler, load_level_parameter_sets, level_to_bug_env_config
+from game.config_manager import ConfigManager
+from game.sound import SoundManager
 
 # --- Hyperparameters ---
 BUFFER_SIZE = int(1e5)  # Replay buffer size
@@ -25,14 +32,14 @@ GAMMA = 0.99            # Discount factor
 TAU = 1e-3              # For soft update of target parameters
 LR = 5e-4               # Learning rate
 UPDATE_EVERY = 4        # How often to update the network
-TARGET_UPDATE_EVERY = 100 # How often to update the target network
+N_STEP = 3              # ⭐️ n-step return 的步數 (1 = 原本的單步 TD)
 
-# (可選) TensorBoard 記錄
-# from torch.utils.tensorboard import SummaryWriter
-# writer = SummaryWriter('runs/bug_rl_experiment_1')
+# TensorBoard / CSV 記錄見 rl_training/metrics.py (train() 的 metrics_dir 參數)
 
+# ⭐️ discount: 該筆 transition 的 bootstrap 折扣 (gamma ** 實際累積步數)，
+#    回合提早結束時 n-step 會被截短，所以每筆各自記錄
 Transition = namedtuple('Transition',
-                        ('state', 'action', 'next_state', 'reward', 'done'))
+                        ('state', 'action', 'next_state', 'reward', 'done', 'discount'))
 
 class ReplayBuffer:
     def __init__(self, capacity):
@@ -47,6 +54,29 @@ class ReplayBuffer:
     def __len__(self):
         return len(self.memory)
 
+    def to_arrays(self):
+        """把 buffer 內容依欄位堆疊成 numpy 陣列 (checkpoint 用)。"""
+        if not self.memory:
+            return {}
+        return {field: np.stack([np.asarray(getattr(t, field)) for t in self.memory])
+                for field in Transition._fields}
+
+    def load_arrays(self, arrays):
+        """由 to_arrays() 的輸出 (可為 np.memmap) 重建 buffer，會複製成一般陣列。"""
+        self.memory.clear()
+        if not arrays:
+            return
+        n = len(arrays['state'])
+        for i in range(max(0, n - self.memory.maxlen), n):
+            self.memory.append(Transition(
+                np.array(arrays['state'][i]),
+                int(arrays['action'][i]),
+                np.array(arrays['next_state'][i]),
+                float(arrays['reward'][i]),
+                bool(arrays['done'][i]),
+                float(arrays['discount'][i]),
+            ))
+
 class BugDQNAgent:
     def __init__(self, state_size, action_size, seed):
         self.state_size = state_size
@@ -60,24 +90,65 @@ class BugDQNAgent:
 
         self.memory = ReplayBuffer(BUFFER_SIZE)
         self.t_step = 0 # For UPDATE_EVERY
-        self.target_update_step = 0 # For TARGET_UPDATE_EVERY
+
+        # ⭐️ n-step 累積用的暫存 (state, action, reward, next_state, done)
+        self.n_step = N_STEP
+        self.n_step_buffer = deque(maxlen=self.n_step)
 
         # 確保目標網路初始參數與本地網路一致
         self.qnetwork_target.load_state_dict(self.qnetwork_local.state_dict())
         self.qnetwork_target.eval()
 
+        self.metrics = None # 可選的 MetricsLogger，由 train() 設定
+
 
     def step(self, state, action, reward, next_state, done):
-        self.memory.push(state, action, next_state, reward, done)
+        self.n_step_buffer.append((state, action, reward, next_state, done))
+        if done:
+            # 回合結束：把暫存中剩下的 (較短的) n-step transition 全部寫入
+            while self.n_step_buffer:
+                self._push_n_step_transition(GAMMA)
+                self.n_step_buffer.popleft()
+        elif len(self.n_step_buffer) == self.n_step:
+            self._push_n_step_transition(GAMMA)
+
         self.t_step = (self.t_step + 1) % UPDATE_EVERY
         if self.t_step == 0:
             if len(self.memory) > BATCH_SIZE:
-                experiences = self.memory.sample(BATCH_SIZE)
+                if self.metrics:
+                    sample_start = time.perf_counter()
+                    experiences = self.memory.sample(BATCH_SIZE)
+                    self.metrics.accumulate("replay_sample_ms", (time.perf_counter() - sample_start) * 1000.0)
+                else:
+                    experiences = self.memory.sample(BATCH_SIZE)
                 self.learn(experiences, GAMMA)
+                # ⭐️ 每次學習後都做一次 soft update (fused lerp，成本很低)
+                self.soft_update(self.qnetwork_local, self.qnetwork_target, TAU)
 
-        self.target_update_step = (self.target_update_step + 1) % TARGET_UPDATE_EVERY
-        if self.target_update_step == 0:
-            self.soft_update(self.qnetwork_local, self.qnetwork_target, TAU)
+    def end_episode(self):
+        """
+        回合因 max_t 截斷 (沒有 done) 時呼叫：把暫存中剩下的 transition 以截短的 n-step return 寫入
+        (done=False，之後仍以 next_state bootstrap)，並清空暫存，避免與下一回合的步驟接在一起。
+        """
+        if len(self.n_step_buffer) == self.n_step:
+            self.n_step_buffer.popleft() # 暫存滿時開頭那筆在 step() 中已經寫入過
+        while self.n_step_buffer:
+            self._push_n_step_transition(GAMMA)
+            self.n_step_buffer.popleft()
+
+    def _push_n_step_transition(self, gamma):
+        """把 n_step_buffer 開頭的 transition 折算成 n-step return 後寫入 replay buffer。"""
+        state, action = self.n_step_buffer[0][0], self.n_step_buffer[0][1]
+        n_step_return = 0.0
+        discount = 1.0
+        next_state, done = self.n_step_buffer[0][3], self.n_step_buffer[0][4]
+        for (_, _, r, s_next, d) in self.n_step_buffer:
+            n_step_return += discount * r
+            discount *= gamma
+            next_state, done = s_next, d
+            if d:
+                break
+        self.memory.push(state, action, next_state, n_step_return, done, discount)
 
 
     def act(self, state, eps=0.):
@@ -93,19 +164,22 @@ class BugDQNAgent:
             return random.choice(np.arange(self.action_size))
 
     def learn(self, experiences, gamma):
-        states, actions, next_states, rewards, dones = zip(*experiences)
+        # ⭐️ gamma 只保留作為介面相容；實際折扣使用每筆 transition 的 discount (gamma ** n)
+        states, actions, next_states, rewards, dones, discounts = zip(*experiences)
 
         states = torch.from_numpy(np.vstack(states)).float().to(self.device)
         actions = torch.from_numpy(np.vstack(actions)).long().to(self.device) # long for indexing
         next_states = torch.from_numpy(np.vstack(next_states)).float().to(self.device)
         rewards = torch.from_numpy(np.vstack(rewards)).float().to(self.device)
         dones = torch.from_numpy(np.vstack(dones).astype(np.uint8)).float().to(self.device)
+        discounts = torch.from_numpy(np.vstack(discounts)).float().to(self.device)
 
-
-        # Get max predicted Q values (for next states) from target model
-        Q_targets_next = self.qnetwork_target(next_states).detach().max(1)[0].unsqueeze(1)
-        # Compute Q targets for current states
-        Q_targets = rewards + (gamma * Q_targets_next * (1 - dones))
+        with torch.no_grad():
+            # ⭐️ Double DQN: 由 local 網路選動作，target 網路評估該動作的價值
+            next_actions = self.qnetwork_local(next_states).argmax(dim=1, keepdim=True)
+            Q_targets_next = self.qnetwork_target(next_states).gather(1, next_actions)
+            # Compute n-step Q targets for current states
+            Q_targets = rewards + discounts * Q_targets_next * (1 - dones)
 
         # Get expected Q values from local model
         Q_expected = self.qnetwork_local(states).gather(1, actions)
@@ -118,11 +192,53 @@ class BugDQNAgent:
         # torch.nn.utils.clip_grad_norm_(self.qnetwork_local.parameters(), 1) # Gradient clipping
         self.optimizer.step()
 
+        if self.metrics:
+            # 一次 .tolist() 把 loss 和 Q 值統計一起搬回 CPU (只同步一次)
+            q_detached = Q_expected.detach()
+            loss_value, q_mean, q_max = torch.stack((loss.detach(), q_detached.mean(), q_detached.max())).tolist()
+            self.metrics.accumulate("loss", loss_value)
+            self.metrics.accumulate("q_value_mean", q_mean)
+            self.metrics.accumulate("q_value_max", q_max)
+            self.metrics.count("learner_updates")
+            return loss_value
+
         return loss.item() # Return loss for logging
 
+    def get_training_state(self):
+        """回傳可還原完整訓練進度的快照 (tensor 皆已複製到 CPU，可交給背景執行緒寫檔)。"""
+        def _cpu_copy(state_dict):
+            return {k: (v.detach().cpu().clone() if torch.is_tensor(v) else copy.deepcopy(v))
+                    for k, v in state_dict.items()}
+        optimizer_state = self.optimizer.state_dict()
+        return {
+            'model_state_dict': _cpu_copy(self.qnetwork_local.state_dict()),
+            'target_state_dict': _cpu_copy(self.qnetwork_target.state_dict()),
+            'optimizer_state_dict': {
+                'state': {k: _cpu_copy(v) for k, v in optimizer_state['state'].items()},
+                'param_groups': copy.deepcopy(optimizer_state['param_groups']),
+            },
+            't_step': self.t_step,
+        }
+
+    def load_training_state(self, state):
+        self.qnetwork_local.load_state_dict(state['model_state_dict'])
+        self.qnetwork_target.load_state_dict(state.get('target_state_dict', state['model_state_dict']))
+        if 'optimizer_state_dict' in state:
+            self.optimizer.load_state_dict(state['optimizer_state_dict'])
+        self.t_step = state.get('t_step', 0)
+        self.n_step_buffer.clear()
+
     def soft_update(self, local_model, target_model, tau):
-        for target_param, local_param in zip(target_model.parameters(), local_model.parameters()):
-            target_param.data.copy_(tau*local_param.data + (1.0-tau)*target_param.data)
+        # θ_target = θ_target + tau * (θ_local - θ_target)，整個參數列表一次 fused lerp
+        target_params = list(target_model.parameters())
+        local_params = list(local_model.parameters())
+        with torch.no_grad():
+            if hasattr(torch, "_foreach_lerp_"):
+                torch._foreach_lerp_(target_params, local_params, tau)
+            else:
+                # 舊版 torch 沒有 _foreach_lerp_ 時退回逐一參數更新
+                for target_param, local_param in zip(target_params, local_params):
+                    target_param.lerp_(local_param, tau)
 
     def save(self, filename="bug_agent_checkpoint.pth"):
         model_save_path = os.path.join(project_root, "models", filename) # 儲存到專案的 models 資料夾
@@ -162,6 +278,7 @@ class BugSkillTrainingEnv:
         self.ball_radius_normalized = 10 / self.render_size
         self.time_scale = 1.0 # 訓練時通常不需要 slowmo
         self.max_trail_length = 20 # From GameSettings
+        self.target_track_speed = 0.0 # ⭐️ 目標板子追蹤蟲的速度 (0 = 靜止，curriculum 會調整)
 
         # 創建一個「模擬的」env 物件傳給 SoulEaterBugSkill
         # 這部分需要小心，確保 SoulEaterBugSkill 需要的 env 屬性都存在
@@ -179,11 +296,21 @@ class BugSkillTrainingEnv:
             self.font = pygame.font.Font(None, 24)
 
 
+    def apply_difficulty(self, difficulty_cfg):
+        """套用 curriculum 給的難度 (見 curriculum.level_to_bug_env_config)。"""
+        width_px = difficulty_cfg.get('target_paddle_width_px')
+        if width_px:
+            self.opponent.base_paddle_width = width_px
+            self.opponent.base_paddle_width_normalized = width_px / self.render_size
+            self.opponent.update_paddle_width_normalized(width_px)
+        self.target_track_speed = float(difficulty_cfg.get('target_track_speed', self.target_track_speed))
+
     def _create_mock_env_for_skill(self):
         """
         創建一個最小化的模擬 env 物件，包含 SoulEaterBugSkill 執行所需的屬性。
         """
         mock_env = type('MockEnv', (object,), {})() # 創建一個空物件
+        mock_env.config = GameSettings.get_config_snapshot() # SoulEaterBugSkill 從 env.config (驗證後的設定快照) 讀取參數
         mock_env.player1 = self.player1
         mock_env.opponent = self.opponent
         mock_env.render_size = self.render_size
@@ -191,6 +318,7 @@ class BugSkillTrainingEnv:
         mock_env.ball_radius_normalized = self.ball_radius_normalized
         mock_env.time_scale = self.time_scale # 蟲的移動會受 time_scale 影響
         mock_env.max_trail_length = self.max_trail_length
+        mock_env.sound_manager = SoundManager(enabled=False) # 訓練不播放音效 (no-op，不初始化 mixer)
 
         # SoulEaterBugSkill 在 update 和碰撞檢測時會直接修改這些：
         mock_env.ball_x = 0.5
@@ -213,7 +341,7 @@ class BugSkillTrainingEnv:
         
         return mock_env
 
-    def reset(self):
+    def reset(self, bug_start=None):
         # 重置蟲（球）的狀態、目標板子狀態等
         self.opponent.x = 0.5 # 目標板子可以固定或隨機
         self.opponent.lives = 1 # 每次重置，目標只有1條命（用於該回合）
@@ -221,6 +349,13 @@ class BugSkillTrainingEnv:
         # 技能擁有者的狀態也可能需要重置，但蟲技能主要關心蟲本身
         self.player1.x = 0.5
 
+        # ⭐️ 訓練/評估時不受技能冷卻限制，否則上一回合結束後 activate() 會失敗
+        self.bug_skill.cooldown_start_time = 0
+        # ⭐️ 可指定蟲的起始位置 (x, y)；未指定時沿用上一回合結束的位置 (原行為)
+        if bug_start is not None:
+            self.mock_env_for_skill.ball_x, self.mock_env_for_skill.ball_y = bug_start
+        self.mock_env_for_skill.trail.clear()
+
         # 啟動蟲技能 (這會設定蟲的初始位置等)
         self.bug_skill.activate() # activate 會設定 mock_env.ball_x/y
 
@@ -266,6 +401,12 @@ class BugSkillTrainingEnv:
 
         # 應用移動
         self.bug_skill._apply_movement_and_constrain_bounds(delta_x_norm, delta_y_norm)
+
+        # ⭐️ 目標板子追蹤蟲的 x (target_track_speed 為 0 時保持靜止)
+        if self.target_track_speed > 0.0:
+            target_paddle = self.bug_skill.target_player_state
+            dx = self.mock_env_for_skill.ball_x - target_paddle.x
+            target_paddle.x = float(np.clip(target_paddle.x + np.clip(dx, -self.target_track_speed, self.target_track_speed), 0.0, 1.0))
         self.bug_skill._update_trail() # 更新拖尾
 
         # 檢查結果
@@ -336,7 +477,13 @@ class BugSkillTrainingEnv:
         self.clock.tick(30) # 訓練時可以跑快一點，或者不 tick
 
 # --- 主訓練迴圈 ---
-def train(n_episodes=2000, max_t_per_episode=1000, eps_start=1.0, eps_end=0.01, eps_decay=0.995, load_checkpoint=False):
+def train(n_episodes=2000, max_t_per_episode=1000, eps_start=1.0, eps_end=0.01, eps_decay=0.995, load_checkpoint=False,
+          resume=False, checkpoint_dir=None, checkpoint_every=100, keep_last_checkpoints=5, curriculum=False,
+          metrics_dir=None):
+    # load_checkpoint: 只載入模型權重 (舊行為)
+    # resume: 從 checkpoint_dir 中最新的完整 checkpoint 繼續 (optimizer / replay / epsilon / RNG 一併還原)
+    # curriculum: 依 models/levelN.yaml 的參數由易到難調整目標板子 (見 rl_training/curriculum.py)
+    # metrics_dir: TensorBoard / CSV 輸出資料夾 (預設 runs/bug_rl)
     # 獲取觀察空間和動作空間大小
     # 這裡我們創建一個臨時的 BugSkillTrainingEnv 和 SoulEaterBugSkill 來獲取觀察維度
     # 這不是很優雅，但可以工作。更好的方法是將這些維度作為常數或配置傳入。
@@ -351,45 +498,86 @@ def train(n_episodes=2000, max_t_per_episode=1000, eps_start=1.0, eps_end=0.01,
     if load_checkpoint:
         agent.load("soul_eater_bug_agent.pth") # 嘗試載入模型
 
+    if metrics_dir is None:
+        metrics_dir = os.path.join(project_root, "runs", "bug_rl")
+    metrics = MetricsLogger(metrics_dir)
+    agent.metrics = metrics
+
+    if checkpoint_dir is None:
+        checkpoint_dir = os.path.join(project_root, "checkpoints")
+    checkpointer = TrainingCheckpointer(checkpoint_dir, prefix="bug_agent", keep_last=keep_last_checkpoints)
+
     scores = []                     # list containing scores from each episode
     scores_window = deque(maxlen=100) # last 100 scores
     eps = eps_start                   # initialize epsilon
+    start_episode = 1
+
+    scheduler = None
+    if curriculum:
+        level_sets = load_level_parameter_sets(ConfigManager(), os.path.join(project_root, "models"))
+        scheduler = CurriculumScheduler(level_sets, num_envs=1, seed=0)
+        print(f"Curriculum levels: {[name for name, _ in level_sets]}")
+
+    if resume:
+        restored = checkpointer.load_latest(agent)
+        if restored is not None:
+            last_episode, eps, extra = restored
+            start_episode = last_episode + 1
+            if extra:
+                scores = list(extra.get('scores', []))
+                scores_window.extend(scores[-scores_window.maxlen:])
+                if scheduler and extra.get('curriculum'):
+                    scheduler.load_state_dict(extra['curriculum'])
 
     # 實際的訓練環境
     env = BugSkillTrainingEnv(render_training=False) # 設定為 True 可以看到訓練過程 (會很慢)
 
-    for i_episode in range(1, n_episodes + 1):
+    for i_episode in range(start_episode, n_episodes + 1):
+        if scheduler:
+            _, level_cfg = scheduler.assign(0)
+            env.apply_difficulty(level_to_bug_env_config(level_cfg))
         state = env.reset()
         score = 0
+        info = {}
         for t in range(max_t_per_episode):
             action = agent.act(state, eps)
             next_state, reward, done, info = env.step(action)
             agent.step(state, action, reward, next_state, done)
+            metrics.count("env_steps")
             state = next_state
             score += reward
             if env.render_training: # 如果啟用了訓練渲染
                 env.render(agent_action=action)
             if done:
                 break
+        else:
+            agent.end_episode() # 回合被 max_t_per_episode 截斷：寫入剩下的 transition，不跨到下一回合
         
         scores_window.append(score)
         scores.append(score)
         eps = max(eps_end, eps_decay * eps) # decrease epsilon
+        if scheduler:
+            scheduler.report(0, won=info.get('result') == 'scored')
 
         print(f'\rEpisode {i_episode}\tAverage Score: {np.mean(scores_window):.2f}\tEpsilon: {eps:.3f}', end="")
         if i_episode % 100 == 0:
             print(f'\rEpisode {i_episode}\tAverage Score: {np.mean(scores_window):.2f}')
-            agent.save("soul_eater_bug_agent.pth") # 每100輪儲存一次
-
-        # if writer: # TensorBoard 記錄
-        #     writer.add_scalar('training_reward', score, i_episode)
-        #     writer.add_scalar('average_reward_100_episodes', np.mean(scores_window), i_episode)
-        #     writer.add_scalar('epsilon', eps, i_episode)
-
+            agent.save("soul_eater_bug_agent.pth") # 每100輪儲存一次 (只有模型權重)
+        if checkpoint_every and i_episode % checkpoint_every == 0:
+            extra = {'scores': list(scores)}
+            if scheduler:
+                extra['curriculum'] = scheduler.state_dict()
+            checkpointer.save(agent, i_episode, eps, extra=extra) # 背景寫入，不阻塞訓練
+
+        metrics.scalar('episode_reward', score, i_episode)
+        metrics.scalar('average_reward_100_episodes', np.mean(scores_window), i_episode)
+        metrics.scalar('episode_length', t + 1, i_episode)
+        metrics.scalar('epsilon', eps, i_episode)
+
+    checkpointer.wait()
     agent.save("soul_eater_bug_agent_final.pth") # 訓練結束後最終儲存
     print("Training complete.")
-    # if writer:
-    #     writer.close()
+    metrics.close()
     return scores
 
 
@@ -398,8 +586,9 @@ if __name__ == '__main__':
     # pygame.init() # 如果 render_training=True，BugSkillTrainingEnv 的 __init__ 會處理
     
     # 開始訓練，可以調整參數
-    # load_checkpoint=True 可以從上次儲存的地方繼續訓練
-    trained_scores = train(n_episodes=10000, max_t_per_episode=700, eps_decay=0.999, load_checkpoint=False)
+    # load_checkpoint=True 只載入上次儲存的模型權重；加上 --resume 參數則從最新的完整 checkpoint 繼續
+    trained_scores = train(n_episodes=10000, max_t_per_episode=700, eps_decay=0.999, load_checkpoint=False,
+                           resume="--resume" in sys.argv, curriculum="--curriculum" in sys.argv)
     
     # pygame.quit() # 如果 render_training=True
     
@@ -0,0 +1,39 @@
+# tests/test_bug_rl_n_step.py
+"""n-step 暫存在回合被截斷 (max_t) 時不應跨到下一回合。"""
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from rl_training.train_bug_rl import BugDQNAgent, N_STEP
+
+
+def _run_episode(agent, episode, steps, terminal):
+    # state = [回合編號, 步數]，方便檢查 transition 是否跨回合
+    for t in range(steps):
+        done = terminal and t == steps - 1
+        agent.step(np.array([episode, t], dtype=np.float32), 0, 1.0,
+                   np.array([episode, t + 1], dtype=np.float32), done)
+    if not terminal:
+        agent.end_episode()
+
+
+def test_truncated_episode_does_not_cross_reset():
+    agent = BugDQNAgent(state_size=2, action_size=3, seed=0)
+    truncated_steps = N_STEP + 2
+    _run_episode(agent, episode=0, steps=truncated_steps, terminal=False)
+    assert not agent.n_step_buffer
+    _run_episode(agent, episode=1, steps=N_STEP + 1, terminal=True)
+
+    transitions = list(agent.memory.memory)
+    for transition in transitions:
+        assert transition.state[0] == transition.next_state[0]
+
+    # 截斷回合的每一步都有寫入，結尾的幾筆是 done=False、截短的 bootstrap
+    first_episode = [tr for tr in transitions if tr.state[0] == 0]
+    assert len(first_episode) == truncated_steps
+    assert not any(tr.done for tr in first_episode)
+    assert first_episode[-1].next_state[1] == truncated_steps
+    assert len([tr for tr in transitions if tr.state[0] == 1]) == N_STEP + 1
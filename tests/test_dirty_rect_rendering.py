@@ -0,0 +1,80 @@
+# tests/test_dirty_rect_rendering.py
+"""技能特效 (濾鏡、暗角、時鐘、衝擊波) 結束後，髒矩形渲染的畫面要和整張重畫一致 (不留殘影)。"""
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+os.chdir(PROJECT_ROOT)
+
+import pygame
+import pytest
+
+from game.config_manager import ConfigManager
+from game.settings import GameSettings
+
+FRAME_MS = 16
+MAX_FRAMES = 1000
+FULL_WIDTH_PADDLE = 400 # 球拍和遊戲區一樣寬：不會得分，不會有凍結閃爍 (凍結期間整張重畫，會掩蓋殘影)
+FRAMES_TO_COMPARE = 5
+
+
+@pytest.fixture
+def screen(monkeypatch):
+    # 技能與 Renderer 的計時都用 pygame.time.get_ticks：改成每幀固定前進的假時鐘，測試不必真的等待
+    clock = {"ms": 0}
+    monkeypatch.setattr(pygame.time, "get_ticks", lambda: clock["ms"])
+    # 不呼叫 pygame.quit()：theme 的字型快取在整個程序中共用，quit 之後就不能再用
+    pygame.init()
+    GameSettings._config_manager = ConfigManager()
+    return pygame.display.set_mode((1280, 720)), clock
+
+
+def _stale_pixels(renderer, screen_surface, render_data):
+    """把這一幀和整張重畫比較，回傳不同的像素數 (比較完還原畫面，不影響下一幀的髒矩形)。"""
+    rendered = screen_surface.copy()
+    renderer._render_full_frame(render_data, render_data.get("freeze_active", False))
+    reference = pygame.surfarray.array3d(screen_surface)
+    screen_surface.blit(rendered, (0, 0))
+    return int((pygame.surfarray.array3d(rendered) != reference).any(axis=2).sum())
+
+
+@pytest.mark.parametrize("skill_code", ["slowmo", "purgatory_domain"])
+def test_no_stale_pixels_after_skill_effect_ends(screen, skill_code):
+    from envs.pong_duel_env import PongDuelEnv
+    screen_surface, clock = screen
+    env = PongDuelEnv(
+        game_mode=GameSettings.GameMode.PLAYER_VS_AI,
+        player1_config={'skill_code': skill_code, 'initial_paddle_width': FULL_WIDTH_PADDLE, 'initial_lives': 99},
+        opponent_config={'skill_code': None, 'initial_paddle_width': FULL_WIDTH_PADDLE, 'initial_lives': 99},
+        initial_main_screen_surface_for_renderer=screen_surface,
+    )
+    env.render()
+    renderer = env.renderer
+    assert renderer.dirty_rect_rendering
+    env.activate_skill(env.player1)
+    skill = env.player1.skill_instance
+
+    effect_seen = False
+    compared = []
+    for _ in range(MAX_FRAMES):
+        clock["ms"] += FRAME_MS
+        env.step(1, 1)
+        if not skill.is_active() and getattr(skill, "flame_particles", None):
+            # env 只更新 active 的技能，剩下的火焰粒子要到下一回合才會清掉；這裡直接結束特效
+            skill.flame_particles.clear()
+        render_data = env.get_render_data()
+        effect_active = renderer._has_active_skill_effects(render_data)
+        effect_seen = effect_seen or effect_active
+        renderer.render(render_data)
+        if effect_seen and not effect_active:
+            compared.append(_stale_pixels(renderer, screen_surface, render_data))
+            if len(compared) >= FRAMES_TO_COMPARE:
+                break
+    env.close()
+
+    assert effect_seen
+    assert len(compared) == FRAMES_TO_COMPARE, "skill effect did not end"
+    assert compared == [0] * FRAMES_TO_COMPARE